@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Measures the time FileStorage takes to save a store in each
+file format, to decode the file, and to reload it (decoding plus
+building and indexing the objects), and the size of the file.
+
+Usage: python3 -m benchmarks.format_benchmark [number of objects]
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+from models.engine import formats
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def main(number):
+    """Prints the save/decode/reload times and file size of each format."""
+    storage = FileStorage()
+    FileStorage._FileStorage__objects = {}
+    for i in range(number):
+        place = Place()
+        place.name = "Place {}".format(i)
+        place.price_by_night = i
+    objects = FileStorage._FileStorage__objects
+    directory = tempfile.mkdtemp()
+    for name, fmt in formats.formats.items():
+        path = os.path.join(directory, "file" + fmt.extensions[0])
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__format = fmt
+        FileStorage._FileStorage__objects = objects
+        start = perf_counter()
+        storage.save()
+        saved = perf_counter() - start
+        start = perf_counter()
+        with open(path, 'rb') as file:
+            for item in fmt.load(file):
+                pass
+        decoded = perf_counter() - start
+        FileStorage._FileStorage__objects = {}
+        start = perf_counter()
+        storage.reload()
+        loaded = perf_counter() - start
+        print("{:<8} save {:6.3f} s  decode {:6.3f} s  reload {:6.3f} s  "
+              "{:5.1f} MB".format(name, saved, decoded, loaded,
+                                  os.path.getsize(path) / 1e6))
+        os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Measures the memory used per object by the regular model classes
+and by their compact variants (see models.compact), for objects
+loaded the way FileStorage.reload() builds them.
+
+Usage: python3 -m benchmarks.memory_benchmark [number of objects]
+"""
+
+import sys
+import tracemalloc
+from models.compact import compact
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+def per_object(cls, value, number):
+    """Returns the bytes allocated per object built from value."""
+    tracemalloc.start()
+    objects = [cls(**value) for _ in range(number)]
+    for obj in objects:
+        obj.to_dict()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / number
+
+
+def main(number):
+    """Prints the bytes per object of each class and its variant."""
+    values = {
+        User: {"email": "a@b.c", "first_name": "Betty"},
+        Place: {"city_id": "c1", "user_id": "u1", "name": "Loft",
+                "number_rooms": 2, "price_by_night": 90,
+                "latitude": 37.77, "longitude": -122.41},
+        Review: {"place_id": "p1", "user_id": "u1", "text": "Great"},
+    }
+    for cls, fields in values.items():
+        value = cls().to_dict()
+        value.update(fields)
+        regular = per_object(cls, value, number)
+        slotted = per_object(compact(cls), value, number)
+        print("{:<8} {:8.1f} -> {:8.1f} bytes/object".format(
+            cls.__name__, regular, slotted))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Measures the time ShardedStorage takes to reload a store
+with an increasing number of worker processes: the elapsed time,
+and the CPU time of the parent process alone, which builds and
+indexes the objects while the workers decode the shards. With
+enough cores, the elapsed time tends to the parent CPU time.
+
+Usage: python3 -m benchmarks.reload_benchmark [number of objects]
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter, process_time
+from models.engine.file_storage import FileStorage
+from models.engine.sharded_storage import ShardedStorage
+from models.user import User
+
+
+def main(number):
+    """Prints the reload times for 1 to os.cpu_count() workers."""
+    directory = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(directory,
+                                                       "file.json")
+    ShardedStorage.shard_count = max(os.cpu_count(), 2) * 2
+    storage = ShardedStorage()
+    FileStorage._FileStorage__objects = {}
+    for i in range(number):
+        user = User()
+        user.email = "user{}@mail.com".format(i)
+    storage.save()
+    workers = 1
+    while workers <= max(os.cpu_count(), 2):
+        ShardedStorage.reload_workers = workers
+        FileStorage._FileStorage__objects = {}
+        start = perf_counter()
+        cpu = process_time()
+        storage.reload()
+        print("{:>3} workers {:7.3f} s elapsed {:7.3f} s parent CPU".format(
+            workers, perf_counter() - start, process_time() - cpu))
+        workers *= 2
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
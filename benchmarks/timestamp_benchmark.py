@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Measures the per-object cost of the timestamp conversions done
+when FileStorage reloads (BaseModel(**kwargs)) and saves (to_dict()).
+
+Usage: python3 -m benchmarks.timestamp_benchmark [number of objects]
+"""
+
+import sys
+from datetime import datetime
+from timeit import timeit
+from models import timestamp
+from models.place import Place
+
+
+def per_object(statement, number):
+    """Returns the cost in microseconds of one run of statement."""
+    return timeit(statement, number=number) / number * 1e6
+
+
+def main(number):
+    """Prints the per-object cost of each path."""
+    text = datetime.now().isoformat()
+    value = Place().to_dict()
+
+    rows = [
+        ("datetime.strptime",
+         lambda: datetime.strptime(text, timestamp.FORMAT)),
+        ("timestamp.parse", lambda: timestamp.parse(text)),
+        ("Place(**kwargs)", lambda: Place(**value)),
+        ("Place.to_dict()", Place(**value).to_dict),
+    ]
+    for name, statement in rows:
+        print("{:<20} {:8.3f} us/object".format(
+            name, per_object(statement, number)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
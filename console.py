@@ -4,14 +4,16 @@ Module: console
 Entry point for the HBNB command interpreter.
 """
 
+import argparse
+import ast
 import cmd
-from models.base_model import BaseModel
-from models.user import User
-from models.state import State
-from models.city import City
-from models.amenity import Amenity
-from models.place import Place
-from models.review import Review
+import io
+import itertools
+import json
+import math
+import re
+import sys
+from contextlib import redirect_stdout
 from models import storage
 
 
@@ -22,15 +24,9 @@ class HBNBCommand(cmd.Cmd):
     """
 
     prompt = "(hbnb) "
-    valid_classes = {
-        "BaseModel": BaseModel,
-        "User": User,
-        "State": State,
-        "City": City,
-        "Amenity": Amenity,
-        "Place": Place,
-        "Review": Review
-    }
+    valid_classes = storage.classes
+    __call = re.compile(r"^(\w*)\.(\w+)\((.*)\)$")
+    __methods = ("all", "count", "show", "destroy", "update")
 
     def do_quit(self, arg):
         """
@@ -44,6 +40,78 @@ class HBNBCommand(cmd.Cmd):
         """
         return True
 
+    def run_batch(self, file, flush_every=0):
+        """
+        Runs the commands read from a file, one per line, without
+        prompts. Saves are deferred to a single write at the end
+        (see FileStorage.batch), or every flush_every commands,
+        and the output is written when the saves are.
+        Empty lines and lines starting with # are skipped; a command
+        failing doesn't stop the batch. The number of commands and
+        the errors they printed are summed up on the standard error.
+
+        Args:
+            file: Text file object of the commands; the bulk
+                  commands read their records from it as well.
+            flush_every (int): Number of commands between two writes
+                               (optional). 0 writes once at the end.
+
+        Returns:
+            int: Number of errors.
+        """
+        output = sys.stdout
+        buffer = io.StringIO()
+        errors = []
+        commands = 0
+        self.stdin = file
+        with storage.batch(), redirect_stdout(buffer):
+            while True:
+                line = file.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                start = buffer.tell()
+                try:
+                    stop = self.onecmd(line)
+                except Exception as error:
+                    print("** {}: {} **".format(type(error).__name__, error))
+                    stop = False
+                commands += 1
+                buffer.seek(start)
+                errors.extend(
+                    (commands, line, message)
+                    for message in buffer.read().splitlines()
+                    if message.startswith("** "))
+                if flush_every and not commands % flush_every:
+                    storage.flush()
+                    output.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+                if stop:
+                    break
+        output.write(buffer.getvalue())
+        output.flush()
+        print("{} commands, {} errors".format(commands, len(errors)),
+              file=sys.stderr)
+        for number, line, message in errors:
+            print("command {} ({}): {}".format(number, line, message),
+                  file=sys.stderr)
+        return len(errors)
+
+    def onecmd(self, line):
+        """
+        Runs a command, printing ** read-only storage ** instead
+        of stopping when the command changes a storage that can't
+        be written (e.g. the snapshot engine).
+        """
+        try:
+            return super().onecmd(line)
+        except PermissionError:
+            print("** read-only storage **")
+            return False
+
     def emptyline(self):
         """
         Do nothing on empty line.
@@ -79,10 +147,9 @@ class HBNBCommand(cmd.Cmd):
         elif len(args) < 2:
             print("** instance id missing **")
         else:
-            instances = storage.all()
-            instance_key = args[0] + "." + args[1]
-            if instance_key in instances:
-                print(instances[instance_key])
+            instance = storage.get(args[0], args[1])
+            if instance is not None:
+                print(instance)
             else:
                 print("** no instance found **")
 
@@ -100,10 +167,9 @@ class HBNBCommand(cmd.Cmd):
         elif len(args) < 2:
             print("** instance id missing **")
         else:
-            instances = storage.all()
-            instance_key = args[0] + "." + args[1]
-            if instance_key in instances:
-                del instances[instance_key]
+            instance = storage.get(args[0], args[1])
+            if instance is not None:
+                storage.delete(instance)
                 storage.save()
             else:
                 print("** no instance found **")
@@ -111,28 +177,96 @@ class HBNBCommand(cmd.Cmd):
     def do_all(self, arg):
         """
         Prints all string representation of all instances
-        based or not on the class name.
-        Usage: all or all <class name>
-        """
-        arg_list = arg.split('.')
-        if arg == "" or arg == "all":
-            obj_list = [str(obj) for obj in storage.all().values()]
-        elif len(arg_list) == 1 and arg_list[0] in self.valid_classes:
-            obj_list = [
-                str(obj) for obj in storage.all().values()
-                if isinstance(obj, self.valid_classes[arg_list[0]])
-            ]
-        elif len(arg_list) == 2 and arg_list[1] == "all" and \
-                arg_list[0] in self.valid_classes:
-            obj_list = [
-                str(obj) for obj in storage.all().values()
-                if isinstance(obj, self.valid_classes[arg_list[0]])
-            ]
-        else:
+        based or not on the class name, one at a time.
+        limit, offset and after=<class name>.<id> (the instances
+        stored after this one) select a page of the instances;
+        format=ndjson prints the dictionary of each instance as
+        a line of JSON instead of a list.
+        Usage: all [<class name>] [limit=<n>] [offset=<n>]
+                   [after=<class name>.<id>] [format=list|ndjson]
+        """
+        names = []
+        options = {}
+        for word in arg.split():
+            name, equal, value = word.partition('=')
+            if equal:
+                options[name] = value
+            else:
+                names.append(word)
+        class_name = names[0] if names else ""
+        if class_name.endswith(".all"):
+            class_name = class_name[:-4]
+        if class_name == "all":
+            class_name = ""
+        if len(names) > 1 or \
+                class_name and class_name not in self.valid_classes:
             print("** class doesn't exist **")
             return
+        if set(options) - {"limit", "offset", "after", "format"}:
+            print("** invalid option **")
+            return
+        try:
+            limit = int(options.get("limit", 0))
+            offset = int(options.get("offset", 0))
+        except ValueError:
+            print("** invalid number **")
+            return
+        if limit < 0 or offset < 0:
+            print("** invalid number **")
+            return
+        output = options.get("format", "list")
+        if output not in ("list", "ndjson"):
+            print("** invalid format **")
+            return
+        after = options.get("after")
+        if after is None:
+            objects = storage.all(class_name or None)
+        else:
+            name, _, obj_id = after.partition('.')
+            if storage.get(name, obj_id) is None:
+                print("** no instance found **")
+                return
+            objects = storage.after(after, class_name or None,
+                                    offset + limit if limit else 0) or {}
+        objects = itertools.islice(
+            objects.values(), offset, offset + limit if limit else None)
+        self.__print_objects(objects, output)
+
+    @staticmethod
+    def __print_objects(objects, output):
+        """
+        Writes instances to the standard output one at a time,
+        as the list of their string representations (as print()
+        would write it) or as lines of JSON (NDJSON).
+
+        Args:
+            objects (iterable): Instances to write.
+            output (str): "list" or "ndjson".
+        """
+        write = sys.stdout.write
+        if output == "ndjson":
+            for obj in objects:
+                write(json.dumps(obj.to_dict()))
+                write("\n")
+            return
+        separator = "["
+        for obj in objects:
+            write(separator)
+            write(repr(str(obj)))
+            separator = ", "
+        write("[]\n" if separator == "[" else "]\n")
 
-        print(obj_list)
+    def do_count(self, arg):
+        """
+        Prints the number of instances of a class.
+        Usage: count <class name>
+        """
+        if not arg:
+            print("** class name missing **")
+        elif arg not in self.valid_classes:
+            print("** class doesn't exist **")
+        else:
+            print(storage.count(arg))
 
     def do_update(self, arg):
         """
@@ -152,10 +286,8 @@ class HBNBCommand(cmd.Cmd):
         elif len(args) < 4:
             print("** value missing **")
         else:
-            instances = storage.all()
-            instance_key = args[0] + "." + args[1]
-            if instance_key in instances:
-                instance = instances[instance_key]
+            instance = storage.get(args[0], args[1])
+            if instance is not None:
                 attribute_name = args[2]
                 attribute_value = args[3]
                 setattr(instance, attribute_name, attribute_value)
@@ -163,67 +295,248 @@ class HBNBCommand(cmd.Cmd):
             else:
                 print("** no instance found **")
 
-    def default(self, arg):
+    def __read_lines(self):
         """
-        Default behavior for unrecognized commands.
+        Yields the lines read from the standard input until
+        an empty line or the end of the input.
         """
-        if arg.endswith(".all()"):
-            class_name = arg[:-6]
-            if class_name in self.valid_classes:
-                obj_list = [
-                    str(obj) for obj in storage.all().values()
-                    if isinstance(obj, self.valid_classes[class_name])
-                ]
-                print(obj_list)
+        while True:
+            line = self.stdin.readline()
+            if not line.strip():
                 return
+            yield line.strip()
 
-        if arg.endswith(".show()"):
-            print("** instance id missing **")
+    def __read_records(self, class_name):
+        """
+        Yields (class name, attributes) for each JSON line read
+        from the standard input, printing an error for the lines
+        that aren't JSON objects or name no valid class.
+
+        Args:
+            class_name (str): Class of the records, or "" to read it
+                              from their __class__ key.
+        """
+        for line in self.__read_lines():
+            try:
+                attributes = json.loads(line)
+            except ValueError:
+                attributes = None
+            if not isinstance(attributes, dict):
+                print("** invalid JSON **")
+                continue
+            name = class_name or attributes.get("__class__")
+            if not name:
+                print("** class name missing **")
+            elif name not in self.valid_classes:
+                print("** class doesn't exist **")
+            else:
+                yield name, attributes
+
+    def do_bulk_create(self, arg):
+        """
+        Creates instances from JSON lines read from the standard
+        input until an empty line, saves them once and prints their ids.
+        Without a class name, each line gives its own in __class__.
+        Usage: bulk_create [<class name>]
+               {"<attribute name>": <value>, ...}
+        """
+        if arg and arg not in self.valid_classes:
+            print("** class doesn't exist **")
             return
+        instances = []
+        for name, attributes in self.__read_records(arg):
+            try:
+                instances.append(self.valid_classes[name](**attributes))
+            except (TypeError, ValueError):
+                print("** invalid value **")
+        storage.bulk_new(instances)
+        for instance in instances:
+            print(instance.id)
+
+    def do_bulk_update(self, arg):
+        """
+        Updates instances from JSON lines read from the standard
+        input until an empty line, and saves them once.
+        Each line gives the id of an instance and the attributes to set;
+        without a class name, it also gives the class in __class__.
+        Usage: bulk_update [<class name>]
+               {"id": "<id>", "<attribute name>": <value>, ...}
+        """
+        if arg and arg not in self.valid_classes:
+            print("** class doesn't exist **")
+            return
+        updates = {}
+        for name, attributes in self.__read_records(arg):
+            if "id" not in attributes:
+                print("** instance id missing **")
+            else:
+                key = "{}.{}".format(name, attributes["id"])
+                updates.setdefault(key, {}).update(attributes)
+        updated = set(storage.bulk_update(updates))
+        for key in updates:
+            if key not in updated:
+                print("** no instance found **")
 
-        if arg.startswith(".show"):
-            args = arg.split("(")
-            if len(args) == 2 and args[0].endswith(".show") and \
-                    args[1].endswith(")"):
-                params = args[1][:-1].strip('\'"')
-                params = params.split(",")
-                if len(params) == 2:
-                    class_name = args[0][1:-5]
-                    instance_id = params[0].strip('\'"')
-                    instances = storage.all()
-                    for key, instance in instances.items():
-                        cn, obj_id = key.split('.')
-                        if cn == class_name and instance.id == instance_id:
-                            print(instance)
-                            return
-                    print("** no instance found **")
-                    return
-
-        if arg.startswith("User.update"):
-            args = arg.split("(")
-            if len(args) == 2 and args[0] == "User.update" and \
-                    args[1].endswith(")"):
-                params = args[1][1:-2].split(", ")
-                instance_id = params[0].strip('\'"')
-                attribute_dict_str = params[1]
-                attribute_dict = eval(attribute_dict_str)
-                instances = storage.all()
-                for key, instance in instances.items():
-                    class_name, obj_id = key.split('.')
-                    if class_name == "User" and instance.id == instance_id:
-                        for attr_name, attr_value in attribute_dict.items():
-                            if hasattr(instance, attr_name):
-                                setattr(instance, attr_name, attr_value)
-                            else:
-                                print("** attribute doesn't exist **")
-                                return
-                        instance.save()
-                        return
+    def do_bulk_destroy(self, arg):
+        """
+        Deletes the instances whose ids are read from the standard
+        input, one per line until an empty line, and saves once.
+        Without a class name, each line is <class name>.<id>.
+        Usage: bulk_destroy [<class name>]
+               <id>
+        """
+        if arg and arg not in self.valid_classes:
+            print("** class doesn't exist **")
+            return
+        keys = []
+        for line in self.__read_lines():
+            if arg:
+                keys.append("{}.{}".format(arg, line))
+            elif line.partition('.')[0] not in self.valid_classes:
+                print("** class doesn't exist **")
+            else:
+                keys.append(line)
+        deleted = set(storage.bulk_delete(keys))
+        for key in keys:
+            if key not in deleted:
                 print("** no instance found **")
+
+    def do_near(self, arg):
+        """
+        Prints all string representation of the instances within
+        a distance of a point, closest first.
+        Usage: near <latitude> <longitude> <radius in km>
+        """
+        args = arg.split()
+        if not args:
+            print("** latitude missing **")
+        elif len(args) < 2:
+            print("** longitude missing **")
+        elif len(args) < 3:
+            print("** radius missing **")
+        else:
+            try:
+                lat, lon, radius = (float(value) for value in args[:3])
+            except ValueError:
+                print("** invalid number **")
+                return
+            if not all(map(math.isfinite, (lat, lon, radius))):
+                print("** invalid number **")
                 return
+            objs = storage.near(lat, lon, radius)
+            print([str(obj) for obj in objs.values()])
+
+    def do_within(self, arg):
+        """
+        Prints all string representation of the instances
+        inside a bounding box.
+        Usage: within <min latitude> <min longitude>
+                      <max latitude> <max longitude>
+        """
+        args = arg.split()
+        if len(args) < 4:
+            print("** bounding box missing **")
+        else:
+            try:
+                box = [float(value) for value in args[:4]]
+            except ValueError:
+                print("** invalid number **")
+                return
+            if not all(map(math.isfinite, box)):
+                print("** invalid number **")
+                return
+            print([str(obj) for obj in storage.within(*box).values()])
+
+    @staticmethod
+    def __parse_args(text):
+        """
+        Returns the arguments of a <class name>.<method>(<args>) call:
+        Python literals ("<id>", {"<name>": <value>}, 42, ...), or
+        the comma-separated words when they aren't all literals.
+
+        Args:
+            text (str): Text between the parentheses.
+        """
+        if not text.strip():
+            return []
+        try:
+            return list(ast.literal_eval("(" + text + ",)"))
+        except (SyntaxError, ValueError, TypeError, MemoryError,
+                RecursionError):
+            return [word.strip().strip('\'"') for word in text.split(',')]
 
-        print("** Unknown command **")
+    def __update(self, class_name, args):
+        """
+        Sets attributes on an instance, given by the arguments
+        of <class name>.update(<args>), and saves it.
+
+        Args:
+            class_name (str): Name of the class of the instance.
+            args (list): <id>, then <attribute name>, <value> or
+                         a dictionary of {<attribute name>: <value>}.
+        """
+        if not args:
+            print("** instance id missing **")
+            return
+        instance = storage.get(class_name, str(args[0]))
+        if instance is None:
+            print("** no instance found **")
+        elif len(args) < 2:
+            print("** attribute name missing **")
+        elif isinstance(args[1], dict):
+            for name, value in args[1].items():
+                setattr(instance, str(name), value)
+            instance.save()
+        elif len(args) < 3:
+            print("** value missing **")
+        else:
+            setattr(instance, str(args[1]), args[2])
+            instance.save()
+
+    def default(self, arg):
+        """
+        Runs the <class name>.<method>(<args>) commands:
+            all([<option>=<value>, ...]), count(),
+            show(<id>), destroy(<id>),
+            update(<id>, <attribute name>, <value>),
+            update(<id>, {<attribute name>: <value>, ...})
+        Instances are found by key, as by show, destroy and update.
+        """
+        match = self.__call.match(arg.strip())
+        if match is None or match.group(2) not in self.__methods:
+            print("** Unknown command **")
+            return
+        class_name, method, text = match.groups()
+        if not class_name:
+            print("** class name missing **")
+        elif class_name not in self.valid_classes:
+            print("** class doesn't exist **")
+        elif method == "count":
+            self.do_count(class_name)
+        else:
+            args = self.__parse_args(text)
+            if method == "all":
+                self.do_all(" ".join(
+                    [class_name] + [str(value) for value in args]))
+            elif method == "update":
+                self.__update(class_name, args)
+            else:
+                getattr(self, "do_" + method)(" ".join(
+                    [class_name] + [str(value) for value in args[:1]]))
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="HBNB console")
+    parser.add_argument("--batch", action="store_true",
+                        help="run the commands of FILE (or the standard "
+                        "input) with a single save at the end")
+    parser.add_argument("--flush-every", type=int, default=0, metavar="N",
+                        help="in batch mode, save every N commands")
+    parser.add_argument("file", nargs="?", type=argparse.FileType('r'),
+                        default=sys.stdin,
+                        help="commands of the batch mode (standard input)")
+    options = parser.parse_args()
+    if options.batch:
+        sys.exit(1 if HBNBCommand().run_batch(
+            options.file, options.flush_every) else 0)
     HBNBCommand().cmdloop()
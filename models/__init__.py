@@ -2,10 +2,58 @@
 """
 Package: models
 Modules: base_model, user, ...
+
+The storage engine is selected with the HBNB_TYPE_STORAGE
+environment variable:
+    file (default): FileStorage, one JSON file rewritten on save.
+    journal: JournalStorage, JSON snapshot plus an append-only log.
+    lazy: LazyStorage, objects built on first access.
+    sharded: ShardedStorage, one file per class (and hash shard),
+             only the changed shards rewritten on save.
+    db: DBStorage, SQLite database with one table per class.
+    snapshot: SnapshotStorage, read-only memory-mapped snapshot.
+    shared: SharedStorage, one JSON file saved by several processes.
+
+When HBNB_COMPACT_MODELS is set, the storage builds the compact
+variants of the model classes (see models.compact).
+When HBNB_THREAD_SAFE is set, the engine can be shared by threads
+(see models.engine.thread_safe).
+The store is loaded on import, except in the worker processes
+of a parallel shard reload, where HBNB_RELOAD_WORKER is set.
 """
 
+from os import getenv
 from models.engine.file_storage import FileStorage
 
 
-storage = FileStorage()
-storage.reload()
+storage_type = getenv("HBNB_TYPE_STORAGE")
+if storage_type == "journal":
+    from models.engine.journal_storage import JournalStorage
+    storage = JournalStorage()
+elif storage_type == "lazy":
+    from models.engine.lazy_storage import LazyStorage
+    storage = LazyStorage()
+elif storage_type == "sharded":
+    from models.engine.sharded_storage import ShardedStorage
+    storage = ShardedStorage()
+elif storage_type == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+elif storage_type == "snapshot":
+    from models.engine.snapshot_storage import SnapshotStorage
+    storage = SnapshotStorage()
+elif storage_type == "shared":
+    from models.engine.shared_storage import SharedStorage
+    storage = SharedStorage()
+else:
+    storage = FileStorage()
+if getenv("HBNB_THREAD_SAFE"):
+    from models.engine.thread_safe import thread_safe
+    storage = thread_safe(type(storage))()
+if getenv("HBNB_COMPACT_MODELS"):
+    from models.compact import compact
+    storage.classes = {
+        name: compact(cls) for name, cls in storage.classes.items()
+    }
+if not getenv("HBNB_RELOAD_WORKER"):
+    storage.reload()
@@ -7,14 +7,30 @@ Defines the BaseModel class.
 import uuid
 from datetime import datetime
 import models
+from models import timestamp
 
 
 class BaseModel:
     """
     BaseModel class.
     Defines common attributes/methods for other classes.
+
+    Public Class Attributes:
+        indexed_attributes (tuple): Names of the attributes the storage
+                                    keeps a hash index on, so lookups
+                                    by their value don't scan the store.
+        column_attributes (tuple): Names of the attributes the storage
+                                   also keeps in typed arrays, for
+                                   filters and aggregates.
+        geo_attributes (tuple): Names of the latitude and longitude
+                                attributes the storage keeps a
+                                spatial index on, if any.
     """
 
+    indexed_attributes = ()
+    column_attributes = ()
+    geo_attributes = ()
+
     def __init__(self, *args, **kwargs):
         """
         Initializes a new instance of the BaseModel class.
@@ -31,23 +47,40 @@ class BaseModel:
             updated_at (datetime): Date and time when the instance is
             last updated.
         """
-        self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = self.created_at
-
         if kwargs:
-            for key, value in kwargs.items():
-                if key != '__class__':
-                    setattr(self, key, value)
+            attributes = dict.fromkeys(('id', 'created_at', 'updated_at'))
+            attributes.update(kwargs)
+            attributes.pop('__class__', None)
+            if 'id' not in kwargs:
+                attributes['id'] = str(uuid.uuid4())
             if 'created_at' in kwargs:
-                self.created_at = datetime.strptime(
-                    kwargs['created_at'], '%Y-%m-%dT%H:%M:%S.%f')
+                attributes['created_at'] = timestamp.parse(
+                    kwargs['created_at'])
+            else:
+                attributes['created_at'] = datetime.now()
             if 'updated_at' in kwargs:
-                self.updated_at = datetime.strptime(
-                    kwargs['updated_at'], '%Y-%m-%dT%H:%M:%S.%f')
+                attributes['updated_at'] = timestamp.parse(
+                    kwargs['updated_at'])
+            else:
+                attributes['updated_at'] = attributes['created_at']
+            self.restore(attributes)
         else:
+            self.id = str(uuid.uuid4())
+            self.created_at = datetime.now()
+            self.updated_at = self.created_at
             models.storage.new(self)
 
+    def restore(self, attributes):
+        """
+        Sets the attributes of an instance being loaded from storage.
+        The instance isn't in storage yet, so the attributes are set
+        in one go without going through __setattr__.
+
+        Args:
+            attributes (dict): Attribute values by name.
+        """
+        self.__dict__.update(attributes)
+
     def __str__(self):
         """
         Returns a string representation of the BaseModel instance.
@@ -70,6 +103,23 @@ class BaseModel:
         self.updated_at = datetime.now()
         models.storage.save()
 
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute and marks the instance as changed
+        so storage only persists the modified objects.
+        """
+        super().__setattr__(name, value)
+        models.storage.touch(self, name)
+
+    def is_dirty(self):
+        """
+        Tells whether the instance changed since the last save.
+
+        Returns:
+            bool: True if the instance has unsaved changes.
+        """
+        return models.storage.is_dirty(self)
+
     def to_dict(self):
         """
         Returns a dictionary representation of the BaseModel instance.
@@ -83,6 +133,10 @@ class BaseModel:
         """
         obj_dict = self.__dict__.copy()
         obj_dict['__class__'] = self.__class__.__name__
-        obj_dict['created_at'] = self.created_at.isoformat()
-        obj_dict['updated_at'] = self.updated_at.isoformat()
+        created_at = timestamp.format(self.created_at)
+        obj_dict['created_at'] = created_at
+        if self.updated_at is self.created_at:
+            obj_dict['updated_at'] = created_at
+        else:
+            obj_dict['updated_at'] = timestamp.format(self.updated_at)
         return obj_dict
@@ -11,6 +11,8 @@ class City(BaseModel):
     Public Class Attributes:
         state_id (str): Empty string representing the State ID.
         name (str): Empty string representing name of the city.
+        indexed_attributes (tuple): Attributes indexed by the storage.
     """
+    indexed_attributes = ("state_id",)
     state_id = ""
     name = ""
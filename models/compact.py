@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+Module: compact
+Defines compact variants of the model classes, whose declared
+fields are stored in __slots__ instead of a per-instance __dict__.
+
+Compact classes are enabled by setting the HBNB_COMPACT_MODELS
+environment variable; the storage then builds the objects it
+loads with them.
+"""
+
+from models import timestamp
+
+
+class CompactModel:
+    """
+    CompactModel class.
+    Mixin placed before a model class by compact().
+
+    Fields listed in compact_fields live in slots, so an instance
+    carries no __dict__ until an undeclared attribute is set on it.
+    A field never set reads its class default, as for the regular
+    models; list defaults are copied on first access, so instances
+    no longer share e.g. Place.amenity_ids.
+    """
+
+    __slots__ = ()
+    compact_fields = ()
+    compact_defaults = {}
+
+    def __getattr__(self, name):
+        """
+        Returns the class default of a field never set.
+
+        Args:
+            name (str): Name of the attribute.
+
+        Raises:
+            AttributeError: If name isn't a field with a default.
+        """
+        defaults = type(self).compact_defaults
+        if name not in defaults:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, name))
+        value = defaults[name]
+        if isinstance(value, list):
+            value = list(value)
+            object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute, recording when it goes to the __dict__.
+        """
+        if name not in type(self).compact_fields:
+            object.__setattr__(self, "_CompactModel__extra", True)
+        super().__setattr__(name, value)
+
+    def restore(self, attributes):
+        """
+        Sets the attributes of an instance being loaded from storage.
+
+        Args:
+            attributes (dict): Attribute values by name.
+        """
+        fields = type(self).compact_fields
+        for name, value in attributes.items():
+            if name not in fields:
+                object.__setattr__(self, "_CompactModel__extra", True)
+            object.__setattr__(self, name, value)
+
+    def attributes(self):
+        """
+        Returns the attributes set on the instance, read from the
+        slots and the __dict__, without creating an empty __dict__.
+
+        Returns:
+            dict: Attribute values by name.
+        """
+        values = {}
+        for name in type(self).compact_fields:
+            try:
+                values[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        try:
+            object.__getattribute__(self, "_CompactModel__extra")
+        except AttributeError:
+            return values
+        values.update(self.__dict__)
+        return values
+
+    def __str__(self):
+        """
+        Returns a string representation of the instance.
+
+        Returns:
+            str: String representation in the format:
+                 "[<class name>] (<self.id>) <attributes>"
+        """
+        return "[{}] ({}) {}".format(
+            self.__class__.__name__,
+            self.id,
+            self.attributes()
+        )
+
+    def to_dict(self):
+        """
+        Returns a dictionary representation of the instance,
+        in the same format as BaseModel.to_dict().
+
+        Returns:
+            dict: Dictionary containing all attributes of the instance.
+        """
+        obj_dict = self.attributes()
+        obj_dict['__class__'] = self.__class__.__name__
+        obj_dict['created_at'] = timestamp.format(self.created_at)
+        obj_dict['updated_at'] = timestamp.format(self.updated_at)
+        return obj_dict
+
+
+def compact(cls):
+    """
+    Returns a compact variant of a model class. The variant has the
+    same name and is a subclass of cls, so objects keep their
+    <class name>.id keys and isinstance checks still hold.
+
+    Args:
+        cls (type): Subclass of BaseModel.
+
+    Returns:
+        type: Class whose fields are stored in __slots__.
+    """
+    defaults = {
+        name: value for name, value in vars(cls).items()
+        if not name.startswith('_') and not callable(value) and
+        not isinstance(value, (classmethod, staticmethod, tuple))
+    }
+    fields = ('id', 'created_at', 'updated_at') + tuple(defaults)
+    return type(cls.__name__, (CompactModel, cls), {
+        '__slots__': fields + ("_CompactModel__extra",),
+        '__module__': cls.__module__,
+        '__doc__': "Compact variant of {}.".format(cls.__name__),
+        'compact_fields': fields,
+        'compact_defaults': defaults,
+    })
@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+"""
+Module: async_storage
+Defines the AsyncStorage class.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import models
+
+
+class AsyncStorage:
+    """
+    AsyncStorage class.
+    asyncio facade over a storage engine, e.g.:
+
+        storage = AsyncStorage()
+        user = await storage.aget("User", user_id)
+        user.first_name = "Betty"
+        await storage.asave()
+        async for place in storage.aall(Place):
+            ...
+
+    Disk work (saves, reloads, and the queries of the engines
+    building objects on access, see FileStorage.exclusive_reads)
+    runs on a single worker thread, so it never blocks the event
+    loop and never runs twice at once. The queries of the other
+    engines only read memory, and run on the event loop.
+
+    Saves are coalesced: while a save is written, the asave() calls
+    made meanwhile wait for one more save, which covers them all.
+
+    The other attributes are the ones of the engine, so the facade
+    is used like the engine for the calls that don't do disk work
+    (new, delete, ...). Using the engine from the worker thread and
+    from the event loop at once is safe with a thread-safe engine
+    (see models.engine.thread_safe).
+
+    Public Class Attributes:
+        chunk_size (int): Number of objects aall() yields before
+                          letting other tasks run.
+    """
+
+    chunk_size = 1000
+
+    def __init__(self, storage=None, executor=None):
+        """
+        Initializes the facade.
+
+        Args:
+            storage: Storage engine (optional); models.storage
+                     by default.
+            executor: concurrent.futures executor running the disk
+                      work (optional); by default a thread pool of
+                      one worker, shut down by close().
+        """
+        self.__storage = models.storage if storage is None else storage
+        self.__executor = executor
+        self.__owns_executor = executor is None
+        self.__saving = None
+        self.__next_save = None
+
+    @property
+    def storage(self):
+        """
+        Storage engine behind the facade.
+        """
+        return self.__storage
+
+    def __getattr__(self, name):
+        """
+        Returns the attribute name of the storage engine.
+
+        Args:
+            name (str): Name of the attribute.
+        """
+        if name.startswith('_AsyncStorage__'):
+            raise AttributeError(name)
+        return getattr(self.__storage, name)
+
+    async def __run(self, function, *args):
+        """
+        Runs function(*args) on the worker thread.
+
+        Returns:
+            The result of the call.
+        """
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                1, thread_name_prefix="hbnb-storage")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, function, *args)
+
+    async def __query(self, function, *args):
+        """
+        Runs a query, on the worker thread if the engine
+        does disk work to answer it.
+        """
+        if self.__storage.exclusive_reads:
+            return await self.__run(function, *args)
+        return function(*args)
+
+    async def aget(self, cls, id=None):
+        """
+        Returns an object by class and id.
+
+        Args:
+            cls: Class or class name of the object, or its key
+                 <class name>.id when id isn't given.
+            id (str): Id of the object (optional).
+
+        Returns:
+            The object, or None if it isn't stored.
+        """
+        if id is None:
+            cls, _, id = cls.partition('.')
+        return await self.__query(self.__storage.get, cls, id)
+
+    async def acount(self, cls=None):
+        """
+        Returns the number of objects, or of objects of one class.
+
+        Args:
+            cls: Class or class name to count (optional).
+
+        Returns:
+            int: Number of objects.
+        """
+        return await self.__query(self.__storage.count, cls)
+
+    async def alookup(self, cls, attribute, value):
+        """
+        Returns the objects of a class whose attribute equals value.
+
+        Args:
+            cls: Class or class name of the objects.
+            attribute (str): Name of the attribute.
+            value: Value to look up.
+
+        Returns:
+            dict: Dictionary of the matching objects by <class name>.id.
+        """
+        return await self.__query(
+            self.__storage.lookup, cls, attribute, value)
+
+    async def aall(self, cls=None):
+        """
+        Yields the objects, or only the objects of one class,
+        letting other tasks run every chunk_size objects.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+        """
+        objects = await self.__query(self.__storage.all, cls)
+        for count, obj in enumerate(list(objects.values()), 1):
+            yield obj
+            if not count % self.chunk_size:
+                await asyncio.sleep(0)
+
+    async def asave(self):
+        """
+        Saves the storage on the worker thread. Calls made while
+        a save is written share the next save.
+
+        Raises:
+            The exception raised by the save, if any.
+        """
+        if self.__next_save is None:
+            self.__next_save = asyncio.get_running_loop().create_future()
+            if self.__saving is None:
+                self.__saving = asyncio.ensure_future(self.__save_loop())
+        await asyncio.shield(self.__next_save)
+
+    async def __save_loop(self):
+        """Writes the requested saves one after the other."""
+        try:
+            while self.__next_save is not None:
+                future, self.__next_save = self.__next_save, None
+                try:
+                    await self.__run(self.__storage.save)
+                except Exception as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(None)
+        finally:
+            self.__saving = None
+
+    async def areload(self):
+        """
+        Reloads the storage on the worker thread, after the
+        saves requested so far.
+        """
+        if self.__saving is not None:
+            await asyncio.shield(self.__saving)
+        await self.__run(self.__storage.reload)
+
+    def close(self):
+        """
+        Shuts the worker thread down, after the disk work
+        already started.
+        """
+        if self.__owns_executor and self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Module: atomic
+Defines the atomic_write context manager.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+# mkstemp creates files readable by the owner only; new files get the
+# mode open() would give them, which depends on the process umask.
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+@contextmanager
+def atomic_write(path):
+    """
+    Opens a temporary file next to path for writing and, once the
+    block succeeds, flushes it to disk and renames it over path.
+    A crash at any point leaves either the old or the new file,
+    never a truncated one; if the block raises, path is untouched.
+
+    Args:
+        path (str): Path of the file to replace.
+
+    Yields:
+        Binary file object to write the new content to.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            try:
+                mode = os.stat(path).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = 0o666 & ~UMASK
+            os.chmod(tmp_path, mode)
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    sync_directory(directory)
+
+
+def sync_directory(directory):
+    """
+    Flushes a directory entry to disk, so a rename inside it
+    survives a crash. Does nothing where directories can't be
+    opened (e.g. Windows).
+
+    Args:
+        directory (str): Path of the directory.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+"""
+Module: convert
+Command line converter between storage file formats.
+
+Usage: python3 -m models.engine.convert <source> <destination>
+The formats are taken from the file extensions (see formats.for_path).
+"""
+
+import sys
+from models.engine.formats import convert
+
+
+def main(argv):
+    """
+    Converts the file named by argv[1] to the file named by argv[2].
+
+    Args:
+        argv (list): Command line arguments.
+
+    Returns:
+        int: Exit status.
+    """
+    if len(argv) != 3:
+        print("Usage: {} <source> <destination>".format(argv[0]))
+        return 1
+    convert(argv[1], argv[2])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
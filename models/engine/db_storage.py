@@ -0,0 +1,551 @@
+#!/usr/bin/python3
+"""
+Module: db_storage
+Defines the DBStorage class.
+"""
+
+import itertools
+import json
+import math
+import sqlite3
+import weakref
+from os import getenv
+from models.engine.columns import ColumnStore
+from models.engine.file_storage import FileStorage
+from models.engine.geo import EARTH_RADIUS_KM, GeoIndex
+
+
+class DBStorage(FileStorage):
+    """
+    DBStorage class.
+    Keeps the objects in a SQLite database instead of memory,
+    with one table per class:
+        id TEXT PRIMARY KEY, created_at, updated_at,
+        one column per indexed or geo attribute (indexed),
+        data TEXT: the to_dict() dictionary in JSON.
+
+    Only the objects in use are in memory: objects read from the
+    database are held in a weak identity map, so reading the same
+    row twice gives the same object for as long as it is used,
+    and unsaved objects are held until the next save().
+    Statements are parameterized and built once per class, so
+    sqlite3 reuses them prepared from its statement cache.
+
+    The connection can be used by other threads, which must not use
+    it at the same time (see models.engine.thread_safe).
+
+    The database is file.db unless the HBNB_DB_PATH environment
+    variable names another one.
+    """
+
+    __db_path = getenv("HBNB_DB_PATH", "file.db")
+    exclusive_reads = True
+    __connection = None
+    __identity = weakref.WeakValueDictionary()
+    __changes = {}
+    __statements = {}
+
+    @property
+    def file_path(self):
+        """
+        str: Path of the database.
+        """
+        return DBStorage.__db_path
+
+    def __columns(self, cls):
+        """
+        Returns the names of the attribute columns of a class.
+
+        Args:
+            cls (type): Model class.
+
+        Returns:
+            tuple: Names of the indexed and geo attributes.
+        """
+        names = tuple(cls.indexed_attributes)
+        return names + tuple(
+            name for name in cls.geo_attributes if name not in names)
+
+    def __statement(self, class_name, kind):
+        """
+        Returns the SQL statement of a kind for a class.
+
+        Args:
+            class_name (str): Name of the class.
+            kind (str): "upsert", "delete" or "select".
+
+        Returns:
+            str: Parameterized SQL statement.
+        """
+        statements = DBStorage.__statements.get(class_name)
+        if statements is None:
+            columns = ("id", "created_at", "updated_at") + \
+                self.__columns(self.classes[class_name]) + ("data",)
+            table = '"{}"'.format(class_name)
+            statements = {
+                "upsert": "INSERT INTO {} ({}) VALUES ({}) "
+                          "ON CONFLICT(id) DO UPDATE SET {}".format(
+                              table, ", ".join(columns),
+                              ", ".join("?" * len(columns)),
+                              ", ".join("{0} = excluded.{0}".format(name)
+                                        for name in columns[1:])),
+                "delete": "DELETE FROM {} WHERE id = ?".format(table),
+                "select": "SELECT id, data FROM {}".format(table),
+            }
+            DBStorage.__statements[class_name] = statements
+        return statements[kind]
+
+    def reload(self):
+        """
+        Opens the database (__db_path), creating the tables and
+        indexes that don't exist yet. No object is read.
+        Unsaved changes are dropped.
+        """
+        if DBStorage.__connection is not None:
+            DBStorage.__connection.close()
+        connection = sqlite3.connect(DBStorage.__db_path,
+                                     check_same_thread=False)
+        with connection:
+            for class_name, cls in self.classes.items():
+                columns = self.__columns(cls)
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS "{}" ('
+                    'id TEXT PRIMARY KEY, created_at TEXT, updated_at TEXT, '
+                    '{}data TEXT NOT NULL)'.format(
+                        class_name,
+                        "".join(name + ", " for name in columns)))
+                for name in cls.indexed_attributes:
+                    connection.execute(
+                        'CREATE INDEX IF NOT EXISTS "{0}_{1}" '
+                        'ON "{0}" ({1})'.format(class_name, name))
+                if cls.geo_attributes:
+                    connection.execute(
+                        'CREATE INDEX IF NOT EXISTS "{0}_{1}" '
+                        'ON "{0}" ({2})'.format(
+                            class_name, "_".join(cls.geo_attributes),
+                            ", ".join(cls.geo_attributes)))
+        DBStorage.__connection = connection
+        DBStorage.__identity = weakref.WeakValueDictionary()
+        DBStorage.__changes = {}
+        DBStorage.__statements = {}
+
+    def __build(self, class_name, obj_id, data):
+        """
+        Returns the object of a row, from the identity map if
+        it is in use, else built from the row data.
+
+        Args:
+            class_name (str): Name of the class.
+            obj_id (str): Id of the object.
+            data (str): to_dict() dictionary in JSON.
+        """
+        key = "{}.{}".format(class_name, obj_id)
+        obj = DBStorage.__identity.get(key)
+        if obj is None:
+            obj = self.classes[class_name](**json.loads(data))
+            DBStorage.__identity[key] = obj
+        return obj
+
+    def __select(self, class_name, where="", parameters=()):
+        """
+        Returns the objects of a class matching a SQL condition,
+        with the unsaved changes applied.
+
+        Args:
+            class_name (str): Name of the class.
+            where (str): SQL condition (optional).
+            parameters (tuple): Parameters of the condition.
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+                  Unsaved objects are included whether or not
+                  they match the condition.
+        """
+        if class_name not in self.classes:
+            return {}
+        statement = self.__statement(class_name, "select")
+        if where:
+            statement += " WHERE " + where
+        changes = DBStorage.__changes
+        objects = {}
+        for obj_id, data in DBStorage.__connection.execute(
+                statement, parameters):
+            key = "{}.{}".format(class_name, obj_id)
+            if key not in changes:
+                objects[key] = self.__build(class_name, obj_id, data)
+        prefix = class_name + "."
+        for key, obj in changes.items():
+            if obj is not None and key.startswith(prefix):
+                objects[key] = obj
+        return objects
+
+    def all(self, cls=None):
+        """
+        Returns the objects stored, or only the objects
+        of one class when cls is given.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+
+        Returns:
+            dict: Dictionary containing the objects by <class name>.id.
+        """
+        if cls is None:
+            objects = {}
+            for class_name in self.classes:
+                objects.update(self.__select(class_name))
+            return objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.__select(cls)
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects, or of objects of one class,
+        counted by the database, with the unsaved changes applied.
+        No object is read.
+
+        Args:
+            cls: Class or class name to count (optional).
+
+        Returns:
+            int: Number of objects.
+        """
+        if cls is None:
+            return sum(self.count(class_name) for class_name in self.classes)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if cls not in self.classes:
+            return 0
+        table = '"{}"'.format(cls)
+        connection = DBStorage.__connection
+        count = connection.execute(
+            "SELECT COUNT(*) FROM {}".format(table)).fetchone()[0]
+        prefix = cls + "."
+        for key, obj in DBStorage.__changes.items():
+            if key.startswith(prefix):
+                stored = connection.execute(
+                    "SELECT 1 FROM {} WHERE id = ?".format(table),
+                    (key[len(prefix):],)).fetchone() is not None
+                count += (obj is not None) - stored
+        return count
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id.
+
+        Args:
+            cls: Class or class name of the object.
+            id (str): Id of the object.
+
+        Returns:
+            The object, or None if it isn't stored.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        if key in DBStorage.__changes:
+            return DBStorage.__changes[key]
+        obj = DBStorage.__identity.get(key)
+        if obj is not None or cls not in self.classes:
+            return obj
+        row = DBStorage.__connection.execute(
+            self.__statement(cls, "select") + " WHERE id = ?",
+            (id,)).fetchone()
+        return None if row is None else self.__build(cls, *row)
+
+    def after(self, key, cls=None, limit=0):
+        """
+        Returns the objects listed after key by all(cls).
+        The objects are read up to key, as the rows have no
+        position to look up.
+
+        Args:
+            key (str): Key <class name>.id of an object listed.
+            cls: Class or class name to filter on (optional).
+            limit (int): Largest number of objects returned;
+                         0 (default) for no limit.
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id,
+                  or None if key isn't listed.
+        """
+        objects = self.all(cls)
+        if key not in objects:
+            return None
+        items = iter(objects.items())
+        for listed, obj in items:
+            if listed == key:
+                break
+        return dict(itertools.islice(items, limit or None))
+
+    def lookup(self, cls, attribute, value):
+        """
+        Returns the objects of a class whose attribute equals value.
+        Indexed attributes are looked up with an SQL query,
+        the others by scanning the class objects.
+
+        Args:
+            cls: Class or class name of the objects.
+            attribute (str): Name of the attribute.
+            value: Value to look up.
+
+        Returns:
+            dict: Dictionary of the matching objects by <class name>.id.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        model = self.classes.get(cls)
+        if model is not None and attribute in model.indexed_attributes:
+            objects = self.__select(cls, attribute + " = ?", (value,))
+        else:
+            objects = self.all(cls)
+        return {
+            key: obj for key, obj in objects.items()
+            if getattr(obj, attribute, None) == value
+        }
+
+    def columns(self, cls):
+        """
+        Returns a column store of the objects of a class,
+        built from the database.
+
+        Args:
+            cls: Class or class name.
+
+        Returns:
+            ColumnStore: The store, or None if the class has no
+                         column attributes or no objects.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        model = self.classes.get(cls)
+        if model is None or not model.column_attributes:
+            return None
+        objects = self.all(cls)
+        if not objects:
+            return None
+        store = ColumnStore(model, model.column_attributes)
+        for key, obj in objects.items():
+            store.add(key, obj)
+        return store
+
+    def __geo_index(self, class_name, min_lat, max_lat,
+                    min_lon=None, max_lon=None):
+        """
+        Returns a GeoIndex of the objects of a class inside
+        a latitude range, and a longitude range if given.
+        """
+        model = self.classes[class_name]
+        latitude, longitude = model.geo_attributes
+        where = "{} BETWEEN ? AND ?".format(latitude)
+        parameters = (min_lat, max_lat)
+        if min_lon is not None:
+            where += " AND {} BETWEEN ? AND ?".format(longitude)
+            parameters += (min_lon, max_lon)
+        index = GeoIndex(latitude, longitude)
+        for key, obj in self.__select(class_name, where, parameters).items():
+            index.add(key, obj)
+        return index
+
+    def __geo_classes(self, cls):
+        """Returns the names of the classes to search."""
+        if cls is None:
+            return [name for name, model in self.classes.items()
+                    if model.geo_attributes]
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        model = self.classes.get(cls)
+        return [cls] if model is not None and model.geo_attributes else []
+
+    def near(self, lat, lon, radius, cls=None):
+        """
+        Returns the objects within radius kilometers of a point,
+        closest first, among the classes with geo_attributes.
+        The rows are first narrowed down to the latitude range
+        with the index on the geo columns.
+
+        Args:
+            lat (float): Latitude of the center, in degrees.
+            lon (float): Longitude of the center, in degrees.
+            radius (float): Distance in kilometers.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        span = math.degrees(radius / EARTH_RADIUS_KM)
+        matches = {}
+        for class_name in self.__geo_classes(cls):
+            index = self.__geo_index(class_name, lat - span, lat + span)
+            matches.update(index.near(lat, lon, radius))
+        return matches
+
+    def within(self, min_lat, min_lon, max_lat, max_lon, cls=None):
+        """
+        Returns the objects inside a bounding box, edges included,
+        among the classes with geo_attributes.
+
+        Args:
+            min_lat, min_lon (float): South-west corner, in degrees.
+            max_lat, max_lon (float): North-east corner, in degrees.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        matches = {}
+        for class_name in self.__geo_classes(cls):
+            index = self.__geo_index(class_name, min_lat, max_lat,
+                                     min_lon, max_lon)
+            matches.update(index.within(min_lat, min_lon, max_lat, max_lon))
+        return matches
+
+    def new(self, obj):
+        """
+        Adds obj to the objects to insert on the next save().
+
+        Args:
+            obj: Instance object to store.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        DBStorage.__identity[key] = obj
+        DBStorage.__changes[key] = obj
+
+    def attach(self, obj):
+        """
+        Sets obj in the identity map without marking it as changed.
+
+        Args:
+            obj: Instance object already in the database.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        DBStorage.__identity[key] = obj
+
+    def detach(self, key):
+        """
+        Forgets the object stored under key, and its unsaved changes.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+        """
+        DBStorage.__identity.pop(key, None)
+        DBStorage.__changes.pop(key, None)
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from the database on the next save().
+
+        Args:
+            obj: Instance object to delete.
+        """
+        if obj is None:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        DBStorage.__identity.pop(key, None)
+        DBStorage.__changes[key] = None
+
+    def touch(self, obj, name=None):
+        """
+        Marks obj as changed if it is the object in use
+        for its key, so the next save() writes it.
+
+        Args:
+            obj: Instance object that was modified.
+            name (str): Name of the attribute set (unused).
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if DBStorage.__identity.get(key) is obj:
+            DBStorage.__changes[key] = obj
+
+    def is_dirty(self, obj):
+        """
+        Tells whether obj changed since the last save.
+
+        Args:
+            obj: Instance object to check.
+
+        Returns:
+            bool: True if obj was added or modified since the last save.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        return DBStorage.__changes.get(key) is obj
+
+    def changes(self, keep=False):
+        """
+        Returns the changes since the last save and forgets them.
+
+        Args:
+            keep (bool): Whether the changes are kept, e.g. to look
+                         at them without saving them (optional).
+
+        Returns:
+            dict: Changed objects by <class name>.id,
+                  None for the deleted ones.
+        """
+        changes = DBStorage.__changes
+        if keep:
+            return dict(changes)
+        DBStorage.__changes = {}
+        return changes
+
+    def requeue(self, changes):
+        """
+        Puts back changes taken by changes() that could not be
+        written, so the next save writes them. Changes made since
+        they were taken win.
+
+        Args:
+            changes (dict): Changes returned by changes().
+        """
+        for key, obj in changes.items():
+            DBStorage.__changes.setdefault(key, obj)
+
+    def write(self):
+        """
+        Writes the changes since the last save in one transaction:
+        changed objects are inserted or updated, deleted ones removed.
+        If the transaction fails, the changes are kept for the
+        next save.
+        """
+        with self.committing() as changes:
+            if changes:
+                self.__commit(changes)
+
+    def __commit(self, changes):
+        """
+        Writes changes in one transaction.
+
+        Args:
+            changes (dict): Changes returned by changes().
+        """
+        upserts = {}
+        deletes = {}
+        for key, obj in changes.items():
+            class_name, _, obj_id = key.partition('.')
+            if obj is None:
+                deletes.setdefault(class_name, []).append((obj_id,))
+                continue
+            model = self.classes.get(class_name, type(obj))
+            values = obj.to_dict()
+            row = [obj.id, values['created_at'], values['updated_at']]
+            for name in self.__columns(model):
+                value = getattr(obj, name, None)
+                if name in model.geo_attributes:
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        value = None
+                elif not isinstance(value, (str, int, float)):
+                    value = None
+                row.append(value)
+            row.append(json.dumps(values))
+            upserts.setdefault(class_name, []).append(row)
+        connection = DBStorage.__connection
+        with connection:
+            for class_name, rows in deletes.items():
+                connection.executemany(
+                    self.__statement(class_name, "delete"), rows)
+            for class_name, rows in upserts.items():
+                connection.executemany(
+                    self.__statement(class_name, "upsert"), rows)
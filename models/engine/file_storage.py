@@ -4,7 +4,17 @@ Module: file_storage
 Defines the FileStorage class.
 """
 
-import json
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from os import getenv
+from models.engine import formats
+from models.engine.atomic import atomic_write
+from models.engine.columns import ColumnStore
+from models.engine.geo import GeoIndex
+from models.engine.index import AttributeIndex
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -19,10 +29,53 @@ class FileStorage:
     FileStorage class.
     Serializes instances to a JSON file and
     deserializes JSON file to instances.
+
+    The file is file.json unless the HBNB_FILE_PATH environment
+    variable names another one. Its format (see models.engine.formats)
+    follows the file extension, or the HBNB_STORAGE_FORMAT
+    environment variable when set.
+
+    Public Class Attributes:
+        group_commit_window (float): Seconds a write waits for other
+                                     threads' saves to join it in a
+                                     single write. 0 (default)
+                                     writes right away.
+        flush_every (int): Number of save() calls collapsed into one
+                           write. 0 (default) writes on every save().
+        flush_interval (float): Seconds after the first deferred save
+                                after which the deferred saves are
+                                written, by a timer thread if no
+                                save() comes first.
+                                0 (default) for no time limit.
+        exclusive_reads (bool): Whether queries change the store
+                                (e.g. by building objects), so the
+                                thread-safe variant of the engine
+                                runs them alone (see thread_safe).
     """
 
-    __file_path = "file.json"
+    __file_path = getenv("HBNB_FILE_PATH", "file.json")
+    __format = formats.for_path(__file_path, getenv("HBNB_STORAGE_FORMAT"))
     __objects = {}
+    __changes = {}
+    __by_class = {}
+    __by_attribute = {}
+    __columns = {}
+    __geo = {}
+    __orders = {}
+    __indexed = None
+    __commit = threading.Condition()
+    __requested = 0
+    __written = 0
+    __writing = False
+    __batches = 0
+    __pending = 0
+    __pending_since = 0
+    __timer = None
+    __flush_at_exit = False
+    group_commit_window = 0
+    flush_every = 0
+    flush_interval = 0
+    exclusive_reads = False
     classes = {
         "BaseModel": BaseModel,
         "User": User,
@@ -33,14 +86,304 @@ class FileStorage:
         "Review": Review
     }
 
-    def all(self):
+    def all(self, cls=None):
+        """
+        Returns the dictionary __objects, or only the objects
+        of one class when cls is given.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+
+        Returns:
+            dict: Dictionary containing the objects by <class name>.id.
+        """
+        if cls is None:
+            return FileStorage.__objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return dict(self.__index().get(cls, {}))
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects, or of objects of one class,
+        from the per-class index kept up to date by new(), delete()
+        and reload(), without going through the objects.
+
+        Args:
+            cls: Class or class name to count (optional).
+
+        Returns:
+            int: Number of objects.
+        """
+        if cls is None:
+            return len(FileStorage.__objects)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return len(self.__index().get(cls, ()))
+
+    @property
+    def file_path(self):
+        """
+        str: Path of the storage file.
+        """
+        return FileStorage.__file_path
+
+    @property
+    def format(self):
+        """
+        Format of the storage file (see models.engine.formats).
+        """
+        return FileStorage.__format
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id.
+
+        Args:
+            cls: Class or class name of the object.
+            id (str): Id of the object.
+
+        Returns:
+            The object, or None if it isn't stored.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return FileStorage.__objects.get("{}.{}".format(cls, id))
+
+    def after(self, key, cls=None, limit=0):
+        """
+        Returns the objects listed after key by all(cls), e.g. to
+        page through them. The position of key is read from a list
+        of the keys, built by the first call after objects were
+        added or removed, so a page only costs its own objects.
+
+        Args:
+            key (str): Key <class name>.id of an object listed.
+            cls: Class or class name to filter on (optional).
+            limit (int): Largest number of objects returned;
+                         0 (default) for no limit.
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id,
+                  or None if key isn't listed.
+        """
+        by_class = self.__index()
+        if cls is None:
+            objects = FileStorage.__objects
+        else:
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            objects = by_class.get(cls, {})
+        order = FileStorage.__orders.get(cls)
+        if order is None:
+            keys = list(objects)
+            order = (keys, {listed: i for i, listed in enumerate(keys)})
+            FileStorage.__orders[cls] = order
+        keys, positions = order
+        position = positions.get(key)
+        if position is None:
+            return None
+        end = position + 1 + limit if limit else len(keys)
+        return {listed: objects[listed] for listed in keys[position + 1:end]}
+
+    def lookup(self, cls, attribute, value):
         """
-        Returns the dictionary __objects.
+        Returns the objects of a class whose attribute equals value.
+        Attributes listed in the class indexed_attributes are answered
+        from a hash index, the others by scanning the class objects.
+
+        Args:
+            cls: Class or class name of the objects.
+            attribute (str): Name of the attribute.
+            value: Value to look up.
+
+        Returns:
+            dict: Dictionary of the matching objects by <class name>.id.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__index()
+        index = FileStorage.__by_attribute.get(cls, {}).get(attribute)
+        if index is not None:
+            return index.find(value)
+        return {
+            key: obj for key, obj in self.all(cls).items()
+            if getattr(obj, attribute, None) == value
+        }
+
+    def columns(self, cls):
+        """
+        Returns the column store of a class, which keeps the
+        attributes listed in the class column_attributes in arrays.
+
+        Args:
+            cls: Class or class name.
 
         Returns:
-            dict: Dictionary containing all objects by <class name>.id.
+            ColumnStore: The store, or None if the class has no
+                         column attributes or no objects.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__index()
+        return FileStorage.__columns.get(cls)
+
+    def __geo_indexes(self, cls):
+        """
+        Returns the geo indexes to query.
+
+        Args:
+            cls: Class or class name, or None for every class.
+
+        Returns:
+            list: GeoIndex objects.
+        """
+        self.__index()
+        if cls is None:
+            return list(FileStorage.__geo.values())
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return [FileStorage.__geo[cls]] if cls in FileStorage.__geo else []
+
+    def near(self, lat, lon, radius, cls=None):
+        """
+        Returns the objects within radius kilometers of a point,
+        closest first, among the classes with geo_attributes.
+
+        Args:
+            lat (float): Latitude of the center, in degrees.
+            lon (float): Longitude of the center, in degrees.
+            radius (float): Distance in kilometers.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        matches = {}
+        for index in self.__geo_indexes(cls):
+            matches.update(index.near(lat, lon, radius))
+        return matches
+
+    def within(self, min_lat, min_lon, max_lat, max_lon, cls=None):
+        """
+        Returns the objects inside a bounding box, edges included,
+        among the classes with geo_attributes.
+
+        Args:
+            min_lat, min_lon (float): South-west corner, in degrees.
+            max_lat, max_lon (float): North-east corner, in degrees.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        matches = {}
+        for index in self.__geo_indexes(cls):
+            matches.update(index.within(min_lat, min_lon, max_lat, max_lon))
+        return matches
+
+    def __index(self):
+        """
+        Returns the per-class index of __objects.
+        The indexes are rebuilt if __objects was replaced.
+
+        Returns:
+            dict: Dictionary of {<class name>: {<class name>.id: obj}}.
+        """
+        if FileStorage.__indexed is not FileStorage.__objects:
+            FileStorage.__by_class = {}
+            FileStorage.__by_attribute = {}
+            FileStorage.__columns = {}
+            FileStorage.__geo = {}
+            FileStorage.__orders = {}
+            for key, obj in FileStorage.__objects.items():
+                self.__index_add(key, obj)
+            FileStorage.__indexed = FileStorage.__objects
+        return FileStorage.__by_class
+
+    def __index_add(self, key, obj):
+        """
+        Adds obj to the per-class, attribute and geo indexes
+        and to the column store of its class.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+            obj: Instance object to index.
+        """
+        class_name = key.partition('.')[0]
+        FileStorage.__by_class.setdefault(class_name, {})[key] = obj
+        indexes = FileStorage.__by_attribute.get(class_name)
+        if indexes is None:
+            indexes = {
+                attribute: AttributeIndex(attribute)
+                for attribute in getattr(obj, "indexed_attributes", ())
+            }
+            FileStorage.__by_attribute[class_name] = indexes
+            attributes = getattr(obj, "column_attributes", ())
+            if attributes:
+                FileStorage.__columns[class_name] = ColumnStore(
+                    type(obj), attributes)
+            attributes = getattr(obj, "geo_attributes", ())
+            if attributes:
+                FileStorage.__geo[class_name] = GeoIndex(*attributes)
+        for index in indexes.values():
+            index.add(key, obj)
+        if class_name in FileStorage.__columns:
+            FileStorage.__columns[class_name].add(key, obj)
+        if class_name in FileStorage.__geo:
+            FileStorage.__geo[class_name].add(key, obj)
+
+    def __add(self, obj):
+        """
+        Sets obj in __objects and in the indexes.
+
+        Args:
+            obj: Instance object to set in __objects.
+
+        Returns:
+            str: Key <class name>.id of the object.
+        """
+        self.__index()
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if key not in FileStorage.__objects:
+            self.__reorder(key)
+        FileStorage.__objects[key] = obj
+        self.__index_add(key, obj)
+        return key
+
+    def __remove(self, key):
+        """
+        Removes the object stored under key from __objects
+        and from the indexes.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+
+        Returns:
+            The removed object, or None if key wasn't stored.
+        """
+        by_class = self.__index()
+        obj = FileStorage.__objects.pop(key, None)
+        if obj is not None:
+            self.__reorder(key)
+            class_name = key.partition('.')[0]
+            by_class[class_name].pop(key, None)
+            for index in FileStorage.__by_attribute[class_name].values():
+                index.remove(key)
+            if class_name in FileStorage.__columns:
+                FileStorage.__columns[class_name].remove(key)
+            if class_name in FileStorage.__geo:
+                FileStorage.__geo[class_name].remove(key)
+        return obj
+
+    def __reorder(self, key):
         """
-        return FileStorage.__objects
+        Drops the key lists of after() that key is added to
+        or removed from.
+        """
+        if FileStorage.__orders:
+            FileStorage.__orders.pop(None, None)
+            FileStorage.__orders.pop(key.partition('.')[0], None)
 
     def new(self, obj):
         """
@@ -49,32 +392,362 @@ class FileStorage:
         Args:
             obj: Instance object to set in __objects.
         """
+        key = self.__add(obj)
+        FileStorage.__changes[key] = obj
+
+    def attach(self, obj):
+        """
+        Sets obj in __objects without marking it as changed.
+        Used when loading objects that are already on disk.
+
+        Args:
+            obj: Instance object to set in __objects.
+        """
+        self.__add(obj)
+
+    def detach(self, key):
+        """
+        Removes the object stored under key without marking
+        it as changed. Used when replaying deletions from disk.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+        """
+        self.__remove(key)
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from __objects if it's inside.
+
+        Args:
+            obj: Instance object to remove from __objects.
+        """
+        if obj is None:
+            return
         key = "{}.{}".format(obj.__class__.__name__, obj.id)
-        FileStorage.__objects[key] = obj
+        if self.__remove(key) is not None:
+            FileStorage.__changes[key] = None
+
+    def bulk_new(self, objs):
+        """
+        Sets many objects in __objects and saves once.
+
+        Args:
+            objs (iterable): Instance objects to set in __objects.
+
+        Returns:
+            list: Keys <class name>.id of the objects.
+        """
+        keys = []
+        for obj in objs:
+            self.new(obj)
+            keys.append("{}.{}".format(obj.__class__.__name__, obj.id))
+        self.save()
+        return keys
+
+    def bulk_update(self, updates):
+        """
+        Sets attributes on many objects and saves once.
+        Each object is re-indexed once, whatever the number of
+        attributes set, and its updated_at is set to now.
+        id, created_at, updated_at and __class__ can't be updated.
+
+        Args:
+            updates: Dictionary, or iterable of pairs, of
+                     {<class name>.id: {attribute name: value}}.
+
+        Returns:
+            list: Keys of the updated objects; keys not stored
+                  are skipped.
+        """
+        if isinstance(updates, dict):
+            updates = updates.items()
+        now = datetime.now()
+        updated = []
+        for key, attributes in updates:
+            class_name, _, obj_id = key.partition('.')
+            obj = self.get(class_name, obj_id)
+            if obj is None:
+                continue
+            values = {
+                name: value for name, value in attributes.items()
+                if name not in ('id', 'created_at', 'updated_at',
+                                '__class__')
+            }
+            values['updated_at'] = now
+            obj.restore(values)
+            self.touch(obj)
+            updated.append(key)
+        self.save()
+        return updated
+
+    def bulk_delete(self, keys):
+        """
+        Deletes many objects from __objects and saves once.
+
+        Args:
+            keys (iterable): Keys <class name>.id of the objects.
+
+        Returns:
+            list: Keys of the deleted objects; keys not stored
+                  are skipped.
+        """
+        deleted = []
+        for key in keys:
+            class_name, _, obj_id = key.partition('.')
+            obj = self.get(class_name, obj_id)
+            if obj is not None:
+                self.delete(obj)
+                deleted.append(key)
+        self.save()
+        return deleted
+
+    def touch(self, obj, name=None):
+        """
+        Marks obj as changed if it is the object stored in __objects
+        and brings its attribute indexes up to date.
+
+        Args:
+            obj: Instance object that was modified.
+            name (str): Name of the attribute set (optional); only
+                        the indexes covering it are updated.
+        """
+        class_name = obj.__class__.__name__
+        key = "{}.{}".format(class_name, obj.id)
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        FileStorage.__changes[key] = obj
+        indexes = FileStorage.__by_attribute.get(class_name)
+        if name is None or indexes is None:
+            self.__index_add(key, obj)
+            return
+        index = indexes.get(name)
+        if index is not None:
+            index.add(key, obj)
+        columns = FileStorage.__columns.get(class_name)
+        if columns is not None:
+            columns.update(key, obj, name)
+        geo = FileStorage.__geo.get(class_name)
+        if geo is not None and name in (geo.latitude, geo.longitude):
+            geo.add(key, obj)
+
+    def is_dirty(self, obj):
+        """
+        Tells whether obj changed since the last save.
+
+        Args:
+            obj: Instance object to check.
+
+        Returns:
+            bool: True if obj was added or modified since the last save.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        return FileStorage.__changes.get(key) is obj
+
+    def changes(self, keep=False):
+        """
+        Returns the changes since the last save and forgets them.
+
+        Args:
+            keep (bool): Whether the changes are kept, e.g. to look
+                         at them without saving them (optional).
+
+        Returns:
+            dict: Changed objects by <class name>.id,
+                  None for the deleted ones.
+        """
+        changes = FileStorage.__changes
+        if keep:
+            return dict(changes)
+        FileStorage.__changes = {}
+        return changes
+
+    def requeue(self, changes):
+        """
+        Puts back changes taken by changes() that could not be
+        written, so the next save writes them. Changes made since
+        they were taken win.
+
+        Args:
+            changes (dict): Changes returned by changes().
+        """
+        for key, obj in changes.items():
+            FileStorage.__changes.setdefault(key, obj)
+
+    @contextmanager
+    def committing(self):
+        """
+        Context manager giving the changes since the last save to
+        the write of an engine, e.g.:
+
+            with self.committing() as changes:
+                <write changes>
+
+        The changes are forgotten when the block ends, or put back
+        by requeue() if it raises, so a failed save loses nothing.
+        """
+        changes = self.changes()
+        try:
+            yield changes
+        except BaseException:
+            self.requeue(changes)
+            raise
 
     def save(self):
         """
-        Serializes __objects to the JSON file (__file_path).
+        Persists __objects, right away by default.
+
+        Inside a batch() block the write is deferred to the end of
+        the block. With flush_every or flush_interval set, saves are
+        counted and written together once flush_every saves were
+        made or flush_interval seconds passed since the first one;
+        a threading.Timer writes them once that time is up, so the
+        last saves of a burst aren't left unwritten.
+        Deferred saves are written by flush(), and at exit.
+        """
+        if not (FileStorage.__batches or self.flush_every > 1 or
+                self.flush_interval > 0):
+            self.flush()
+            return
+        now = time.monotonic()
+        with FileStorage.__commit:
+            if not FileStorage.__pending:
+                FileStorage.__pending_since = now
+                if not FileStorage.__flush_at_exit:
+                    atexit.register(self.__flush_pending)
+                    FileStorage.__flush_at_exit = True
+                if self.flush_interval > 0 and not FileStorage.__batches:
+                    timer = threading.Timer(self.flush_interval,
+                                            self.__flush_pending)
+                    timer.daemon = True
+                    FileStorage.__timer = timer
+                    timer.start()
+            FileStorage.__pending += 1
+            due = not FileStorage.__batches and (
+                (self.flush_every and
+                 FileStorage.__pending >= self.flush_every) or
+                (self.flush_interval and
+                 now - FileStorage.__pending_since >= self.flush_interval))
+        if due:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager deferring every save() made inside the block
+        to a single write when the block ends, e.g.:
+
+            with storage.batch():
+                for row in rows:
+                    User(**row).save()
+
+        Blocks can be nested; the write happens when the outermost
+        one ends, even if it raises.
+        """
+        with FileStorage.__commit:
+            FileStorage.__batches += 1
+        try:
+            yield self
+        finally:
+            with FileStorage.__commit:
+                FileStorage.__batches -= 1
+                done = not FileStorage.__batches
+            if done:
+                self.__flush_pending()
+
+    def pending(self):
+        """
+        Returns the number of save() calls not written yet.
+
+        Returns:
+            int: Number of deferred saves.
+        """
+        return FileStorage.__pending
+
+    def flush(self):
+        """
+        Writes the store now, including any deferred saves.
+
+        With a group_commit_window, concurrent calls share writes:
+        the first caller waits for the window, then writes for every
+        call made so far, and returns along with them; calls made
+        while it writes are covered by the next write.
+        """
+        commit = FileStorage.__commit
+        with commit:
+            FileStorage.__pending = 0
+            timer = FileStorage.__timer
+            FileStorage.__timer = None
+        if timer is not None:
+            timer.cancel()
+        window = self.group_commit_window
+        if window <= 0:
+            self.write()
+            return
+        with commit:
+            FileStorage.__requested += 1
+            ticket = FileStorage.__requested
+            while FileStorage.__written < ticket:
+                if not FileStorage.__writing:
+                    FileStorage.__writing = True
+                    break
+                commit.wait()
+            else:
+                return
+        written = None
+        try:
+            time.sleep(window)
+            with commit:
+                covered = FileStorage.__requested
+            self.write()
+            written = covered
+        finally:
+            with commit:
+                FileStorage.__writing = False
+                if written is not None:
+                    FileStorage.__written = written
+                commit.notify_all()
+
+    def __flush_pending(self):
+        """Writes the store if saves were deferred."""
+        if FileStorage.__pending:
+            self.flush()
+
+    def write(self):
+        """
+        Serializes __objects to the file (__file_path).
+
+        The file is replaced atomically (see atomic.atomic_write),
+        so a crash never leaves a truncated store.
+        """
+        self.__write()
+
+    def __write(self):
+        """
+        Writes __objects to the file (__file_path),
+        one object at a time.
         """
-        obj_dict = {}
-        for key, value in FileStorage.__objects.items():
-            obj_dict[key] = value.to_dict()
-        with open(FileStorage.__file_path, 'w', encoding='utf-8') as file:
-            json.dump(obj_dict, file)
+        encode = FileStorage.__format.encode
+        with self.committing():
+            items = list(FileStorage.__objects.items())
+            with atomic_write(FileStorage.__file_path) as file:
+                FileStorage.__format.dump(
+                    ((key, encode(obj)) for key, obj in items), file)
 
     def reload(self):
         """
-        Deserializes the JSON file (__file_path) to __objects.
-        Only if the JSON file exists; otherwise, do nothing.
+        Deserializes the file (__file_path) to __objects.
+        The file is decoded one object at a time, so the raw
+        document is never held in memory next to the objects.
+        Only if the file exists; otherwise, do nothing.
         If the file doesn't exist, no exception should be raised.
         """
         try:
-            with open(FileStorage.__file_path, 'r', encoding='utf-8') as file:
-                obj_dict = json.load(file)
-                for key, value in obj_dict.items():
+            with open(FileStorage.__file_path, 'rb') as file:
+                for key, value in FileStorage.__format.load(file):
                     class_name, obj_id = key.split('.')
                     cls = self.classes[class_name]
                     obj = cls(**value)
-                    self.new(obj)
+                    self.attach(obj)
         except FileNotFoundError:
             pass
@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+"""
+Module: formats
+Defines the file formats FileStorage can serialize __objects to.
+
+A format writes and reads the store as a stream of
+(<class name>.id, value) items, where value is the dictionary
+given by to_dict(). The format of a file is chosen from its
+extension, or from the HBNB_STORAGE_FORMAT environment variable.
+
+Converting a file from one format to another:
+    python3 -m models.engine.convert file.json file.pickle
+"""
+
+import io
+import json
+import pickle
+from datetime import datetime
+from models import timestamp
+from models.base_model import BaseModel
+from models.compact import CompactModel
+from models.engine import snapshot
+from models.engine.json_stream import iter_items
+
+encoder = json.JSONEncoder(default=timestamp.format)
+
+
+class JSONFormat:
+    """
+    JSONFormat class.
+    The store is one JSON object of the to_dict() dictionaries,
+    readable by json.load. This is the default format.
+    Datetimes found in the values are written as ISO strings.
+    """
+
+    name = "json"
+    extensions = (".json",)
+
+    def encode(self, obj):
+        """
+        Returns the value stored for obj.
+
+        Args:
+            obj: Instance object to store.
+
+        Returns:
+            dict: Dictionary given by obj.to_dict().
+        """
+        return obj.to_dict()
+
+    def dump(self, items, file):
+        """
+        Writes the items to file one at a time.
+
+        Args:
+            items (iterable): (<class name>.id, value) pairs.
+            file: Binary file object open for writing.
+        """
+        text = io.TextIOWrapper(file, encoding='utf-8', newline='')
+        try:
+            text.write("{")
+            separator = ""
+            for key, value in items:
+                text.write(separator + json.dumps(key) + ": " +
+                           encoder.encode(value))
+                separator = ", "
+            text.write("}")
+            text.flush()
+        finally:
+            text.detach()
+
+    def load(self, file):
+        """
+        Yields the (<class name>.id, value) items of file,
+        decoding one value at a time.
+
+        Args:
+            file: Binary file object open for reading.
+
+        Raises:
+            ValueError: If the file doesn't hold a JSON object.
+        """
+        text = io.TextIOWrapper(file, encoding='utf-8')
+        try:
+            yield from iter_items(text)
+        finally:
+            text.detach()
+
+
+class Unpickler(pickle.Unpickler):
+    """
+    Unpickler class.
+    Unpickler that only builds datetimes, so loading a file
+    can't run code the way an arbitrary pickle can.
+    """
+
+    def find_class(self, module, name):
+        """
+        Returns the datetime class, the only global a file may use.
+
+        Raises:
+            pickle.UnpicklingError: For any other global.
+        """
+        if (module, name) == ("datetime", "datetime"):
+            return datetime
+        raise pickle.UnpicklingError(
+            "global '{}.{}' is forbidden".format(module, name))
+
+
+class PickleFormat:
+    """
+    PickleFormat class.
+    Binary format: a header followed by pickles (protocol 5) of
+    batches of items. created_at and updated_at are stored as
+    datetimes instead of ISO strings, so they are neither
+    formatted on save nor parsed on load.
+    """
+
+    name = "pickle"
+    extensions = (".pickle", ".pkl")
+    header = b"HBNB-PICKLE-1\n"
+    batch_size = 1000
+
+    def encode(self, obj):
+        """
+        Returns the value stored for obj.
+
+        Args:
+            obj: Instance object to store.
+
+        Returns:
+            dict: Dictionary given by obj.to_dict(), with
+                  created_at and updated_at left as datetimes.
+        """
+        to_dict = type(obj).to_dict
+        if to_dict is BaseModel.to_dict:
+            value = obj.__dict__.copy()
+        elif to_dict is CompactModel.to_dict:
+            value = obj.attributes()
+        else:
+            value = obj.to_dict()
+            value['created_at'] = obj.created_at
+            value['updated_at'] = obj.updated_at
+        value['__class__'] = type(obj).__name__
+        return value
+
+    def dump(self, items, file):
+        """
+        Writes the items to file, batch_size items per pickle.
+
+        Args:
+            items (iterable): (<class name>.id, value) pairs.
+            file: Binary file object open for writing.
+        """
+        file.write(self.header)
+        batch = []
+        for key, value in items:
+            if (type(value.get('created_at')) is str or
+                    type(value.get('updated_at')) is str):
+                value = dict(value)
+                for name in ('created_at', 'updated_at'):
+                    if name in value:
+                        value[name] = timestamp.parse(value[name])
+            batch.append((key, value))
+            if len(batch) == self.batch_size:
+                pickle.dump(batch, file, protocol=5)
+                batch = []
+        if batch:
+            pickle.dump(batch, file, protocol=5)
+
+    def load(self, file):
+        """
+        Yields the (<class name>.id, value) items of file,
+        decoding one batch at a time.
+
+        Args:
+            file: Binary file object open for reading.
+
+        Raises:
+            ValueError: If the file doesn't start with the header.
+        """
+        if file.read(len(self.header)) != self.header:
+            raise ValueError("Not a {} file".format(self.name))
+        unpickler = Unpickler(file)
+        while True:
+            try:
+                batch = unpickler.load()
+            except EOFError:
+                return
+            yield from batch
+
+
+class SnapshotFormat:
+    """
+    SnapshotFormat class.
+    Read-only snapshot laid out to be memory-mapped, with a sorted
+    index of the keys (see models.engine.snapshot); it is what
+    SnapshotStorage reads. Writing one needs a seekable file.
+    """
+
+    name = "snapshot"
+    extensions = (".snapshot",)
+
+    def encode(self, obj):
+        """
+        Returns the value stored for obj.
+
+        Args:
+            obj: Instance object to store.
+
+        Returns:
+            dict: Dictionary given by obj.to_dict().
+        """
+        return obj.to_dict()
+
+    def dump(self, items, file):
+        """
+        Writes the items to file.
+
+        Args:
+            items (iterable): (<class name>.id, value) pairs.
+            file: Seekable binary file object open for writing.
+        """
+        snapshot.write(items, file)
+
+    def load(self, file):
+        """
+        Yields the (<class name>.id, value) items of file,
+        in key order.
+
+        Args:
+            file: Binary file object open for reading.
+
+        Raises:
+            ValueError: If the file isn't a snapshot.
+        """
+        reader = snapshot.Snapshot(file)
+        try:
+            yield from reader.items()
+        finally:
+            reader.close()
+
+
+formats = {
+    fmt.name: fmt for fmt in (JSONFormat(), PickleFormat(), SnapshotFormat())
+}
+
+
+def for_path(path, name=None):
+    """
+    Returns the format of a file.
+
+    Args:
+        path (str): Path of the file; its extension gives the format.
+        name (str): Name of the format, overriding the extension
+                    (optional).
+
+    Returns:
+        The format object; JSONFormat for an unknown extension.
+
+    Raises:
+        ValueError: If name isn't a known format.
+    """
+    if name:
+        if name not in formats:
+            raise ValueError("Unknown storage format '{}'".format(name))
+        return formats[name]
+    for fmt in formats.values():
+        if path.endswith(fmt.extensions):
+            return fmt
+    return formats["json"]
+
+
+def convert(source, destination, source_format=None,
+            destination_format=None):
+    """
+    Rewrites a storage file in another format, one item at a time,
+    without building the objects.
+
+    Args:
+        source (str): Path of the file to read.
+        destination (str): Path of the file to write.
+        source_format (str): Name of the source format (optional).
+        destination_format (str): Name of the destination format
+                                  (optional).
+    """
+    reader = for_path(source, source_format)
+    writer = for_path(destination, destination_format)
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        writer.dump(reader.load(src), dst)
@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+"""
+Module: geo
+Defines the GeoIndex class.
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """
+    Returns the great-circle distance between two points.
+
+    Args:
+        lat1, lon1 (float): Coordinates of the first point, in degrees.
+        lat2, lon2 (float): Coordinates of the second point, in degrees.
+
+    Returns:
+        float: Distance in kilometers.
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) *
+         math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    """
+    GeoIndex class.
+    Grid index of the objects of one class by their coordinates.
+    The map is cut in square cells of cell_size degrees, so a query
+    only reads the cells overlapping its area.
+    Objects whose coordinates aren't numbers are not indexed.
+    Queries with a nan coordinate or a negative radius match
+    nothing; infinite bounds are cut to the edges of the map.
+    """
+
+    def __init__(self, latitude, longitude, cell_size=0.1):
+        """
+        Initializes an empty index.
+
+        Args:
+            latitude (str): Name of the latitude attribute.
+            longitude (str): Name of the longitude attribute.
+            cell_size (float): Side of a cell, in degrees.
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.cell_size = cell_size
+        self.__cells = {}
+        self.__points = {}
+
+    def __cell(self, lat, lon):
+        """Returns the cell holding a point."""
+        return (math.floor(lat / self.cell_size),
+                math.floor(lon / self.cell_size))
+
+    def add(self, key, obj):
+        """
+        Indexes obj at its current coordinates.
+        If key is already indexed, its entry is moved.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+            obj: Instance object to index.
+        """
+        try:
+            lat = float(getattr(obj, self.latitude))
+            lon = float(getattr(obj, self.longitude))
+        except (AttributeError, TypeError, ValueError):
+            self.remove(key)
+            return
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            self.remove(key)
+            return
+        point = self.__points.get(key)
+        if point is not None and point[:2] == (lat, lon):
+            self.__cells[point[2]][key] = obj
+            return
+        self.remove(key)
+        cell = self.__cell(lat, lon)
+        self.__cells.setdefault(cell, {})[key] = obj
+        self.__points[key] = (lat, lon, cell)
+
+    def remove(self, key):
+        """
+        Removes key from the index.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+        """
+        point = self.__points.pop(key, None)
+        if point is None:
+            return
+        cell = self.__cells[point[2]]
+        del cell[key]
+        if not cell:
+            del self.__cells[point[2]]
+
+    def __candidates(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Yields (key, lat, lon, obj) for the points in the cells
+        overlapping a bounding box.
+        """
+        low = self.__cell(min_lat, min_lon)
+        high = self.__cell(max_lat, max_lon)
+        rows = range(low[0], high[0] + 1)
+        columns = range(low[1], high[1] + 1)
+        if len(rows) * len(columns) > len(self.__cells):
+            cells = [
+                cell for cell in self.__cells
+                if cell[0] in rows and cell[1] in columns
+            ]
+        else:
+            cells = [
+                (row, column) for row in rows for column in columns
+                if (row, column) in self.__cells
+            ]
+        for cell in cells:
+            for key, obj in self.__cells[cell].items():
+                lat, lon = self.__points[key][:2]
+                yield key, lat, lon, obj
+
+    def within(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Returns the objects inside a bounding box, edges included.
+
+        Args:
+            min_lat, min_lon (float): South-west corner, in degrees.
+            max_lat, max_lon (float): North-east corner, in degrees.
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        if any(map(math.isnan, (min_lat, min_lon, max_lat, max_lon))):
+            return {}
+        min_lat, max_lat = max(-90, min_lat), min(90, max_lat)
+        min_lon, max_lon = max(-180, min_lon), min(180, max_lon)
+        if min_lat > max_lat or min_lon > max_lon:
+            return {}
+        return {
+            key: obj for key, lat, lon, obj in self.__candidates(
+                min_lat, min_lon, max_lat, max_lon)
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+        }
+
+    def near(self, lat, lon, radius):
+        """
+        Returns the objects within radius kilometers of a point,
+        closest first.
+
+        Args:
+            lat, lon (float): Coordinates of the center, in degrees.
+            radius (float): Distance in kilometers.
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        if not (radius >= 0 and math.isfinite(lat) and math.isfinite(lon)):
+            return {}
+        angle = radius / EARTH_RADIUS_KM
+        lat_span = math.degrees(angle)
+        cos_lat = math.cos(math.radians(lat))
+        if angle >= math.pi / 2 or math.sin(angle) >= cos_lat:
+            lon_ranges = [(-180, 180)]
+        else:
+            lon_span = math.degrees(math.asin(math.sin(angle) / cos_lat))
+            west, east = lon - lon_span, lon + lon_span
+            if west < -180:
+                lon_ranges = [(-180, east), (west + 360, 180)]
+            elif east > 180:
+                lon_ranges = [(west, 180), (-180, east - 360)]
+            else:
+                lon_ranges = [(west, east)]
+        min_lat = max(-90, lat - lat_span)
+        max_lat = min(90, lat + lat_span)
+        matches = []
+        for west, east in lon_ranges:
+            for key, point_lat, point_lon, obj in self.__candidates(
+                    min_lat, west, max_lat, east):
+                km = distance(lat, lon, point_lat, point_lon)
+                if km <= radius:
+                    matches.append((km, key, obj))
+        matches.sort()
+        return {key: obj for km, key, obj in matches}
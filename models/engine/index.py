@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Module: index
+Defines the AttributeIndex class.
+"""
+
+
+class AttributeIndex:
+    """
+    AttributeIndex class.
+    Hash index of the objects of one class by the value
+    of one of their attributes, e.g. Place.city_id.
+    """
+
+    def __init__(self, attribute):
+        """
+        Initializes an empty index.
+
+        Args:
+            attribute (str): Name of the indexed attribute.
+        """
+        self.attribute = attribute
+        self.__buckets = {}
+        self.__values = {}
+
+    def add(self, key, obj):
+        """
+        Indexes obj under the current value of the attribute.
+        If key is already indexed, its entry is moved.
+        Unhashable values (e.g. lists) are not indexed.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+            obj: Instance object to index.
+        """
+        value = getattr(obj, self.attribute, None)
+        if key in self.__values:
+            if self.__values[key] == value:
+                self.__buckets[value][key] = obj
+                return
+            self.remove(key)
+        try:
+            bucket = self.__buckets.setdefault(value, {})
+        except TypeError:
+            return
+        bucket[key] = obj
+        self.__values[key] = value
+
+    def remove(self, key):
+        """
+        Removes key from the index.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+        """
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        bucket = self.__buckets[value]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[value]
+
+    def find(self, value):
+        """
+        Returns the objects whose attribute equals value.
+
+        Args:
+            value: Value of the attribute to look up.
+
+        Returns:
+            dict: Dictionary of the matching objects by <class name>.id.
+        """
+        try:
+            return dict(self.__buckets.get(value, {}))
+        except TypeError:
+            return {}
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""
+Module: journal_storage
+Defines the JournalStorage class.
+"""
+
+import json
+import os
+from models.engine.file_storage import FileStorage
+
+
+class JournalStorage(FileStorage):
+    """
+    JournalStorage class.
+    Keeps the FileStorage file as a snapshot and appends every
+    mutation to a write-ahead log instead of rewriting the snapshot.
+
+    Each line of the log is a JSON record:
+        {"op": "put", "key": "<class name>.<id>", "value": {...}}
+        {"op": "del", "key": "<class name>.<id>"}
+
+    save() only encodes the objects changed since the previous save
+    (see FileStorage.changes), so a single-object write costs the
+    same whatever the store size.
+    The log is folded back into the snapshot by compact(), which runs
+    automatically once the log holds more records than the store.
+
+    Appends are flushed to disk (os.fsync) before save() returns.
+    A record torn by a crash is dropped on its own: the next append
+    starts on a new line, and reload() skips the lines that aren't
+    valid records and cuts off an unfinished last line.
+    """
+
+    __log_records = 0
+    compact_min_records = 1000
+
+    @property
+    def log_path(self):
+        """
+        str: Path of the log, next to the snapshot file.
+        """
+        return self.file_path + ".log"
+
+    def write(self):
+        """
+        Appends the pending changes to the log (log_path).
+        Compacts the log into the snapshot when it grows
+        larger than the store itself.
+        """
+        with self.committing() as changes:
+            if not changes:
+                return
+            lines = []
+            for key, obj in changes.items():
+                if obj is None:
+                    record = {"op": "del", "key": key}
+                else:
+                    record = {"op": "put", "key": key,
+                              "value": obj.to_dict()}
+                lines.append(json.dumps(record) + "\n")
+            self.__append("".join(lines).encode('utf-8'))
+        JournalStorage.__log_records += len(lines)
+
+        threshold = max(self.compact_min_records, len(self.all()))
+        if JournalStorage.__log_records > threshold:
+            self.compact()
+
+    def __append(self, data):
+        """
+        Appends records to the log and flushes them to disk.
+        If the log ends with a torn record, the records start on
+        a new line. If the append fails, the log is cut back to
+        its previous end, so no partial record is left.
+
+        Args:
+            data (bytes): Records, one per line.
+        """
+        with open(self.log_path, 'a+b', buffering=0) as file:
+            end = file.seek(0, os.SEEK_END)
+            if end and os.pread(file.fileno(), 1, end - 1) != b"\n":
+                data = b"\n" + data
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[file.write(view):]
+                os.fsync(file.fileno())
+            except BaseException:
+                file.truncate(end)
+                raise
+
+    def reload(self):
+        """
+        Loads the snapshot, then replays the log on top of it.
+        Lines which aren't valid records (torn by a crash) are
+        skipped, and an unfinished last line is cut off the log.
+        """
+        super().reload()
+        records = 0
+        end = 0
+        try:
+            with open(self.log_path, 'rb') as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    end += len(line)
+                    try:
+                        record = json.loads(line)
+                        key = record["key"]
+                        cls = self.classes[key.split('.')[0]]
+                        if record["op"] == "del":
+                            obj = None
+                        else:
+                            obj = cls(**record["value"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if obj is None:
+                        self.detach(key)
+                    else:
+                        self.attach(obj)
+                    records += 1
+                torn = os.fstat(file.fileno()).st_size > end
+        except FileNotFoundError:
+            torn = False
+        if torn:
+            os.truncate(self.log_path, end)
+        JournalStorage.__log_records = records
+
+    def compact(self):
+        """
+        Writes a full snapshot of __objects and empties the log.
+        Unsaved changes are included in the snapshot.
+        """
+        super().write()
+        with open(self.log_path, 'w', encoding='utf-8'):
+            pass
+        JournalStorage.__log_records = 0
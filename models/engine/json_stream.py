@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+Module: json_stream
+Incremental reader for the JSON file written by FileStorage.
+"""
+
+import io
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+decoder = json.JSONDecoder()
+
+
+def iter_items(file, chunk_size=CHUNK_SIZE):
+    """
+    Yields the (key, value) pairs of the JSON object stored in file
+    one at a time, reading the file in chunks of chunk_size characters.
+    Only the current chunk and the value being decoded are held in
+    memory, never the whole document.
+
+    Args:
+        file: Text file object positioned at the start of a JSON object.
+        chunk_size (int): Number of characters read at a time.
+
+    Raises:
+        ValueError: If the file doesn't hold a JSON object.
+    """
+    for key, value, start, end in iter_spans(file, chunk_size):
+        yield key, value
+
+
+def iter_offsets(file, chunk_size=CHUNK_SIZE):
+    """
+    Yields (key, start, end) for each value of the JSON object
+    stored in a binary file, where file[start:end] holds the value.
+
+    Args:
+        file: Binary file object positioned at the start of the file.
+        chunk_size (int): Number of bytes read at a time.
+
+    Raises:
+        ValueError: If the file doesn't hold a JSON object.
+    """
+    # latin-1 maps every byte to one character, so character offsets
+    # are byte offsets. JSON structure is ASCII and UTF-8 multi-byte
+    # sequences never contain ASCII bytes, so the scan stays correct.
+    text = io.TextIOWrapper(file, encoding='latin-1', newline='')
+    try:
+        for key, value, start, end in iter_spans(text, chunk_size):
+            yield key, start, end
+    finally:
+        text.detach()
+
+
+def iter_spans(file, chunk_size=CHUNK_SIZE):
+    """
+    Yields (key, value, start, end) for each item of the JSON object
+    stored in file, where start and end are the character offsets
+    of the value in the file.
+
+    Args:
+        file: Text file object positioned at the start of a JSON object.
+        chunk_size (int): Number of characters read at a time.
+
+    Raises:
+        ValueError: If the file doesn't hold a JSON object.
+    """
+    buffer = ""
+    pos = 0
+    offset = 0
+
+    def read_more():
+        """Appends the next chunk to the unread part of the buffer."""
+        nonlocal buffer, pos, offset
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return False
+        buffer = buffer[pos:] + chunk
+        offset += pos
+        pos = 0
+        return True
+
+    def peek():
+        """Skips whitespace and returns the next character, or ''."""
+        nonlocal pos
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ""
+
+    def decode():
+        """
+        Decodes the JSON value starting at pos. A match ending
+        within two characters of the end of the buffer may be a
+        number cut by the chunk ("1." or "1e+" match as 1), so it
+        is decoded again with the next chunk.
+        """
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if not read_more():
+                    raise
+                continue
+            if end >= len(buffer) - 2 and read_more():
+                continue
+            pos = end
+            return value
+
+    def expect(char):
+        """Consumes char or raises ValueError."""
+        nonlocal pos
+        found = peek()
+        if found != char:
+            raise ValueError("Expecting '{}', found '{}'".format(char, found))
+        pos += 1
+
+    expect('{')
+    if peek() == '}':
+        return
+    while True:
+        if peek() != '"':
+            raise ValueError("Expecting property name")
+        key = decode()
+        expect(':')
+        peek()
+        start = offset + pos
+        value = decode()
+        yield key, value, start, offset + pos
+        if peek() == '}':
+            return
+        expect(',')
@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+"""
+Module: lazy_storage
+Defines the LazyStorage class.
+"""
+
+import json
+from models.engine.atomic import atomic_write
+from models.engine.file_storage import FileStorage
+from models.engine.offsets import dump, read_index, scan, write_index
+
+
+class LazyStorage(FileStorage):
+    """
+    LazyStorage class.
+    Reads the FileStorage JSON file without building the objects:
+    reload() only records where each object is in the file, and
+    an object is built the first time it is accessed through
+    get(), all() or lookup().
+
+    Objects not accessed yet are copied byte for byte from the
+    old file on save(), so they are never decoded at all.
+    Only the JSON format can be read this way.
+
+    save() also writes the offset index of the file (see
+    models.engine.offsets), so reload() reads the offsets from it
+    instead of scanning the file. The file is only scanned when
+    the index is missing or stale (e.g. the file was saved by
+    another engine), and the index is then written for next time.
+    """
+
+    __unloaded = {}
+    exclusive_reads = True
+
+    def reload(self):
+        """
+        Records the key and file offsets of every object
+        in the JSON file (__file_path) without building them.
+        Objects in memory with the same key are dropped, as
+        FileStorage.reload() replaces them.
+
+        Raises:
+            ValueError: If the storage file isn't in JSON format.
+        """
+        if self.format.name != "json":
+            raise ValueError("LazyStorage only reads JSON files")
+        unloaded = {}
+        try:
+            with open(self.file_path, 'rb') as file:
+                unloaded = read_index(self.file_path, file)
+                if unloaded is None:
+                    unloaded = scan(file)
+                    self.__write_index(unloaded)
+        except FileNotFoundError:
+            pass
+        objects = super().all()
+        for spans in unloaded.values():
+            for key in spans.keys() & objects.keys():
+                self.detach(key)
+        LazyStorage.__unloaded = unloaded
+
+    def __load(self, spans):
+        """
+        Builds the objects found at the given file offsets
+        and sets them in __objects.
+
+        Args:
+            spans (dict): File offsets (start, end, CRC-32) by
+                          <class name>.id.
+        """
+        if not spans:
+            return
+        with open(self.file_path, 'rb') as file:
+            for key, (start, end, crc) in sorted(spans.items(),
+                                            key=lambda item: item[1]):
+                file.seek(start)
+                value = json.loads(file.read(end - start).decode('utf-8'))
+                cls = self.classes[key.partition('.')[0]]
+                self.attach(cls(**value))
+
+    def __load_class(self, class_name):
+        """
+        Builds all the objects of a class not built yet.
+
+        Args:
+            class_name (str): Name of the class.
+        """
+        self.__load(LazyStorage.__unloaded.pop(class_name, {}))
+
+    def all(self, cls=None):
+        """
+        Returns the dictionary __objects, or only the objects
+        of one class when cls is given, building them first.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+
+        Returns:
+            dict: Dictionary containing the objects by <class name>.id.
+        """
+        if cls is None:
+            for class_name in list(LazyStorage.__unloaded):
+                self.__load_class(class_name)
+        else:
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            self.__load_class(cls)
+        return super().all(cls)
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects, or of objects of one class,
+        counting the objects not built yet without building them.
+
+        Args:
+            cls: Class or class name to count (optional).
+
+        Returns:
+            int: Number of objects.
+        """
+        unloaded = LazyStorage.__unloaded
+        if cls is None:
+            return super().count() + sum(
+                len(spans) for spans in unloaded.values())
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return super().count(cls) + len(unloaded.get(cls, ()))
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id,
+        building only this object if it wasn't built yet.
+
+        Args:
+            cls: Class or class name of the object.
+            id (str): Id of the object.
+
+        Returns:
+            The object, or None if it isn't stored.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        span = LazyStorage.__unloaded.get(cls, {}).pop(key, None)
+        if span is not None:
+            self.__load({key: span})
+        return super().get(cls, id)
+
+    def after(self, key, cls=None, limit=0):
+        """
+        Returns the objects listed after key by all(cls),
+        building the objects of the listed classes first.
+
+        Args:
+            key (str): Key <class name>.id of an object listed.
+            cls: Class or class name to filter on (optional).
+            limit (int): Largest number of objects returned;
+                         0 (default) for no limit.
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id,
+                  or None if key isn't listed.
+        """
+        self.all(cls)
+        return super().after(key, cls, limit)
+
+    def lookup(self, cls, attribute, value):
+        """
+        Returns the objects of a class whose attribute equals value,
+        building the objects of the class first.
+
+        Args:
+            cls: Class or class name of the objects.
+            attribute (str): Name of the attribute.
+            value: Value to look up.
+
+        Returns:
+            dict: Dictionary of the matching objects by <class name>.id.
+        """
+        self.all(cls)
+        return super().lookup(cls, attribute, value)
+
+    def near(self, lat, lon, radius, cls=None):
+        """
+        Returns the objects within radius kilometers of a point,
+        building the objects of the searched classes first.
+
+        Args:
+            lat (float): Latitude of the center, in degrees.
+            lon (float): Longitude of the center, in degrees.
+            radius (float): Distance in kilometers.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        self.all(cls)
+        return super().near(lat, lon, radius, cls)
+
+    def within(self, min_lat, min_lon, max_lat, max_lon, cls=None):
+        """
+        Returns the objects inside a bounding box,
+        building the objects of the searched classes first.
+
+        Args:
+            min_lat, min_lon (float): South-west corner, in degrees.
+            max_lat, max_lon (float): North-east corner, in degrees.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        self.all(cls)
+        return super().within(min_lat, min_lon, max_lat, max_lon, cls)
+
+    def new(self, obj):
+        """
+        Sets in __objects the given object with key <obj class name>.id,
+        replacing the stored object with the same key if not built yet.
+
+        Args:
+            obj: Instance object to set in __objects.
+        """
+        class_name = obj.__class__.__name__
+        key = "{}.{}".format(class_name, obj.id)
+        LazyStorage.__unloaded.get(class_name, {}).pop(key, None)
+        super().new(obj)
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from __objects if it's inside.
+
+        Args:
+            obj: Instance object to remove from __objects.
+        """
+        if obj is None:
+            return
+        self.get(obj.__class__, obj.id)
+        super().delete(obj)
+
+    def write(self):
+        """
+        Serializes __objects to the JSON file (__file_path).
+        Objects not built yet are copied from the old file.
+        The new file is written next to the old one, then
+        renamed over it (see atomic.atomic_write), and its
+        offset index is written.
+        """
+        with self.committing():
+            with atomic_write(self.file_path) as out:
+                offsets = dump(self.__items(), out)
+        LazyStorage.__unloaded = {
+            class_name: {key: offsets[class_name][key] for key in spans}
+            for class_name, spans in LazyStorage.__unloaded.items() if spans
+        }
+        self.__write_index(offsets)
+
+    def __items(self):
+        """
+        Yields the (key, JSON value) items to save: the objects
+        built, then the objects not built yet, read from the
+        old file.
+        """
+        for key, obj in super().all().items():
+            yield key, json.dumps(obj.to_dict()).encode()
+        spans = sorted(
+            (span, key)
+            for spans in LazyStorage.__unloaded.values()
+            for key, span in spans.items()
+        )
+        if spans:
+            with open(self.file_path, 'rb') as old:
+                for (start, end, crc), key in spans:
+                    old.seek(start)
+                    yield key, old.read(end - start)
+
+    def __write_index(self, offsets):
+        """
+        Writes the offset index of the file. The index only saves
+        a scan of the file, so it is left stale if it can't be
+        written.
+
+        Args:
+            offsets (dict): (start, end, CRC-32) of each value by key,
+                            by class name.
+        """
+        try:
+            write_index(self.file_path, offsets)
+        except OSError:
+            pass
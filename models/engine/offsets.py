@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+"""
+Module: offsets
+Reads and writes the offset index of a JSON store file: a file
+next to the store giving the byte offsets and the CRC-32 of each
+value in it, so the store can be opened without scanning it, and
+the values changed since it was last read found without decoding
+the others.
+
+The index is laid out to be read without decoding an entry at a
+time:
+    header: one line of JSON, with the version, the generation of
+            the store, the number of keys of each class and the
+            size of the keys
+    keys: the keys grouped by class, each followed by a newline
+    offsets: start, end and CRC-32 of each value, in the order of
+             the keys, as 64-bit integers in the byte order of the
+             machine
+
+The generation of a store is its inode, size and modification time.
+An index whose store was rewritten since (e.g. by another engine)
+is ignored.
+"""
+
+import json
+import os
+import zlib
+from array import array
+from json.encoder import encode_basestring_ascii
+from models.engine.atomic import atomic_write
+from models.engine.json_stream import iter_offsets
+
+VERSION = 2
+
+
+def index_path(path):
+    """
+    Returns the path of the offset index of a store.
+
+    Args:
+        path (str): Path of the store file.
+
+    Returns:
+        str: The store path plus ".offsets".
+    """
+    return path + ".offsets"
+
+
+def generation(stat):
+    """
+    Returns the generation of a file, from its stat result.
+
+    Args:
+        stat (os.stat_result): Stat result of the file.
+
+    Returns:
+        list: Inode, size and modification time in nanoseconds.
+    """
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def dump(items, file):
+    """
+    Writes items as the JSON object of a store, and returns
+    the offsets of the values written.
+
+    Args:
+        items (iterable): (<class name>.id, JSON value) pairs,
+                          the value being encoded in UTF-8.
+        file: Binary file object open for writing.
+
+    Returns:
+        dict: (start, end, CRC-32) of each value by key,
+              by class name.
+    """
+    offsets = {}
+    write = file.write
+    write(b"{")
+    position = 1
+    separator = ""
+    for key, data in items:
+        prefix = (separator + encode_basestring_ascii(key) + ": ").encode()
+        start = position + len(prefix)
+        position = start + len(data)
+        write(prefix + data)
+        class_name = key.partition('.')[0]
+        spans = offsets.get(class_name)
+        if spans is None:
+            spans = offsets[class_name] = {}
+        spans[key] = (start, position, zlib.crc32(data))
+        separator = ", "
+    write(b"}")
+    return offsets
+
+
+def scan(file):
+    """
+    Returns the offsets of the values of a store by scanning it,
+    for a store without a valid index.
+    The store is streamed in chunks, then each value is read back
+    on its own for its CRC-32, so only one value is held in memory
+    at a time.
+
+    Args:
+        file: Seekable binary file object at the start of the store.
+
+    Returns:
+        dict: (start, end, CRC-32) of each value by key,
+              by class name.
+
+    Raises:
+        ValueError: If the file doesn't hold a JSON object.
+    """
+    spans = list(iter_offsets(file))
+    offsets = {}
+    for key, start, end in spans:
+        file.seek(start)
+        offsets.setdefault(key.partition('.')[0], {})[key] = (
+            start, end, zlib.crc32(file.read(end - start)))
+    return offsets
+
+
+def write_index(path, offsets):
+    """
+    Writes the offset index of the store as it is now on disk.
+
+    Args:
+        path (str): Path of the store file.
+        offsets (dict): (start, end, CRC-32) of each value by key,
+                        by class name.
+    """
+    keys = "".join(key + "\n" for spans in offsets.values()
+                   for key in spans).encode('utf-8')
+    numbers = array('q', (number for spans in offsets.values()
+                          for span in spans.values() for number in span))
+    header = {
+        "version": VERSION,
+        "store": generation(os.stat(path)),
+        "classes": [[name, len(spans)] for name, spans in offsets.items()],
+        "keys": len(keys),
+    }
+    with atomic_write(index_path(path)) as file:
+        file.write(json.dumps(header).encode() + b"\n")
+        file.write(keys)
+        file.write(numbers.tobytes())
+
+
+def read_index(path, store=None):
+    """
+    Returns the offsets of the values of a store, if its index
+    was written for the store as it is now on disk.
+
+    Args:
+        path (str): Path of the store file.
+        store: Open file object of the store (optional), checked
+               instead of path.
+
+    Returns:
+        dict: (start, end, CRC-32) of each value by key, by class
+              name, or None if there is no index or it doesn't
+              match the store.
+    """
+    try:
+        with open(index_path(path), 'rb') as file:
+            data = file.read()
+        stat = os.stat(path) if store is None else os.fstat(store.fileno())
+        newline = data.index(b"\n") + 1
+        header = json.loads(data[:newline])
+        if (header["version"] != VERSION or
+                header["store"] != generation(stat)):
+            return None
+        end = newline + header["keys"]
+        keys = data[newline:end].decode('utf-8').split("\n")
+        numbers = array('q')
+        numbers.frombytes(data[end:])
+        count = sum(length for name, length in header["classes"])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+    if len(keys) != count + 1 or len(numbers) != 3 * count:
+        return None
+    starts = numbers[0::3]
+    ends = numbers[1::3]
+    crcs = numbers[2::3]
+    offsets = {}
+    first = 0
+    for name, length in header["classes"]:
+        last = first + length
+        offsets[name] = dict(zip(keys[first:last], zip(
+            starts[first:last], ends[first:last], crcs[first:last])))
+        first = last
+    return offsets
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Module: rwlock
+Defines the RWLock class.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class RWLock:
+    """
+    RWLock class.
+    Reader/writer lock: any number of threads can hold it for reading
+    at once, while a thread holding it for writing holds it alone.
+    Waiting writers go first, so a stream of readers can't starve them.
+
+    Both locks are reentrant, and the writer can take the read lock as
+    well, but a thread holding only the read lock can't take the write
+    lock: two readers waiting for each other to let go would deadlock,
+    so this raises RuntimeError instead.
+    """
+
+    def __init__(self):
+        """Initializes an unlocked lock."""
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = {}
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting = 0
+
+    def acquire_read(self):
+        """Blocks until the lock is held for reading."""
+        me = threading.get_ident()
+        with self.__condition:
+            if me != self.__writer and me not in self.__readers:
+                while self.__writer is not None or self.__waiting:
+                    self.__condition.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+
+    def release_read(self):
+        """Releases the lock held for reading."""
+        me = threading.get_ident()
+        with self.__condition:
+            count = self.__readers.pop(me) - 1
+            if count:
+                self.__readers[me] = count
+            elif not self.__readers:
+                self.__condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Blocks until the lock is held for writing.
+
+        Raises:
+            RuntimeError: If the thread only holds the read lock.
+        """
+        me = threading.get_ident()
+        with self.__condition:
+            if me == self.__writer:
+                self.__writes += 1
+                return
+            if me in self.__readers:
+                raise RuntimeError("Cannot upgrade a read lock")
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting -= 1
+            self.__writer = me
+            self.__writes = 1
+
+    def release_write(self):
+        """Releases the lock held for writing."""
+        with self.__condition:
+            if self.__writer != threading.get_ident():
+                raise RuntimeError("The write lock isn't held")
+            self.__writes -= 1
+            if not self.__writes:
+                self.__writer = None
+                self.__condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        """Context manager holding the lock for reading."""
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Context manager holding the lock for writing."""
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
@@ -0,0 +1,345 @@
+#!/usr/bin/python3
+"""
+Module: sharded_storage
+Defines the ShardedStorage class.
+"""
+
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from os import getenv
+from models import timestamp
+from models.engine import formats
+from models.engine.atomic import atomic_write
+from models.engine.file_storage import FileStorage
+
+
+def decode_shard(format_name, path):
+    """
+    Decodes a shard file; run in the worker processes of a
+    parallel reload. The dates are parsed here as well, so the
+    parent process only builds and indexes the objects.
+
+    Args:
+        format_name (str): Name of the file format.
+        path (str): Path of the shard file.
+
+    Returns:
+        list: (<class name>.id, value) items of the file.
+    """
+    with open(path, 'rb') as file:
+        items = list(formats.formats[format_name].load(file))
+    for key, value in items:
+        value.pop('__class__', None)
+        for name in ('created_at', 'updated_at'):
+            if name in value:
+                value[name] = timestamp.parse(value[name])
+    return items
+
+
+class ShardedStorage(FileStorage):
+    """
+    ShardedStorage class.
+    Splits the store into one file per class, each optionally cut
+    into shard_count files by a hash (CRC-32) of the object ids:
+        file.json -> file.User.0.json, file.User.1.json, ...
+
+    save() only rewrites the shards holding objects changed since
+    the previous save (see FileStorage.changes), and reload() can
+    be restricted to some classes: the shards of the other classes
+    are loaded by the first query or save reaching them.
+
+    Public Class Attributes:
+        shard_count (int): Number of files per class, from the
+                           HBNB_SHARDS environment variable (1).
+        reload_workers (int): Number of processes decoding the shards
+                              on reload, from the HBNB_RELOAD_WORKERS
+                              environment variable. 0 or 1 (default)
+                              decodes them in this process.
+    """
+
+    shard_count = int(getenv("HBNB_SHARDS", "1"))
+    reload_workers = int(getenv("HBNB_RELOAD_WORKERS", "0"))
+    __dirty = set()
+    __loaded = None
+
+    @property
+    def exclusive_reads(self):
+        """
+        bool: Whether some classes were skipped by reload(), so the
+        queries reaching them load their shards.
+        """
+        loaded = ShardedStorage.__loaded
+        return loaded is not None and not loaded.issuperset(self.classes)
+
+    def shard(self, key):
+        """
+        Returns the shard an object belongs to.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+
+        Returns:
+            tuple: (class name, shard number).
+        """
+        class_name, _, obj_id = key.partition('.')
+        return class_name, zlib.crc32(obj_id.encode()) % self.shard_count
+
+    def shard_path(self, shard):
+        """
+        Returns the path of the file of a shard.
+
+        Args:
+            shard (tuple): (class name, shard number).
+
+        Returns:
+            str: Path such as file.User.0.json.
+        """
+        base, extension = os.path.splitext(self.file_path)
+        return "{}.{}.{}{}".format(base, shard[0], shard[1], extension)
+
+    def shards(self):
+        """
+        Returns the shard files found next to __file_path.
+
+        Returns:
+            dict: Paths by shard (class name, shard number).
+        """
+        base, extension = os.path.splitext(self.file_path)
+        directory, prefix = os.path.split(base)
+        prefix += "."
+        shards = {}
+        try:
+            names = os.listdir(directory or ".")
+        except FileNotFoundError:
+            return shards
+        for name in names:
+            if not (name.startswith(prefix) and name.endswith(extension)):
+                continue
+            parts = name[len(prefix):len(name) - len(extension)].split('.')
+            if len(parts) == 2 and parts[1].isdigit():
+                shards[(parts[0], int(parts[1]))] = os.path.join(
+                    directory, name)
+        return shards
+
+    def __decode(self, shards):
+        """
+        Yields (shard, items) for each shard file, items being its
+        (<class name>.id, value) pairs.
+        With reload_workers, the files are decoded by a pool of
+        processes, forked where the platform allows it. Other start
+        methods import the models package anew in each worker, so
+        HBNB_RELOAD_WORKER is set for them: models then skips
+        storage.reload(), and the workers don't load the store.
+
+        Args:
+            shards (list): (shard, path) pairs.
+        """
+        workers = min(self.reload_workers, len(shards))
+        if workers <= 1:
+            for shard, path in shards:
+                with open(path, 'rb') as file:
+                    yield shard, self.format.load(file)
+            return
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context("spawn")
+        previous = os.environ.get("HBNB_RELOAD_WORKER")
+        os.environ["HBNB_RELOAD_WORKER"] = "1"
+        try:
+            with ProcessPoolExecutor(workers, mp_context=context) as pool:
+                results = pool.map(
+                    decode_shard, [self.format.name] * len(shards),
+                    [path for shard, path in shards])
+                for (shard, path), items in zip(shards, results):
+                    yield shard, items
+        finally:
+            if previous is None:
+                os.environ.pop("HBNB_RELOAD_WORKER", None)
+            else:
+                os.environ["HBNB_RELOAD_WORKER"] = previous
+
+    def __read(self, shards, replace):
+        """
+        Sets the objects of shard files in __objects.
+        An object found in the wrong shard (shard_count changed)
+        marks both shards for rewriting.
+
+        Args:
+            shards (list): (shard, path) pairs.
+            replace (bool): Whether objects already in memory are
+                            replaced by the ones in the files.
+        """
+        objects = super().all()
+        for shard, items in self.__decode(shards):
+            for key, value in items:
+                if not replace and key in objects:
+                    continue
+                home = self.shard(key)
+                if home != shard:
+                    ShardedStorage.__dirty.update((shard, home))
+                cls = self.classes[key.partition('.')[0]]
+                self.attach(cls(**value))
+
+    def reload(self, classes=None):
+        """
+        Deserializes the shard files to __objects.
+
+        Args:
+            classes (iterable): Classes or class names to load
+                                (optional); the other shards are
+                                skipped until load() reads them.
+        """
+        names = None
+        if classes is not None:
+            names = {
+                cls if isinstance(cls, str) else cls.__name__
+                for cls in classes
+            }
+        ShardedStorage.__dirty = set()
+        self.__read([
+            (shard, path) for shard, path in sorted(self.shards().items())
+            if names is None or shard[0] in names
+        ], True)
+        ShardedStorage.__loaded = names
+
+    def load(self, *classes):
+        """
+        Loads the shards of classes skipped by reload().
+        Objects already in memory are kept.
+
+        Args:
+            *classes: Classes or class names to load.
+        """
+        if ShardedStorage.__loaded is None:
+            return
+        names = {
+            cls if isinstance(cls, str) else cls.__name__
+            for cls in classes
+        } - ShardedStorage.__loaded
+        if not names:
+            return
+        self.__read([
+            (shard, path) for shard, path in sorted(self.shards().items())
+            if shard[0] in names
+        ], False)
+        ShardedStorage.__loaded |= names
+
+    def __load_skipped(self, cls):
+        """
+        Loads the shards of cls, or of every class when cls is None,
+        if reload() skipped them, so queries see all the objects.
+        """
+        self.load(*(self.classes if cls is None else (cls,)))
+
+    def all(self, cls=None):
+        """
+        Returns the objects, or only the objects of one class,
+        loading the shards of the class first if reload() skipped it.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+
+        Returns:
+            dict: Dictionary containing the objects by <class name>.id.
+        """
+        self.__load_skipped(cls)
+        return super().all(cls)
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects, or of objects of one class,
+        loading the shards of the class first if reload() skipped it.
+
+        Args:
+            cls: Class or class name to count (optional).
+
+        Returns:
+            int: Number of objects.
+        """
+        self.__load_skipped(cls)
+        return super().count(cls)
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id."""
+        self.__load_skipped(cls)
+        return super().get(cls, id)
+
+    def after(self, key, cls=None, limit=0):
+        """Returns the objects listed after key by all(cls)."""
+        self.__load_skipped(cls)
+        return super().after(key, cls, limit)
+
+    def lookup(self, cls, attribute, value):
+        """Returns the objects of a class whose attribute equals value."""
+        self.__load_skipped(cls)
+        return super().lookup(cls, attribute, value)
+
+    def columns(self, cls):
+        """Returns the column store of the objects of a class."""
+        self.__load_skipped(cls)
+        return super().columns(cls)
+
+    def near(self, lat, lon, radius, cls=None):
+        """Returns the objects within radius kilometers of a point."""
+        self.__load_skipped(cls)
+        return super().near(lat, lon, radius, cls)
+
+    def within(self, min_lat, min_lon, max_lat, max_lon, cls=None):
+        """Returns the objects inside a bounding box."""
+        self.__load_skipped(cls)
+        return super().within(min_lat, min_lon, max_lat, max_lon, cls)
+
+    def write(self):
+        """
+        Rewrites the shard files holding objects changed since
+        the previous save. A shard left empty is removed.
+        Classes skipped by reload() are loaded first, so their
+        objects on disk aren't lost. If a shard can't be written,
+        it and the shards after it are written by the next save.
+        """
+        changes = self.changes()
+        dirty = ShardedStorage.__dirty
+        dirty.update(self.shard(key) for key in changes)
+        ShardedStorage.__dirty = set()
+        try:
+            self.__write_shards(dirty)
+        except BaseException:
+            ShardedStorage.__dirty.update(dirty)
+            self.requeue({key: obj for key, obj in changes.items()
+                          if self.shard(key) in dirty})
+            raise
+
+    def __write_shards(self, dirty):
+        """
+        Rewrites or removes the given shards, taking each one
+        out of dirty once it is written.
+
+        Args:
+            dirty (set): Shards (class name, number) to write.
+        """
+        if not dirty:
+            return
+        self.load(*{class_name for class_name, number in dirty})
+        items = {}
+        for class_name in {class_name for class_name, number in dirty}:
+            for key, obj in self.all(class_name).items():
+                shard = self.shard(key)
+                if shard in dirty:
+                    items.setdefault(shard, []).append((key, obj))
+        encode = self.format.encode
+        for shard in sorted(dirty):
+            path = self.shard_path(shard)
+            if shard not in items:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            else:
+                with atomic_write(path) as file:
+                    self.format.dump(
+                        ((key, encode(obj)) for key, obj in items[shard]),
+                        file)
+            dirty.discard(shard)
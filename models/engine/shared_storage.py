@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+"""
+Module: shared_storage
+Defines the SharedStorage class.
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from models.engine import formats
+from models.engine.atomic import atomic_write
+from models.engine.file_storage import FileStorage
+from models.engine.offsets import dump, read_index, scan, write_index
+
+
+class SharedStorage(FileStorage):
+    """
+    SharedStorage class.
+    FileStorage for a file written by several processes.
+
+    A save takes an exclusive advisory lock (fcntl.flock) on the
+    lock file next to the store, reads what other processes saved
+    since this one last read or wrote the file, then writes the
+    merged store. Queries read those changes too, so a process sees
+    the objects the others save. Unsaved changes of this process
+    win over the file: an object saved by two processes keeps the
+    version of the last one to save.
+
+    The file is re-read when its generation changed: inode (a save
+    replaces the file, see atomic.atomic_write), modification time
+    and size. Only the objects whose stored value changed are
+    rebuilt, and the objects no longer in the file are removed.
+
+    A JSON file is saved with its offset index (see
+    models.engine.offsets), which gives the CRC-32 of each value:
+    a refresh reads the index, then reads and decodes only the
+    values whose CRC differs from the last one read or written.
+    A JSON file saved by another engine is scanned instead, and
+    a file in another format is decoded, each value being
+    compared with the object in memory.
+
+    Public Class Attributes:
+        poll_interval (float): Seconds during which queries don't
+                               check the file again. 0 (default)
+                               checks it on every query.
+    """
+
+    __generation = None
+    __crcs = {}
+    __polled = None
+    __mutex = threading.RLock()
+    __lock_file = None
+    __depth = 0
+    poll_interval = 0
+    exclusive_reads = True
+
+    @property
+    def lock_path(self):
+        """
+        str: Path of the lock file, the store path plus ".lock".
+        """
+        return self.file_path + ".lock"
+
+    @contextmanager
+    def locked(self):
+        """
+        Context manager holding the exclusive lock of the store,
+        so no other process saves it until the block ends, e.g.:
+
+            with storage.locked():
+                storage.refresh()
+                place = storage.get(Place, place_id)
+                place.number_rooms += 1
+                place.save()
+
+        Blocks can be nested, and are run by one thread at a time.
+        """
+        with SharedStorage.__mutex:
+            if not SharedStorage.__depth:
+                file = open(self.lock_path, 'a')
+                try:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+                except BaseException:
+                    file.close()
+                    raise
+                SharedStorage.__lock_file = file
+            SharedStorage.__depth += 1
+            try:
+                yield self
+            finally:
+                SharedStorage.__depth -= 1
+                if not SharedStorage.__depth:
+                    file = SharedStorage.__lock_file
+                    SharedStorage.__lock_file = None
+                    fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+                    file.close()
+
+    @staticmethod
+    def __generation_of(stat):
+        """Returns the generation of the file of a stat result."""
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """
+        Reads the changes other processes saved since this one
+        last read or wrote the file.
+
+        Returns:
+            bool: True if the file had changed.
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            stat = None
+        generation = stat and self.__generation_of(stat)
+        if generation == SharedStorage.__generation:
+            return False
+        try:
+            with open(self.file_path, 'rb') as file:
+                generation = self.__generation_of(os.fstat(file.fileno()))
+                if self.format.name == "json":
+                    self.__merge_json(file)
+                else:
+                    self.__merge(dict(self.format.load(file)))
+        except FileNotFoundError:
+            generation = None
+            self.__merge({})
+        SharedStorage.__generation = generation
+        return True
+
+    def __merge(self, entries):
+        """
+        Brings __objects up to date with the file, keeping the
+        unsaved changes.
+
+        Args:
+            entries (dict): Values of the file by <class name>.id.
+        """
+        changes = self.changes(keep=True)
+        objects = super().all()
+        encode = self.format.encode
+        for key in [key for key in objects
+                    if key not in entries and key not in changes]:
+            self.detach(key)
+        for key, value in entries.items():
+            if key in changes:
+                continue
+            obj = objects.get(key)
+            if obj is not None and encode(obj) == value:
+                continue
+            self.attach(self.classes[key.partition('.')[0]](**value))
+        SharedStorage.__crcs = {}
+
+    def __merge_json(self, file):
+        """
+        Brings __objects up to date with a JSON file, keeping the
+        unsaved changes, decoding only the values whose CRC-32
+        changed since they were last read or written.
+
+        Args:
+            file: Binary file object of the store.
+        """
+        offsets = read_index(self.file_path, file)
+        if offsets is None:
+            offsets = scan(file)
+        changes = self.changes(keep=True)
+        objects = super().all()
+        crcs = SharedStorage.__crcs
+        new_crcs = {}
+        changed = []
+        for spans in offsets.values():
+            for key, (start, end, crc) in spans.items():
+                new_crcs[key] = crc
+                if key in changes:
+                    continue
+                if crcs.get(key) == crc and key in objects:
+                    continue
+                changed.append((start, end, key))
+        for key in [key for key in objects
+                    if key not in new_crcs and key not in changes]:
+            self.detach(key)
+        for start, end, key in sorted(changed):
+            file.seek(start)
+            value = json.loads(file.read(end - start).decode('utf-8'))
+            self.attach(self.classes[key.partition('.')[0]](**value))
+        SharedStorage.__crcs = new_crcs
+
+    def __poll(self):
+        """Refreshes the store, at most every poll_interval."""
+        if self.poll_interval > 0:
+            now = time.monotonic()
+            if (SharedStorage.__polled is not None and
+                    now - SharedStorage.__polled < self.poll_interval):
+                return
+            SharedStorage.__polled = now
+        self.refresh()
+
+    def all(self, cls=None):
+        """
+        Returns the objects, or only the objects of one class,
+        after reading the changes saved by other processes.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+
+        Returns:
+            dict: Dictionary containing the objects by <class name>.id.
+        """
+        self.__poll()
+        return super().all(cls)
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of one class."""
+        self.__poll()
+        return super().count(cls)
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id."""
+        self.__poll()
+        return super().get(cls, id)
+
+    def after(self, key, cls=None, limit=0):
+        """Returns the objects listed after key by all(cls)."""
+        self.__poll()
+        return super().after(key, cls, limit)
+
+    def lookup(self, cls, attribute, value):
+        """Returns the objects of a class whose attribute equals value."""
+        self.__poll()
+        return super().lookup(cls, attribute, value)
+
+    def columns(self, cls):
+        """Returns the column store of the objects of a class."""
+        self.__poll()
+        return super().columns(cls)
+
+    def near(self, lat, lon, radius, cls=None):
+        """Returns the objects within radius kilometers of a point."""
+        self.__poll()
+        return super().near(lat, lon, radius, cls)
+
+    def within(self, min_lat, min_lon, max_lat, max_lon, cls=None):
+        """Returns the objects inside a bounding box."""
+        self.__poll()
+        return super().within(min_lat, min_lon, max_lat, max_lon, cls)
+
+    def write(self):
+        """
+        Merges the changes saved by other processes, then writes
+        the store, holding the lock of the store.
+        """
+        with self.locked():
+            self.refresh()
+            if self.format.name == "json":
+                self.__write_json()
+            else:
+                super().write()
+            SharedStorage.__generation = self.__generation_of(
+                os.stat(self.file_path))
+
+    def __write_json(self):
+        """
+        Writes the store as JSON, with its offset index, and
+        records the CRC-32 of the values written.
+        """
+        encode = self.format.encode
+        with self.committing():
+            items = list(super().all().items())
+            with atomic_write(self.file_path) as file:
+                offsets = dump(((key, formats.encoder.encode(
+                    encode(obj)).encode('utf-8')) for key, obj in items),
+                    file)
+        SharedStorage.__crcs = {key: crc for spans in offsets.values()
+                                for key, (start, end, crc) in spans.items()}
+        try:
+            write_index(self.file_path, offsets)
+        except OSError:
+            pass
+
+    def reload(self):
+        """
+        Reads the file (__file_path), replacing the objects
+        which aren't changed in memory.
+        If the file doesn't exist, nothing is read.
+        """
+        SharedStorage.__generation = None
+        self.refresh()
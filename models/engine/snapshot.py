@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+"""
+Module: snapshot
+Defines the Snapshot class, reader of the snapshot file format.
+
+A snapshot is a read-only file laid out to be memory-mapped:
+    header: magic, version, key width, count, index offset
+    data: the JSON of each value, one after the other
+    index: count fixed-width entries sorted by key:
+           key (NUL padded to key width), value offset, value length
+A key is found by binary search on the index, and the objects of
+a class are the contiguous run of keys starting with "<class name>.",
+so nothing but the pages touched is read, and processes mapping
+the same file share it in the page cache.
+"""
+
+import json
+import mmap
+import struct
+from models import timestamp
+
+MAGIC = b"HBNBSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+
+
+def write(items, file):
+    """
+    Writes items as a snapshot.
+
+    Args:
+        items (iterable): (<class name>.id, value) pairs, value
+                          being a JSON serializable dictionary.
+        file: Seekable binary file object open for writing.
+    """
+    encoder = json.JSONEncoder(default=timestamp.format)
+    file.write(b"\0" * HEADER.size)
+    offset = HEADER.size
+    index = []
+    for key, value in items:
+        data = encoder.encode(value).encode('utf-8')
+        file.write(data)
+        index.append((key.encode('utf-8'), offset, len(data)))
+        offset += len(data)
+    index.sort()
+    width = max((len(key) for key, start, length in index), default=0)
+    entry = struct.Struct("<{}sQI".format(width))
+    for key, start, length in index:
+        file.write(entry.pack(key, start, length))
+    file.seek(0)
+    file.write(HEADER.pack(MAGIC, VERSION, width, len(index), offset))
+    file.seek(0, 2)
+
+
+class Snapshot:
+    """
+    Snapshot class.
+    Memory-mapped reader of a snapshot file.
+    """
+
+    def __init__(self, file):
+        """
+        Maps a snapshot file. The mapping stays valid once
+        the file is closed.
+
+        Args:
+            file: Binary file object open for reading.
+
+        Raises:
+            ValueError: If the file isn't a snapshot.
+        """
+        if file.seek(0, 2) < HEADER.size:
+            raise ValueError("Not a snapshot file")
+        self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, count, index = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            self.__map.close()
+            raise ValueError("Not a snapshot file")
+        self.__entry = struct.Struct("<{}sQI".format(width))
+        self.__count = count
+        self.__index = index
+
+    def __len__(self):
+        """Returns the number of values."""
+        return self.__count
+
+    def close(self):
+        """Unmaps the file."""
+        self.__map.close()
+
+    def __read_entry(self, position):
+        """Returns (key, offset, length) of an index entry."""
+        return self.__entry.unpack_from(
+            self.__map, self.__index + position * self.__entry.size)
+
+    def __bisect(self, key):
+        """
+        Returns the position of the first key not lower than key.
+
+        Args:
+            key (bytes): Key to search.
+        """
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__read_entry(middle)[0].rstrip(b"\0") < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __value(self, offset, length):
+        """Returns the value stored at offset."""
+        return json.loads(self.__map[offset:offset + length])
+
+    def get(self, key):
+        """
+        Returns the value of a key.
+
+        Args:
+            key (str): Key <class name>.id.
+
+        Returns:
+            dict: The value, or None if key isn't in the snapshot.
+        """
+        key = key.encode('utf-8')
+        position = self.__bisect(key)
+        if position == self.__count:
+            return None
+        found, offset, length = self.__read_entry(position)
+        if found.rstrip(b"\0") != key:
+            return None
+        return self.__value(offset, length)
+
+    def count(self, prefix=""):
+        """
+        Returns the number of keys starting with prefix, found by
+        binary search of the first key after them, so no key is read
+        but the ones compared.
+
+        Args:
+            prefix (str): Start of the keys, e.g. "User." (optional).
+        """
+        prefix = prefix.encode('utf-8')
+        start = self.__bisect(prefix)
+        following = prefix.rstrip(b"\xff")
+        if not following:
+            return self.__count - start
+        following = following[:-1] + bytes([following[-1] + 1])
+        return self.__bisect(following) - start
+
+    def keys(self, prefix=""):
+        """
+        Yields the keys starting with prefix, in sorted order.
+
+        Args:
+            prefix (str): Start of the keys, e.g. "User." (optional).
+        """
+        for key, offset, length in self.__entries(prefix):
+            yield key
+
+    def items(self, prefix="", skip=(), after=None):
+        """
+        Yields the (key, value) pairs whose key starts with prefix,
+        in sorted order.
+
+        Args:
+            prefix (str): Start of the keys, e.g. "User." (optional).
+            skip: Container of keys whose value isn't needed; None
+                  is yielded as their value instead (optional).
+            after (str): Key after which to start (optional).
+        """
+        for key, offset, length in self.__entries(prefix, after):
+            if key in skip:
+                yield key, None
+            else:
+                yield key, self.__value(offset, length)
+
+    def __entries(self, prefix, after=None):
+        """
+        Yields the (key, offset, length) entries under prefix,
+        from the first key greater than after if given.
+        """
+        prefix = prefix.encode('utf-8')
+        start = self.__bisect(prefix)
+        if after is not None:
+            # Keys are padded with NUL bytes: the key after "after"
+            # is the first one not lower than "after\0".
+            start = max(start, self.__bisect(after.encode('utf-8') + b"\0"))
+        for position in range(start, self.__count):
+            key, offset, length = self.__read_entry(position)
+            key = key.rstrip(b"\0")
+            if not key.startswith(prefix):
+                return
+            yield key.decode('utf-8'), offset, length
@@ -0,0 +1,329 @@
+#!/usr/bin/python3
+"""
+Module: snapshot_storage
+Defines the SnapshotStorage class.
+"""
+
+import itertools
+import weakref
+from os import getenv
+from models.engine.columns import ColumnStore
+from models.engine.file_storage import FileStorage
+from models.engine.geo import GeoIndex
+from models.engine.snapshot import Snapshot
+
+
+class SnapshotStorage(FileStorage):
+    """
+    SnapshotStorage class.
+    Read-only storage over a snapshot file (see models.engine.snapshot),
+    for processes that only read the store: reload() maps the file
+    without reading it, and an object is decoded when it is accessed.
+    Decoded objects are held in a weak identity map, so accessing an
+    object twice gives the same object for as long as it is used.
+
+    The snapshot is file.snapshot unless the HBNB_SNAPSHOT_PATH
+    environment variable names another one. It is written by saving
+    a FileStorage to a .snapshot file, or converted from the store:
+        python3 -m models.engine.convert file.json file.snapshot
+
+    Creating, deleting or saving objects raises PermissionError.
+    Objects can still be modified in memory.
+    """
+
+    __snapshot_path = getenv("HBNB_SNAPSHOT_PATH", "file.snapshot")
+    exclusive_reads = True
+    __snapshot = None
+    __identity = weakref.WeakValueDictionary()
+
+    @property
+    def file_path(self):
+        """
+        str: Path of the snapshot file.
+        """
+        return SnapshotStorage.__snapshot_path
+
+    def reload(self):
+        """
+        Maps the snapshot file (__snapshot_path).
+        If the file doesn't exist, the store is empty.
+        """
+        if SnapshotStorage.__snapshot is not None:
+            SnapshotStorage.__snapshot.close()
+            SnapshotStorage.__snapshot = None
+        SnapshotStorage.__identity = weakref.WeakValueDictionary()
+        try:
+            with open(SnapshotStorage.__snapshot_path, 'rb') as file:
+                SnapshotStorage.__snapshot = Snapshot(file)
+        except FileNotFoundError:
+            pass
+
+    def __build(self, key, value):
+        """
+        Returns the object of key, from the identity map if
+        it is in use, else built from value.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+            value (dict): Dictionary given by to_dict(), or None
+                          to read it from the snapshot.
+        """
+        obj = SnapshotStorage.__identity.get(key)
+        if obj is None:
+            if value is None:
+                value = SnapshotStorage.__snapshot.get(key)
+                if value is None:
+                    return None
+            obj = self.classes[key.partition('.')[0]](**value)
+            SnapshotStorage.__identity[key] = obj
+        return obj
+
+    def all(self, cls=None):
+        """
+        Returns the objects of the snapshot, or only the objects
+        of one class when cls is given, decoding them.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+
+        Returns:
+            dict: Dictionary containing the objects by <class name>.id.
+        """
+        snapshot = SnapshotStorage.__snapshot
+        if snapshot is None:
+            return {}
+        if cls is None:
+            prefix = ""
+        elif isinstance(cls, str):
+            prefix = cls + "."
+        else:
+            prefix = cls.__name__ + "."
+        identity = SnapshotStorage.__identity
+        return {
+            key: self.__build(key, value)
+            for key, value in snapshot.items(prefix, skip=identity)
+        }
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects, or of objects of one class,
+        from the index of the snapshot, decoding no object.
+
+        Args:
+            cls: Class or class name to count (optional).
+
+        Returns:
+            int: Number of objects.
+        """
+        snapshot = SnapshotStorage.__snapshot
+        if snapshot is None:
+            return 0
+        if cls is None:
+            return len(snapshot)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return snapshot.count(cls + ".")
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id,
+        decoding only this object.
+
+        Args:
+            cls: Class or class name of the object.
+            id (str): Id of the object.
+
+        Returns:
+            The object, or None if it isn't stored.
+        """
+        if SnapshotStorage.__snapshot is None:
+            return None
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if cls not in self.classes:
+            return None
+        return self.__build("{}.{}".format(cls, id), None)
+
+    def after(self, key, cls=None, limit=0):
+        """
+        Returns the objects listed after key by all(cls), found
+        by binary search of the sorted keys of the snapshot.
+
+        Args:
+            key (str): Key <class name>.id of an object listed.
+            cls: Class or class name to filter on (optional).
+            limit (int): Largest number of objects returned;
+                         0 (default) for no limit.
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id,
+                  or None if key isn't listed.
+        """
+        snapshot = SnapshotStorage.__snapshot
+        if cls is None:
+            prefix = ""
+        elif isinstance(cls, str):
+            prefix = cls + "."
+        else:
+            prefix = cls.__name__ + "."
+        if (snapshot is None or not key.startswith(prefix) or
+                snapshot.get(key) is None):
+            return None
+        items = snapshot.items(prefix, skip=SnapshotStorage.__identity,
+                               after=key)
+        return {
+            listed: self.__build(listed, value)
+            for listed, value in itertools.islice(items, limit or None)
+        }
+
+    def lookup(self, cls, attribute, value):
+        """
+        Returns the objects of a class whose attribute equals value.
+
+        Args:
+            cls: Class or class name of the objects.
+            attribute (str): Name of the attribute.
+            value: Value to look up.
+
+        Returns:
+            dict: Dictionary of the matching objects by <class name>.id.
+        """
+        return {
+            key: obj for key, obj in self.all(cls).items()
+            if getattr(obj, attribute, None) == value
+        }
+
+    def columns(self, cls):
+        """
+        Returns a column store of the objects of a class.
+
+        Args:
+            cls: Class or class name.
+
+        Returns:
+            ColumnStore: The store, or None if the class has no
+                         column attributes or no objects.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        model = self.classes.get(cls)
+        if model is None or not model.column_attributes:
+            return None
+        objects = self.all(cls)
+        if not objects:
+            return None
+        store = ColumnStore(model, model.column_attributes)
+        for key, obj in objects.items():
+            store.add(key, obj)
+        return store
+
+    def __geo_indexes(self, cls):
+        """Returns GeoIndex objects of the classes to search."""
+        if cls is None:
+            names = [name for name, model in self.classes.items()
+                     if model.geo_attributes]
+        else:
+            names = [cls if isinstance(cls, str) else cls.__name__]
+        indexes = []
+        for name in names:
+            model = self.classes.get(name)
+            if model is None or not model.geo_attributes:
+                continue
+            index = GeoIndex(*model.geo_attributes)
+            for key, obj in self.all(name).items():
+                index.add(key, obj)
+            indexes.append(index)
+        return indexes
+
+    def near(self, lat, lon, radius, cls=None):
+        """
+        Returns the objects within radius kilometers of a point,
+        closest first, among the classes with geo_attributes.
+
+        Args:
+            lat (float): Latitude of the center, in degrees.
+            lon (float): Longitude of the center, in degrees.
+            radius (float): Distance in kilometers.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        matches = {}
+        for index in self.__geo_indexes(cls):
+            matches.update(index.near(lat, lon, radius))
+        return matches
+
+    def within(self, min_lat, min_lon, max_lat, max_lon, cls=None):
+        """
+        Returns the objects inside a bounding box, edges included,
+        among the classes with geo_attributes.
+
+        Args:
+            min_lat, min_lon (float): South-west corner, in degrees.
+            max_lat, max_lon (float): North-east corner, in degrees.
+            cls: Class or class name to search (optional).
+
+        Returns:
+            dict: Dictionary of the objects by <class name>.id.
+        """
+        matches = {}
+        for index in self.__geo_indexes(cls):
+            matches.update(index.within(min_lat, min_lon, max_lat, max_lon))
+        return matches
+
+    def new(self, obj):
+        """
+        Raises PermissionError: the snapshot is read-only.
+        """
+        raise PermissionError("The snapshot storage is read-only")
+
+    def delete(self, obj=None):
+        """
+        Raises PermissionError: the snapshot is read-only.
+        """
+        if obj is not None:
+            raise PermissionError("The snapshot storage is read-only")
+
+    def write(self):
+        """
+        Raises PermissionError: the snapshot is read-only.
+        """
+        raise PermissionError("The snapshot storage is read-only")
+
+    def attach(self, obj):
+        """
+        Sets obj in the identity map.
+
+        Args:
+            obj: Instance object from the snapshot.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        SnapshotStorage.__identity[key] = obj
+
+    def detach(self, key):
+        """
+        Forgets the object decoded for key.
+
+        Args:
+            key (str): Key <class name>.id of the object.
+        """
+        SnapshotStorage.__identity.pop(key, None)
+
+    def touch(self, obj, name=None):
+        """
+        Does nothing: changes are never saved.
+        """
+        pass
+
+    def is_dirty(self, obj):
+        """
+        Returns False: changes are never saved.
+        """
+        return False
+
+    def changes(self, keep=False):
+        """
+        Returns an empty dictionary: changes are never saved.
+        """
+        return {}
@@ -0,0 +1,211 @@
+#!/usr/bin/python3
+"""
+Module: thread_safe
+Defines the ThreadSafe class, which makes a storage engine safe
+to share between the threads of a process.
+
+Thread safety is enabled by setting the HBNB_THREAD_SAFE
+environment variable; the storage is then an instance of
+thread_safe(<engine class>).
+"""
+
+import threading
+from contextlib import contextmanager
+from models.engine.rwlock import RWLock
+
+
+class ThreadSafe:
+    """
+    ThreadSafe class.
+    Mixin placed before a storage engine class by thread_safe().
+
+    Queries (all, count, get, ...) hold the storage lock for reading,
+    so they run together, while changes to the store (new, delete,
+    touch, ...) and reload() hold it for writing, so they run alone.
+    The writes of save() hold it for reading, one write at a time:
+    queries go on while the objects are encoded and written, and
+    changes wait for the write to end.
+    all() returns a copy taken under the lock, which can be iterated
+    while other threads add or delete objects.
+
+    The bulk methods lock each object they change, not the whole
+    call. A sequence of calls which must not be interleaved with
+    other threads (e.g. get, then update) holds storage.lock.write(),
+    as do the calls of methods specific to an engine (compact, load).
+    Saves themselves are scheduled as usual: batch(), flush_every
+    and group_commit_window apply to the saves of all the threads.
+
+    Public Class Attributes:
+        lock (RWLock): Lock shared by the instances of the engine.
+        write_lock (RLock): Lock held by the writes of save().
+    """
+
+    lock = None
+    write_lock = None
+    __writer = None
+
+    @contextmanager
+    def __read(self):
+        """
+        Context manager locking a query: for writing if the engine
+        has exclusive_reads, checked again once the read lock is
+        held, as a reload() may have changed it in between.
+        """
+        if not self.exclusive_reads:
+            with self.lock.read():
+                if not self.exclusive_reads:
+                    yield
+                    return
+        with self.lock.write():
+            yield
+
+    def all(self, cls=None):
+        """
+        Returns a copy of the objects, or of the objects of one class.
+
+        Args:
+            cls: Class or class name to filter on (optional).
+
+        Returns:
+            dict: Dictionary containing the objects by <class name>.id.
+        """
+        with self.__read():
+            return dict(super().all(cls))
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of one class."""
+        with self.__read():
+            return super().count(cls)
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id."""
+        with self.__read():
+            return super().get(cls, id)
+
+    def after(self, key, cls=None, limit=0):
+        """Returns the objects listed after key by all(cls)."""
+        with self.__read():
+            return super().after(key, cls, limit)
+
+    def lookup(self, cls, attribute, value):
+        """Returns the objects of a class whose attribute equals value."""
+        with self.__read():
+            return super().lookup(cls, attribute, value)
+
+    def columns(self, cls):
+        """Returns the column store of the objects of a class."""
+        with self.__read():
+            return super().columns(cls)
+
+    def near(self, lat, lon, radius, cls=None):
+        """Returns the objects within radius kilometers of a point."""
+        with self.__read():
+            return super().near(lat, lon, radius, cls)
+
+    def within(self, min_lat, min_lon, max_lat, max_lon, cls=None):
+        """Returns the objects inside a bounding box."""
+        with self.__read():
+            return super().within(min_lat, min_lon, max_lat, max_lon, cls)
+
+    def is_dirty(self, obj):
+        """Returns whether obj changed since the previous save."""
+        with self.__read():
+            return super().is_dirty(obj)
+
+    def new(self, obj):
+        """Sets obj in the store."""
+        with self.lock.write():
+            super().new(obj)
+
+    def attach(self, obj):
+        """Sets obj in the store, without marking it changed."""
+        with self.lock.write():
+            super().attach(obj)
+
+    def detach(self, key):
+        """Removes the object of key, without marking it deleted."""
+        with self.lock.write():
+            super().detach(key)
+
+    def delete(self, obj=None):
+        """Removes obj from the store."""
+        with self.lock.write():
+            super().delete(obj)
+
+    def touch(self, obj, name=None):
+        """Marks obj changed and updates the indexes."""
+        with self.lock.write():
+            super().touch(obj, name)
+
+    def __writing(self):
+        """
+        Returns whether the thread is in write() holding the read
+        lock, when no other thread can change the store.
+        """
+        return type(self).__writer == threading.get_ident()
+
+    def changes(self, keep=False):
+        """Returns the objects changed since the last save."""
+        if self.__writing():
+            return super().changes(keep)
+        with self.lock.write():
+            return super().changes(keep)
+
+    def requeue(self, changes):
+        """Puts back changes that could not be written."""
+        if self.__writing():
+            super().requeue(changes)
+            return
+        with self.lock.write():
+            super().requeue(changes)
+
+    def write(self):
+        """
+        Writes the store while holding the lock for reading, so no
+        other thread changes it, but queries go on. The write takes
+        the changes without the write lock, since no other thread
+        can change them meanwhile. An engine with exclusive_reads
+        writes while holding the lock for writing.
+        """
+        while True:
+            if self.exclusive_reads:
+                with self.lock.write():
+                    super().write()
+                return
+            with self.lock.read():
+                if self.exclusive_reads:
+                    continue
+                with self.write_lock:
+                    cls = type(self)
+                    writer = cls.__writer
+                    cls.__writer = threading.get_ident()
+                    try:
+                        super().write()
+                    finally:
+                        cls.__writer = writer
+                return
+
+    def reload(self, *args, **kwargs):
+        """Reloads the store, while no other thread uses it."""
+        with self.lock.write():
+            super().reload(*args, **kwargs)
+
+
+def thread_safe(cls):
+    """
+    Returns a thread-safe variant of a storage engine class. The
+    variant has the same name and is a subclass of cls, so it shares
+    the store of cls and isinstance checks still hold.
+
+    Args:
+        cls (type): FileStorage or one of its subclasses.
+
+    Returns:
+        type: Class whose methods hold a lock shared by its instances.
+    """
+    return type(cls.__name__, (ThreadSafe, cls), {
+        '__module__': cls.__module__,
+        '__doc__': "Thread-safe variant of {}.".format(cls.__name__),
+        'lock': RWLock(),
+        'write_lock': threading.RLock(),
+    })
@@ -27,7 +27,17 @@ class Place(BaseModel):
                            longitude coordinate of the place.
         amenity_ids (list): List of strings indicating the
                             associated Amenity IDs.
+        indexed_attributes (tuple): Attributes indexed by the storage.
+        column_attributes (tuple): Attributes kept in typed arrays
+                                   by the storage.
+        geo_attributes (tuple): Coordinates indexed by the storage
+                                for map searches.
     """
+    indexed_attributes = ("city_id", "user_id")
+    column_attributes = ("city_id", "number_rooms", "number_bathrooms",
+                         "max_guest", "price_by_night",
+                         "latitude", "longitude")
+    geo_attributes = ("latitude", "longitude")
     city_id = ""
     user_id = ""
     name = ""
@@ -12,7 +12,9 @@ class Review(BaseModel):
         place_id (str): Empty string indicating the associated Place ID.
         user_id (str): Empty string indicating the associated User ID.
         text (str): Empty string indicating the review text.
+        indexed_attributes (tuple): Attributes indexed by the storage.
     """
+    indexed_attributes = ("place_id", "user_id")
     place_id = ""
     user_id = ""
     text = ""
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Module: timestamp
+Converts the created_at/updated_at datetimes to and from
+the ISO 8601 strings stored by the storage engines.
+"""
+
+from datetime import datetime
+
+FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def parse(text):
+    """
+    Converts an ISO 8601 string to a datetime.
+    Uses datetime.fromisoformat, implemented in C, which is
+    about 40 times faster than datetime.strptime(text, FORMAT)
+    and also reads the strings isoformat() writes for a
+    datetime without microseconds.
+    A datetime is returned as is, as binary storage formats
+    keep the dates as datetimes.
+
+    Args:
+        text (str): String such as '2023-07-16T14:42:34.418590'.
+
+    Returns:
+        datetime: The parsed date and time.
+
+    Raises:
+        TypeError: If text isn't a string.
+        ValueError: If text isn't in ISO 8601 format.
+    """
+    if type(text) is datetime:
+        return text
+    return datetime.fromisoformat(text)
+
+
+def format(value):
+    """
+    Converts a datetime to an ISO 8601 string.
+
+    Args:
+        value (datetime): Date and time to convert.
+
+    Returns:
+        str: String such as '2023-07-16T14:42:34.418590'.
+    """
+    return value.isoformat()
@@ -0,0 +1,273 @@
+#!/usr/bin/python3
+"""Defines unittests for console"""
+
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest import mock
+from console import HBNBCommand
+from models.engine.file_storage import FileStorage
+from models.engine.snapshot_storage import SnapshotStorage
+from models.place import Place
+from models.user import User
+
+
+class TestHBNBCommand(unittest.TestCase):
+    """Unittests for testing the <class name>.<method>(<args>) commands."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "file.json")
+        patch = mock.patch.object(FileStorage, "_FileStorage__file_path",
+                                  self.path)
+        patch.start()
+        self.addCleanup(patch.stop)
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+        FileStorage._FileStorage__objects = {}
+
+    def run_command(self, line):
+        with mock.patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue().strip()
+
+    def test_all(self):
+        user = User()
+        place = Place()
+        self.assertEqual(str([str(user)]), self.run_command("User.all()"))
+        self.assertEqual(str([str(place)]), self.run_command("Place.all()"))
+
+    def test_all_output_unchanged(self):
+        users = [User() for i in range(3)]
+        Place()
+        expected = str([str(obj) for obj in FileStorage().all().values()])
+        self.assertEqual(expected, self.run_command("all"))
+        self.assertEqual(str([str(user) for user in users]),
+                         self.run_command("all User"))
+        self.assertEqual("[]", self.run_command("all Review"))
+        self.assertEqual("** class doesn't exist **",
+                         self.run_command("all MyModel"))
+
+    def test_all_pages(self):
+        users = [User() for i in range(5)]
+        Place()
+
+        def page(command):
+            return self.run_command(command)
+
+        self.assertEqual(str([str(user) for user in users[:2]]),
+                         page("all User limit=2"))
+        self.assertEqual(str([str(user) for user in users[2:4]]),
+                         page("all User limit=2 offset=2"))
+        self.assertEqual(str([str(user) for user in users[3:]]),
+                         page("all User after=User." + users[2].id))
+        self.assertEqual(str([str(users[4])]),
+                         page('User.all("after=User.{}", "limit=1", '
+                              '"offset=1")'.format(users[2].id)))
+        self.assertEqual(str([str(user) for user in users[1:3]]),
+                         page("User.all(offset=1, limit=2)"))
+
+    def test_all_ndjson(self):
+        users = [User() for i in range(3)]
+        lines = self.run_command("all User format=ndjson").splitlines()
+        self.assertEqual([user.to_dict() for user in users],
+                         [json.loads(line) for line in lines])
+        self.assertEqual("", self.run_command("all Review format=ndjson"))
+
+    def test_all_errors(self):
+        user = User()
+        self.assertEqual("** invalid number **",
+                         self.run_command("all limit=x"))
+        self.assertEqual("** invalid number **",
+                         self.run_command("all offset=-1"))
+        self.assertEqual("** invalid option **",
+                         self.run_command("all User sort=id"))
+        self.assertEqual("** invalid format **",
+                         self.run_command("all format=xml"))
+        self.assertEqual("** no instance found **",
+                         self.run_command("all after=User.missing"))
+        self.assertEqual("[]", self.run_command(
+            "all after=User." + user.id))
+
+    def test_count(self):
+        User()
+        User()
+        Place()
+        self.assertEqual("2", self.run_command("User.count()"))
+        self.assertEqual("0", self.run_command("Review.count()"))
+        self.assertEqual("2", self.run_command("count User"))
+        self.assertEqual("** class name missing **",
+                         self.run_command("count"))
+        with mock.patch.object(FileStorage, "all",
+                               side_effect=AssertionError("scanned")):
+            self.assertEqual("2", self.run_command("User.count()"))
+
+    def test_near_and_within(self):
+        place = Place()
+        place.latitude = 37.7749
+        place.longitude = -122.4194
+        self.assertEqual(str([str(place)]),
+                         self.run_command("near 37.77 -122.42 5"))
+        self.assertEqual(str([str(place)]),
+                         self.run_command("within 37 -123 38 -122"))
+        for line in ("near nan 0 5", "near 0 inf 5", "near 0 0 nan",
+                     "within 37 -123 inf -122", "within nan 0 1 1"):
+            self.assertEqual("** invalid number **", self.run_command(line))
+
+    def test_show(self):
+        place = Place()
+        self.assertEqual(str(place),
+                         self.run_command('Place.show("{}")'.format(place.id)))
+        self.assertEqual(str(place),
+                         self.run_command("Place.show({})".format(place.id)))
+        self.assertEqual("** no instance found **",
+                         self.run_command('User.show("{}")'.format(place.id)))
+        self.assertEqual("** instance id missing **",
+                         self.run_command("Place.show()"))
+
+    def test_destroy(self):
+        user = User()
+        self.run_command('User.destroy("{}")'.format(user.id))
+        self.assertNotIn("User." + user.id, FileStorage().all())
+        self.assertEqual("** no instance found **", self.run_command(
+            'User.destroy("{}")'.format(user.id)))
+
+    def test_update_attribute(self):
+        place = Place()
+        self.run_command('Place.update("{}", "name", "Loft")'.format(place.id))
+        self.run_command('Place.update("{}", "number_rooms", 3)'.format(
+            place.id))
+        self.assertEqual("Loft", place.name)
+        self.assertEqual(3, place.number_rooms)
+        self.assertFalse(FileStorage().is_dirty(place))
+
+    def test_update_dict(self):
+        user = User()
+        self.run_command(
+            'User.update("{}", {{"first_name": "Betty", "age": 30}})'.format(
+                user.id))
+        self.assertEqual("Betty", user.first_name)
+        self.assertEqual(30, user.age)
+
+    def test_update_errors(self):
+        user = User()
+        self.assertEqual("** instance id missing **",
+                         self.run_command("User.update()"))
+        self.assertEqual("** no instance found **",
+                         self.run_command('User.update("x", "a", 1)'))
+        self.assertEqual("** attribute name missing **",
+                         self.run_command('User.update("{}")'.format(user.id)))
+        self.assertEqual("** value missing **",
+                         self.run_command('User.update("{}", "a")'.format(
+                             user.id)))
+        self.assertEqual("** value missing **", self.run_command(
+            'User.update("{}", {{[]: 1}})'.format(user.id)))
+        self.assertEqual("** no instance found **", self.run_command(
+            "User.update(" + "-" * 100000 + "1)"))
+
+    def test_errors(self):
+        self.assertEqual("** class doesn't exist **",
+                         self.run_command("MyModel.all()"))
+        self.assertEqual("** class name missing **",
+                         self.run_command(".count()"))
+        self.assertEqual("** Unknown command **",
+                         self.run_command("User.fly()"))
+        self.assertEqual("** Unknown command **",
+                         self.run_command("User.all"))
+
+    def run_batch(self, text, **options):
+        writes = []
+        write = FileStorage.write
+
+        def count_writes(storage):
+            writes.append(len(storage.all()))
+            write(storage)
+
+        with mock.patch("sys.stdout", new=StringIO()) as output, \
+                mock.patch("sys.stderr", new=StringIO()) as summary, \
+                mock.patch.object(FileStorage, "write", count_writes):
+            errors = HBNBCommand().run_batch(StringIO(text), **options)
+        return errors, output.getvalue(), summary.getvalue(), writes
+
+    def test_batch_single_save(self):
+        errors, output, summary, writes = self.run_batch(
+            "create User\n" * 50 + "# comment\n\nUser.count()\n")
+        ids = output.split()
+        self.assertEqual(0, errors)
+        self.assertEqual(51, len(ids))
+        self.assertEqual("50", ids[-1])
+        self.assertEqual([50], writes)
+        self.assertEqual("51 commands, 0 errors\n", summary)
+
+    def test_batch_flush_every(self):
+        errors, output, summary, writes = self.run_batch(
+            "create User\n" * 5, flush_every=2)
+        self.assertEqual([2, 4, 5], writes)
+
+    def test_batch_errors(self):
+        user = User()
+        errors, output, summary, writes = self.run_batch(
+            "create MyModel\n"
+            "show User\n"
+            'User.update("{}", "first_name", "Ann")\n'
+            "bulk_create User\n"
+            '{{"first_name": "Bob"}}\n'
+            "not json\n"
+            "\n"
+            "User.count()\n".format(user.id))
+        self.assertEqual(3, errors)
+        self.assertEqual("Ann", user.first_name)
+        self.assertEqual([2], writes)
+        self.assertEqual(
+            "5 commands, 3 errors\n"
+            "command 1 (create MyModel): ** class doesn't exist **\n"
+            "command 2 (show User): ** instance id missing **\n"
+            "command 4 (bulk_create User): ** invalid JSON **\n",
+            summary)
+        self.assertTrue(output.endswith("2\n"))
+
+    def test_batch_quit(self):
+        errors, output, summary, writes = self.run_batch(
+            "create User\nquit\ncreate User\n")
+        self.assertEqual(1, len(output.split()))
+        self.assertEqual("2 commands, 0 errors\n", summary)
+
+    def test_read_only_storage(self):
+        storage = SnapshotStorage()
+        with mock.patch.object(SnapshotStorage,
+                               "_SnapshotStorage__snapshot_path",
+                               os.path.join(self.directory, "none")):
+            storage.reload()
+        with mock.patch("console.storage", storage), \
+                mock.patch("models.storage", storage):
+            self.assertEqual("** read-only storage **",
+                             self.run_command("create User"))
+            errors, output, summary, writes = self.run_batch(
+                "create User\nbulk_create User\n{}\n\ncount User\n")
+        self.assertEqual(2, errors)
+        self.assertTrue(output.endswith("\n0\n"))
+        self.assertEqual(
+            "3 commands, 2 errors\n"
+            "command 1 (create User): ** read-only storage **\n"
+            "command 2 (bulk_create User): ** read-only storage **\n",
+            summary)
+
+    def test_lookup_by_key(self):
+        users = [User() for i in range(100)]
+        with mock.patch.object(FileStorage, "all",
+                               side_effect=AssertionError("scanned")):
+            self.assertEqual(str(users[50]), self.run_command(
+                'User.show("{}")'.format(users[50].id)))
+            self.run_command('User.update("{}", "first_name", "Ann")'.format(
+                users[50].id))
+        self.assertEqual("Ann", users[50].first_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
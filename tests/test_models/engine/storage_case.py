@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Module: storage_case
+Defines the TempStoreMixin class, shared by the unittests of
+the storage engines.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+import models
+from models.engine.file_storage import FileStorage
+
+
+class TempStoreMixin:
+    """
+    TempStoreMixin class.
+    Mixin placed before unittest.TestCase by the tests of a storage
+    engine: setUp() creates a temporary directory for the store,
+    points FileStorage at it and starts from no objects. All of it
+    is undone once the test ends.
+
+    Public Class Attributes:
+        store_name (str): Name of the store file in the directory.
+    """
+
+    store_name = "file.json"
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, self.store_name)
+        self.patch(FileStorage, "_FileStorage__file_path", self.path)
+        self.patch(FileStorage, "_FileStorage__objects", {})
+
+    def patch(self, target, attribute, value):
+        """Sets an attribute of target until the test ends."""
+        patcher = mock.patch.object(target, attribute, value)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_storage(self, storage):
+        """Makes storage the models.storage of the test."""
+        self.storage = storage
+        self.patch(models, "storage", storage)
+        return storage
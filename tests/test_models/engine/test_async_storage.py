@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""Defines unittests for async_storage"""
+
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+import models
+from models.engine.async_storage import AsyncStorage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+from tests.test_models.engine.storage_case import TempStoreMixin
+
+
+class TestAsyncStorage(TempStoreMixin, unittest.IsolatedAsyncioTestCase):
+    """Unittests for testing the AsyncStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = AsyncStorage(FileStorage())
+        self.addCleanup(self.storage.close)
+
+    def read(self):
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def test_default_storage(self):
+        self.assertIs(models.storage, AsyncStorage().storage)
+
+    def test_delegates(self):
+        user = User()
+        self.assertIs(user, self.storage.get(User, user.id))
+        self.assertIs(FileStorage.classes, self.storage.classes)
+        with self.assertRaises(AttributeError):
+            self.storage.missing
+
+    async def test_aget(self):
+        user = User()
+        self.assertIs(user, await self.storage.aget(User, user.id))
+        self.assertIs(user, await self.storage.aget("User." + user.id))
+        self.assertIsNone(await self.storage.aget("User.missing"))
+
+    async def test_acount(self):
+        User()
+        User()
+        self.assertEqual(2, await self.storage.acount(User))
+        self.assertEqual(0, await self.storage.acount("Place"))
+
+    async def test_alookup(self):
+        place = Place()
+        place.city_id = "paris"
+        Place()
+        self.assertEqual(["Place." + place.id], list(
+            await self.storage.alookup(Place, "city_id", "paris")))
+
+    async def test_aall(self):
+        users = {User() for i in range(5)}
+        Place()
+        with mock.patch.object(AsyncStorage, "chunk_size", 2):
+            found = {user async for user in self.storage.aall(User)}
+        self.assertEqual(users, found)
+        self.assertEqual(6, len([
+            obj async for obj in self.storage.aall()]))
+
+    async def test_aall_while_adding(self):
+        User()
+
+        async def add():
+            User()
+
+        async for user in self.storage.aall():
+            await add()
+        self.assertEqual(2, len(self.storage.all()))
+
+    async def test_asave_on_worker_thread(self):
+        threads = []
+        save = FileStorage.save
+
+        def record(storage):
+            threads.append(threading.current_thread())
+            save(storage)
+
+        User()
+        with mock.patch.object(FileStorage, "save", record):
+            await self.storage.asave()
+        self.assertIsNot(threading.current_thread(), threads[0])
+        self.assertEqual(1, len(self.read()))
+
+    async def test_asave_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+        saves = []
+        save = FileStorage.save
+
+        def slow(storage):
+            saves.append(len(storage.all()))
+            started.set()
+            release.wait(5)
+            save(storage)
+
+        User()
+        with mock.patch.object(FileStorage, "save", slow):
+            first = asyncio.ensure_future(self.storage.asave())
+            await asyncio.get_running_loop().run_in_executor(
+                None, started.wait, 5)
+            User()
+            others = [asyncio.ensure_future(self.storage.asave())
+                      for i in range(5)]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(first, *others)
+        self.assertEqual([1, 2], saves)
+        self.assertEqual(2, len(self.read()))
+
+    async def test_asave_error(self):
+        with mock.patch.object(FileStorage, "save",
+                               side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                await self.storage.asave()
+        User()
+        await self.storage.asave()
+        self.assertEqual(1, len(self.read()))
+
+    async def test_areload(self):
+        user = User()
+        await self.storage.asave()
+        FileStorage._FileStorage__objects = {}
+        await self.storage.areload()
+        self.assertEqual(user.id, (await self.storage.aget(
+            "User." + user.id)).id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/atomic.py"""
+
+import os
+import tempfile
+import unittest
+from models.engine.atomic import atomic_write
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """Unittests for testing the atomic_write context manager."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "file.json")
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_creates_file(self):
+        with atomic_write(self.path) as f:
+            f.write(b"{}")
+        self.assertEqual(b"{}", self.read())
+        self.assertEqual(["file.json"], os.listdir(self.directory))
+
+    def test_replaces_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"old content")
+        with atomic_write(self.path) as f:
+            f.write(b"new")
+        self.assertEqual(b"new", self.read())
+
+    def test_error_keeps_old_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"old content")
+        with self.assertRaises(ZeroDivisionError):
+            with atomic_write(self.path) as f:
+                f.write(b"half")
+                1 / 0
+        self.assertEqual(b"old content", self.read())
+        self.assertEqual(["file.json"], os.listdir(self.directory))
+
+    def test_old_file_intact_while_writing(self):
+        with open(self.path, "wb") as f:
+            f.write(b"old content")
+        with atomic_write(self.path) as f:
+            f.write(b"new")
+            self.assertEqual(b"old content", self.read())
+
+    def test_keeps_mode(self):
+        with open(self.path, "wb") as f:
+            f.write(b"old content")
+        os.chmod(self.path, 0o640)
+        with atomic_write(self.path) as f:
+            f.write(b"new")
+        self.assertEqual(0o640, os.stat(self.path).st_mode & 0o777)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/columns.py"""
+
+import unittest
+from array import array
+from models.compact import compact
+from models.engine.columns import ColumnStore
+from models.place import Place
+
+
+class TestColumnStore(unittest.TestCase):
+    """Unittests for testing the ColumnStore class."""
+
+    def setUp(self):
+        self.store = ColumnStore(Place, Place.column_attributes)
+        self.places = {}
+        for city_id, price, guests in (("c1", 50, 2), ("c1", 120, 6),
+                                       ("c2", 80, 4), ("c2", 200, 8)):
+            place = Place()
+            place.city_id = city_id
+            place.price_by_night = price
+            place.max_guest = guests
+            key = "Place." + place.id
+            self.places[key] = place
+            self.store.add(key, place)
+        self.keys = list(self.places)
+
+    def test_columns_are_typed_arrays(self):
+        self.assertEqual(array('q', [50, 120, 80, 200]),
+                         self.store.column("price_by_night"))
+        self.assertEqual('d', self.store.column("latitude").typecode)
+        self.assertEqual(4, len(self.store))
+
+    def test_compact_class(self):
+        CompactPlace = compact(Place)
+        store = ColumnStore(CompactPlace, Place.column_attributes)
+        place = CompactPlace()
+        place.city_id = "c1"
+        place.price_by_night = 50
+        store.add("Place." + place.id, place)
+        self.assertEqual(array('q', [50]), store.column("price_by_night"))
+        self.assertEqual(array('d', [0.0]), store.column("latitude"))
+        self.assertEqual(["Place." + place.id],
+                         store.select(city_id="c1", max_guest=(0, 0)))
+
+    def test_select_range(self):
+        self.assertEqual(self.keys[1:3],
+                         self.store.select(price_by_night=(60, 150)))
+
+    def test_select_open_ranges(self):
+        self.assertEqual(self.keys[1:],
+                         self.store.select(max_guest=(4, None)))
+        self.assertEqual(self.keys[:1],
+                         self.store.select(price_by_night=(None, 60)))
+
+    def test_select_combined(self):
+        self.assertEqual([self.keys[3]],
+                         self.store.select(price_by_night=(100, None),
+                                           city_id="c2"))
+
+    def test_select_after_changes(self):
+        self.assertEqual(self.keys[1:3],
+                         self.store.select(price_by_night=(60, 150)))
+        place = self.places[self.keys[3]]
+        place.price_by_night = 100
+        self.store.add(self.keys[3], place)
+        self.store.remove(self.keys[1])
+        self.assertEqual([self.keys[3], self.keys[2]],
+                         self.store.select(price_by_night=(60, 150)))
+
+    def test_select_skips_nan(self):
+        place = self.places[self.keys[0]]
+        place.latitude = float("nan")
+        self.store.add(self.keys[0], place)
+        self.assertEqual(self.keys[1:],
+                         self.store.select(latitude=(-1, None)))
+        self.assertEqual(self.keys[1:2], self.store.select(
+            latitude=(None, 1), price_by_night=(100, 150)))
+
+    def test_select_unknown_str_value(self):
+        self.assertEqual([], self.store.select(city_id="c9"))
+
+    def test_aggregates(self):
+        self.assertEqual(50, self.store.min("price_by_night"))
+        self.assertEqual(200, self.store.max("price_by_night"))
+        self.assertEqual(112.5, self.store.mean("price_by_night"))
+        self.assertEqual(85, self.store.mean("price_by_night",
+                                             self.keys[:2]))
+
+    def test_aggregates_empty(self):
+        store = ColumnStore(Place, ("price_by_night",))
+        self.assertIsNone(store.min("price_by_night"))
+        self.assertIsNone(store.mean("price_by_night"))
+
+    def test_mean_by(self):
+        self.assertEqual({"c1": 85, "c2": 140},
+                         self.store.mean_by("price_by_night", "city_id"))
+
+    def test_update_row(self):
+        place = self.places[self.keys[0]]
+        place.price_by_night = "75"
+        self.store.add(self.keys[0], place)
+        self.assertEqual(75, self.store.min("price_by_night"))
+        self.assertEqual(4, len(self.store))
+
+    def test_update_one_column(self):
+        place = self.places[self.keys[0]]
+        place.price_by_night = 75
+        place.max_guest = 9
+        self.store.update(self.keys[0], place, "price_by_night")
+        self.store.update(self.keys[0], place, "description")
+        self.assertEqual(75, self.store.min("price_by_night"))
+        self.assertEqual(8, self.store.max("max_guest"))
+        self.assertEqual([self.keys[0]],
+                         self.store.select(price_by_night=(60, 79)))
+
+    def test_invalid_value_stored_as_default(self):
+        place = self.places[self.keys[0]]
+        place.price_by_night = "cheap"
+        self.store.add(self.keys[0], place)
+        self.assertEqual(0, self.store.min("price_by_night"))
+
+    def test_large_int_turns_column_into_doubles(self):
+        place = self.places[self.keys[0]]
+        place.price_by_night = 2**70
+        self.store.add(self.keys[0], place)
+        column = self.store.column("price_by_night")
+        self.assertEqual('d', column.typecode)
+        self.assertEqual([float(2**70), 120, 80, 200], list(column))
+        self.assertEqual([self.keys[0]],
+                         self.store.select(price_by_night=(1000, None)))
+
+    def test_value_too_large_for_doubles(self):
+        place = self.places[self.keys[0]]
+        place.price_by_night = 10**400
+        self.store.add(self.keys[0], place)
+        self.assertEqual(0, self.store.min("price_by_night"))
+        place.max_guest = float("inf")
+        self.store.add(self.keys[0], place)
+        self.assertEqual(0, self.store.min("max_guest"))
+
+    def test_remove(self):
+        self.store.remove(self.keys[0])
+        self.assertEqual(3, len(self.store))
+        self.assertEqual(80, self.store.min("price_by_night"))
+        self.assertEqual([self.keys[3]],
+                         self.store.select(price_by_night=(150, None)))
+
+    def test_remove_last_and_missing(self):
+        self.store.remove(self.keys[3])
+        self.store.remove("Place.missing")
+        self.assertEqual(self.keys[:3], self.store.keys)
+
+
+if __name__ == "__main__":
+    unittest.main()
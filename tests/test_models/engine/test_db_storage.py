@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+"""Defines unittests for db_storage"""
+
+import gc
+import sqlite3
+import unittest
+from unittest import mock
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from tests.test_models.engine.storage_case import TempStoreMixin
+
+
+class TestDBStorage(TempStoreMixin, unittest.TestCase):
+    """Unittests for testing the DBStorage class."""
+
+    store_name = "file.db"
+
+    def setUp(self):
+        super().setUp()
+        self.patch(DBStorage, "_DBStorage__db_path", self.path)
+        self.use_storage(DBStorage())
+        self.storage.reload()
+
+    def tearDown(self):
+        DBStorage._DBStorage__connection.close()
+        DBStorage._DBStorage__connection = None
+
+    def reopen(self):
+        gc.collect()
+        self.storage.reload()
+
+    def rows(self, table):
+        with sqlite3.connect(self.path) as connection:
+            return connection.execute(
+                'SELECT * FROM "{}"'.format(table)).fetchall()
+
+    def test_is_file_storage(self):
+        self.assertIsInstance(self.storage, FileStorage)
+        self.assertEqual(self.path, self.storage.file_path)
+
+    def test_tables_and_indexes(self):
+        with sqlite3.connect(self.path) as connection:
+            names = {name for name, in connection.execute(
+                "SELECT name FROM sqlite_master")}
+        for class_name in self.storage.classes:
+            self.assertIn(class_name, names)
+        self.assertIn("City_state_id", names)
+        self.assertIn("Place_city_id", names)
+        self.assertIn("Review_place_id", names)
+
+    def test_new_save_get(self):
+        user = User()
+        user.email = "betty@mail.com"
+        self.assertEqual([], self.rows("User"))
+        self.assertIs(user, self.storage.get(User, user.id))
+        user.save()
+        self.assertEqual(1, len(self.rows("User")))
+        self.reopen()
+        loaded = self.storage.get("User", user.id)
+        self.assertIsNot(user, loaded)
+        self.assertEqual(user.to_dict(), loaded.to_dict())
+
+    def test_save_error_keeps_changes(self):
+        user = User()
+        with mock.patch.object(User, "to_dict", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.assertEqual([], self.rows("User"))
+        self.assertTrue(user.is_dirty())
+        self.storage.save()
+        self.assertEqual(1, len(self.rows("User")))
+        self.assertFalse(user.is_dirty())
+
+    def test_identity_map(self):
+        user = User()
+        self.storage.save()
+        self.reopen()
+        first = self.storage.get(User, user.id)
+        self.assertIs(first, self.storage.get(User, user.id))
+        self.assertIs(first, self.storage.all(User)["User." + user.id])
+
+    def test_unused_objects_not_kept(self):
+        for i in range(10):
+            User()
+        self.storage.save()
+        self.assertEqual(0, len(DBStorage._DBStorage__identity))
+        self.storage.all()
+        gc.collect()
+        self.assertEqual(0, len(DBStorage._DBStorage__identity))
+
+    def test_update_is_written(self):
+        state = State()
+        state.save()
+        self.reopen()
+        loaded = self.storage.get(State, state.id)
+        loaded.name = "California"
+        self.assertTrue(loaded.is_dirty())
+        loaded.save()
+        self.assertFalse(loaded.is_dirty())
+        self.reopen()
+        self.assertEqual("California",
+                         self.storage.get(State, state.id).name)
+
+    def test_all(self):
+        user = User()
+        state = State()
+        self.storage.save()
+        city = City()
+        self.assertEqual({"User." + user.id, "State." + state.id,
+                          "City." + city.id}, set(self.storage.all()))
+        self.assertEqual(["State." + state.id],
+                         list(self.storage.all(State)))
+        self.assertEqual({}, self.storage.all("Nope"))
+
+    def test_after(self):
+        for i in range(3):
+            User()
+        self.storage.save()
+        keys = list(self.storage.all(User))
+        self.assertEqual(keys[1:], list(self.storage.after(keys[0], User)))
+        self.assertEqual(keys[1:2],
+                         list(self.storage.after(keys[0], User, 1)))
+        self.assertIsNone(self.storage.after("User.missing", User))
+
+    def test_count(self):
+        users = [User() for i in range(3)]
+        self.storage.save()
+        users[0].first_name = "Betty"
+        self.storage.delete(users[1])
+        State()
+        self.assertEqual(2, self.storage.count(User))
+        self.assertEqual(1, self.storage.count("State"))
+        self.assertEqual(3, self.storage.count())
+        self.assertEqual(0, self.storage.count("Nope"))
+        self.storage.save()
+        self.assertEqual(2, self.storage.count(User))
+        self.assertEqual(2, len(self.rows("User")))
+
+    def test_delete(self):
+        user = User()
+        other = User()
+        self.storage.save()
+        self.storage.delete(user)
+        self.assertIsNone(self.storage.get(User, user.id))
+        self.assertEqual(["User." + other.id], list(self.storage.all(User)))
+        self.storage.save()
+        self.assertEqual(1, len(self.rows("User")))
+
+    def test_lookup(self):
+        city = City()
+        city.state_id = "1"
+        City().state_id = "2"
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(["City." + city.id],
+                         list(self.storage.lookup(City, "state_id", "1")))
+        moved = self.storage.get(City, city.id)
+        moved.state_id = "2"
+        self.assertEqual({}, self.storage.lookup(City, "state_id", "1"))
+        self.assertEqual(2, len(self.storage.lookup(City, "state_id", "2")))
+        self.assertEqual(0, len(self.storage.lookup(City, "name", "x")))
+
+    def test_near_and_within(self):
+        sf = Place()
+        sf.latitude, sf.longitude = 37.77, -122.42
+        oakland = Place()
+        oakland.latitude, oakland.longitude = 37.80, -122.27
+        paris = Place()
+        paris.latitude, paris.longitude = 48.86, 2.35
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(["Place." + sf.id, "Place." + oakland.id],
+                         list(self.storage.near(37.77, -122.42, 50)))
+        self.assertEqual(["Place." + paris.id],
+                         list(self.storage.within(48, 2, 49, 3, Place)))
+
+    def test_columns(self):
+        for price in (50, 100):
+            Place().price_by_night = price
+        self.storage.save()
+        self.assertEqual(75, self.storage.columns(Place).mean(
+            "price_by_night"))
+        self.assertIsNone(self.storage.columns(User))
+
+    def test_bulk(self):
+        users = [User(id=str(i)) for i in range(3)]
+        self.storage.bulk_new(users)
+        self.assertEqual(3, len(self.rows("User")))
+        self.storage.bulk_update({"User.1": {"email": "a"}})
+        self.storage.bulk_delete(["User.0"])
+        self.reopen()
+        self.assertEqual({"User.1", "User.2"}, set(self.storage.all(User)))
+        self.assertEqual("a", self.storage.get(User, "1").email)
+
+    def test_batch(self):
+        with self.storage.batch():
+            User().save()
+            User().save()
+            self.assertEqual([], self.rows("User"))
+        self.assertEqual(2, len(self.rows("User")))
+
+
+if __name__ == "__main__":
+    unittest.main()
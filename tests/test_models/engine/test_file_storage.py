@@ -4,10 +4,16 @@
 import os
 import json
 import models
+import threading
+import time
 import unittest
+from unittest import mock
 from datetime import datetime
 from models.base_model import BaseModel
+from models.engine.columns import ColumnStore
 from models.engine.file_storage import FileStorage
+from models.engine.geo import GeoIndex
+from models.engine.index import AttributeIndex
 from models.user import User
 from models.state import State
 from models.place import Place
@@ -61,9 +67,45 @@ class TestFileStorage_methods(unittest.TestCase):
     def test_all(self):
         self.assertEqual(dict, type(models.storage.all()))
 
-    def test_all_with_arg(self):
-        with self.assertRaises(TypeError):
-            models.storage.all(None)
+    def test_all_with_none(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_class(self):
+        user_instance = User()
+        state_instance = State()
+        users = models.storage.all(User)
+        self.assertIn("User." + user_instance.id, users)
+        self.assertNotIn("State." + state_instance.id, users)
+        self.assertEqual(users, models.storage.all("User"))
+
+    def test_all_with_class_only_exact_class(self):
+        BaseModel()
+        user_instance = User()
+        self.assertNotIn("User." + user_instance.id,
+                         models.storage.all(BaseModel))
+
+    def test_all_with_class_after_delete(self):
+        user_instance = User()
+        models.storage.delete(user_instance)
+        self.assertEqual({}, models.storage.all(User))
+
+    def test_all_with_unknown_class(self):
+        self.assertEqual({}, models.storage.all("MyModel"))
+
+    def test_all_with_class_after_objects_replaced(self):
+        User()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual({}, models.storage.all(User))
+        user_instance = User()
+        self.assertEqual(["User." + user_instance.id],
+                         list(models.storage.all(User)))
+
+    def test_all_with_class_after_reload(self):
+        user_instance = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("User." + user_instance.id, models.storage.all(User))
 
     def test_new(self):
         bm_instance = BaseModel()
@@ -161,6 +203,391 @@ class TestFileStorage_methods(unittest.TestCase):
         self.assertIn("Amenity." + amenity_instance.id, objs)
         self.assertIn("Review." + review_instance.id, objs)
 
+    def test_delete(self):
+        user_instance = User()
+        models.storage.delete(user_instance)
+        self.assertNotIn("User." + user_instance.id, models.storage.all())
+
+    def test_delete_none(self):
+        user_instance = User()
+        models.storage.delete(None)
+        self.assertIn("User." + user_instance.id, models.storage.all())
+
+    def test_changes_tracks_new_update_and_delete(self):
+        models.storage.changes()
+        bm_instance = BaseModel()
+        user_instance = User()
+        models.storage.save()
+        self.assertFalse(bm_instance.is_dirty())
+        bm_instance.name = "changed"
+        models.storage.delete(user_instance)
+        state_instance = State()
+        changes = models.storage.changes()
+        self.assertEqual(3, len(changes))
+        self.assertIs(bm_instance, changes["BaseModel." + bm_instance.id])
+        self.assertIsNone(changes["User." + user_instance.id])
+        self.assertIs(state_instance, changes["State." + state_instance.id])
+        self.assertEqual({}, models.storage.changes())
+
+    def test_is_dirty(self):
+        bm_instance = BaseModel()
+        self.assertTrue(bm_instance.is_dirty())
+        models.storage.save()
+        self.assertFalse(bm_instance.is_dirty())
+        bm_instance.my_number = 89
+        self.assertTrue(bm_instance.is_dirty())
+
+    def test_unstored_instance_is_not_dirty(self):
+        bm_instance = BaseModel(**BaseModel().to_dict())
+        bm_instance.name = "copy"
+        self.assertFalse(bm_instance.is_dirty())
+
+    def test_reload_does_not_mark_changes(self):
+        BaseModel()
+        models.storage.save()
+        models.storage.reload()
+        self.assertEqual({}, models.storage.changes())
+
+    def test_get(self):
+        user_instance = User()
+        self.assertIs(user_instance,
+                      models.storage.get(User, user_instance.id))
+        self.assertIs(user_instance,
+                      models.storage.get("User", user_instance.id))
+
+    def test_get_missing(self):
+        user_instance = User()
+        self.assertIsNone(models.storage.get(State, user_instance.id))
+        self.assertIsNone(models.storage.get("User", "missing"))
+
+    def test_lookup_indexed_attribute(self):
+        place_instance = Place()
+        place_instance.city_id = "c1"
+        other_place = Place()
+        other_place.city_id = "c2"
+        self.assertEqual({"Place." + place_instance.id: place_instance},
+                         models.storage.lookup(Place, "city_id", "c1"))
+        self.assertEqual(models.storage.lookup(Place, "city_id", "c2"),
+                         models.storage.lookup("Place", "city_id", "c2"))
+
+    def test_lookup_follows_updates_and_deletes(self):
+        review_instance = Review()
+        review_instance.place_id = "p1"
+        review_instance.place_id = "p2"
+        self.assertEqual({}, models.storage.lookup(Review, "place_id", "p1"))
+        self.assertIn("Review." + review_instance.id,
+                      models.storage.lookup(Review, "place_id", "p2"))
+        models.storage.delete(review_instance)
+        self.assertEqual({}, models.storage.lookup(Review, "place_id", "p2"))
+
+    def test_lookup_after_reload(self):
+        city_instance = City()
+        city_instance.state_id = "s1"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("City." + city_instance.id,
+                      models.storage.lookup(City, "state_id", "s1"))
+
+    def test_lookup_not_indexed_attribute(self):
+        city_instance = City()
+        city_instance.name = "San Francisco"
+        self.assertEqual({"City." + city_instance.id: city_instance},
+                         models.storage.lookup(City, "name",
+                                               "San Francisco"))
+
+    def test_columns(self):
+        place_instance = Place()
+        place_instance.price_by_night = 100
+        other_place = Place()
+        other_place.price_by_night = 40
+        columns = models.storage.columns(Place)
+        self.assertEqual(["Place." + place_instance.id],
+                         columns.select(price_by_night=(50, None)))
+        models.storage.delete(place_instance)
+        self.assertEqual(40, columns.max("price_by_night"))
+
+    def test_setattr_updates_only_covering_indexes(self):
+        place_instance = Place()
+        models.storage.columns(Place)
+        with mock.patch.object(AttributeIndex, "add") as index_add, \
+                mock.patch.object(GeoIndex, "add") as geo_add, \
+                mock.patch.object(ColumnStore, "add") as columns_add:
+            place_instance.description = "Quiet"
+            place_instance.price_by_night = 100
+            self.assertEqual(0, index_add.call_count)
+            place_instance.city_id = "c1"
+            self.assertEqual(1, index_add.call_count)
+            self.assertEqual(0, geo_add.call_count)
+            place_instance.latitude = 37.7749
+            self.assertEqual(1, geo_add.call_count)
+            self.assertEqual(0, columns_add.call_count)
+        self.assertTrue(models.storage.is_dirty(place_instance))
+        self.assertEqual(["Place." + place_instance.id],
+                         models.storage.columns(Place).select(
+                             price_by_night=(100, 100), city_id="c1"))
+
+    def test_after(self):
+        users = [User() for i in range(4)]
+        place = Place()
+        keys = ["User." + user.id for user in users]
+        self.assertEqual(keys[2:],
+                         list(models.storage.after(keys[1], User)))
+        self.assertEqual(keys[2:3],
+                         list(models.storage.after(keys[1], User, 1)))
+        self.assertEqual(keys[3:] + ["Place." + place.id],
+                         list(models.storage.after(keys[2])))
+        self.assertIsNone(models.storage.after(keys[1], Place))
+        models.storage.delete(users[2])
+        other = User()
+        users[1].first_name = "Betty"
+        self.assertEqual([keys[3], "User." + other.id],
+                         list(models.storage.after(keys[1], "User")))
+        self.assertIsNone(models.storage.after(keys[2], User))
+
+    def test_columns_without_column_attributes(self):
+        User()
+        self.assertIsNone(models.storage.columns(User))
+
+    def test_near_and_within(self):
+        place_instance = Place()
+        place_instance.latitude = 37.7749
+        place_instance.longitude = -122.4194
+        far_place = Place()
+        far_place.latitude = 34.0522
+        far_place.longitude = -118.2437
+        key = "Place." + place_instance.id
+        self.assertEqual([key], list(models.storage.near(37.77, -122.41, 5)))
+        self.assertEqual([key],
+                         list(models.storage.near(37.77, -122.41, 5, Place)))
+        self.assertEqual({}, models.storage.near(37.77, -122.41, 5, User))
+        self.assertEqual([key], list(models.storage.within(37, -123, 38,
+                                                           -122)))
+        models.storage.delete(place_instance)
+        self.assertEqual({}, models.storage.within(37, -123, 38, -122))
+
+    def test_save_error_keeps_old_file(self):
+        BaseModel()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = f.read()
+        User()
+        with mock.patch.object(User, "to_dict", side_effect=OSError):
+            with self.assertRaises(OSError):
+                models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(saved, f.read())
+
+    def test_save_error_keeps_changes(self):
+        user = User()
+        with mock.patch.object(User, "to_dict", side_effect=OSError):
+            with self.assertRaises(OSError):
+                models.storage.save()
+        self.assertTrue(models.storage.is_dirty(user))
+        models.storage.save()
+        self.assertFalse(models.storage.is_dirty(user))
+        with open("file.json", "r") as f:
+            self.assertIn("User." + user.id, json.load(f))
+
+    def test_group_commit(self):
+        writes = []
+        write = FileStorage._FileStorage__write
+
+        def counting_write(storage):
+            writes.append(1)
+            write(storage)
+
+        threads = [threading.Thread(target=models.storage.save)
+                   for i in range(8)]
+        with mock.patch.object(FileStorage, "group_commit_window", 0.05), \
+                mock.patch.object(FileStorage, "_FileStorage__write",
+                                  counting_write):
+            BaseModel()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertLess(len(writes), 8)
+        self.assertGreaterEqual(len(writes), 1)
+        self.assertTrue(os.path.exists("file.json"))
+
+    def test_group_commit_single_save_writes(self):
+        with mock.patch.object(FileStorage, "group_commit_window", 0.001):
+            bm = BaseModel()
+            models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, json.load(f))
+
+    def count_writes(self):
+        writes = []
+        write = FileStorage.write
+
+        def counting_write(storage):
+            writes.append(1)
+            write(storage)
+
+        patch = mock.patch.object(FileStorage, "write", counting_write)
+        patch.start()
+        self.addCleanup(patch.stop)
+        return writes
+
+    def test_save_writes_right_away(self):
+        writes = self.count_writes()
+        BaseModel().save()
+        BaseModel().save()
+        self.assertEqual(2, len(writes))
+        self.assertEqual(0, models.storage.pending())
+
+    def test_batch(self):
+        writes = self.count_writes()
+        with models.storage.batch():
+            for i in range(10):
+                BaseModel().save()
+            self.assertEqual(0, len(writes))
+            self.assertEqual(10, models.storage.pending())
+            self.assertFalse(os.path.exists("file.json"))
+        self.assertEqual(1, len(writes))
+        self.assertEqual(0, models.storage.pending())
+        with open("file.json", "r") as f:
+            self.assertEqual(10, len(json.load(f)))
+
+    def test_nested_batch(self):
+        writes = self.count_writes()
+        with models.storage.batch():
+            with models.storage.batch():
+                BaseModel().save()
+            self.assertEqual(0, len(writes))
+            BaseModel().save()
+        self.assertEqual(1, len(writes))
+
+    def test_batch_without_save_does_not_write(self):
+        writes = self.count_writes()
+        with models.storage.batch():
+            BaseModel()
+        self.assertEqual(0, len(writes))
+
+    def test_batch_writes_on_error(self):
+        writes = self.count_writes()
+        with self.assertRaises(ValueError):
+            with models.storage.batch():
+                BaseModel().save()
+                raise ValueError
+        self.assertEqual(1, len(writes))
+
+    def test_flush_in_batch(self):
+        writes = self.count_writes()
+        with models.storage.batch():
+            BaseModel().save()
+            models.storage.flush()
+            self.assertEqual(1, len(writes))
+            self.assertTrue(os.path.exists("file.json"))
+        self.assertEqual(1, len(writes))
+
+    def test_flush_every(self):
+        writes = self.count_writes()
+        with mock.patch.object(FileStorage, "flush_every", 3):
+            for i in range(7):
+                BaseModel().save()
+            self.assertEqual(2, len(writes))
+            self.assertEqual(1, models.storage.pending())
+            models.storage.flush()
+        self.assertEqual(3, len(writes))
+
+    def test_flush_interval(self):
+        writes = self.count_writes()
+        with mock.patch.object(FileStorage, "flush_interval", 60):
+            BaseModel().save()
+            BaseModel().save()
+            self.assertEqual(0, len(writes))
+            FileStorage._FileStorage__pending_since -= 60
+            BaseModel().save()
+            self.assertEqual(1, len(writes))
+            self.assertEqual(0, models.storage.pending())
+
+    def test_flush_interval_timer(self):
+        writes = self.count_writes()
+        with mock.patch.object(FileStorage, "flush_interval", 0.05):
+            BaseModel().save()
+            BaseModel().save()
+            self.assertEqual(0, len(writes))
+            for i in range(200):
+                if writes:
+                    break
+                time.sleep(0.01)
+        self.assertEqual(1, len(writes))
+        self.assertEqual(0, models.storage.pending())
+
+    def test_flush_cancels_timer(self):
+        writes = self.count_writes()
+        with mock.patch.object(FileStorage, "flush_interval", 0.05):
+            BaseModel().save()
+            models.storage.flush()
+            time.sleep(0.1)
+        self.assertEqual(1, len(writes))
+
+    def test_bulk_new(self):
+        writes = self.count_writes()
+        users = [User(id=str(i), email="{}@mail.com".format(i))
+                 for i in range(5)]
+        keys = models.storage.bulk_new(users)
+        self.assertEqual(["User.{}".format(i) for i in range(5)], keys)
+        self.assertEqual(1, len(writes))
+        self.assertIs(users[3], models.storage.get(User, "3"))
+        self.assertEqual({"User.2": users[2]},
+                         models.storage.lookup(User, "email", "2@mail.com"))
+        with open("file.json", "r") as f:
+            self.assertEqual(set(keys), set(json.load(f)))
+
+    def test_bulk_update(self):
+        writes = self.count_writes()
+        city = City()
+        city.state_id = "1"
+        created_at = city.created_at
+        updated = models.storage.bulk_update({
+            "City." + city.id: {"state_id": "2", "name": "SF",
+                                "id": "other", "created_at": None},
+            "City.missing": {"name": "LA"},
+        })
+        self.assertEqual(["City." + city.id], updated)
+        self.assertEqual(1, len(writes))
+        self.assertEqual(("2", "SF"), (city.state_id, city.name))
+        self.assertIs(created_at, city.created_at)
+        self.assertNotEqual(city.created_at, city.updated_at)
+        self.assertEqual({}, models.storage.lookup(City, "state_id", "1"))
+        self.assertEqual({"City." + city.id: city},
+                         models.storage.lookup(City, "state_id", "2"))
+
+    def test_bulk_update_pairs(self):
+        user = User()
+        models.storage.bulk_update([("User." + user.id, {"email": "a"})])
+        self.assertEqual("a", user.email)
+
+    def test_bulk_delete(self):
+        writes = self.count_writes()
+        users = [User() for i in range(3)]
+        keys = ["User." + user.id for user in users]
+        deleted = models.storage.bulk_delete(keys[:2] + ["User.missing"])
+        self.assertEqual(keys[:2], deleted)
+        self.assertEqual(1, len(writes))
+        self.assertEqual([keys[2]], list(models.storage.all(User)))
+        with open("file.json", "r") as f:
+            self.assertEqual([keys[2]], list(json.load(f)))
+
+    def test_count(self):
+        users = [User() for i in range(3)]
+        Place()
+        self.assertEqual(3, models.storage.count(User))
+        self.assertEqual(3, models.storage.count("User"))
+        self.assertEqual(0, models.storage.count("Review"))
+        self.assertEqual(len(models.storage.all()), models.storage.count())
+        models.storage.delete(users[0])
+        self.assertEqual(2, models.storage.count(User))
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count(Place))
+
     def test_reload_with_arg(self):
         with self.assertRaises(TypeError):
             models.storage.reload(None)
@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/formats.py"""
+
+import io
+import json
+import os
+import pickle
+import unittest
+from datetime import datetime
+from models.engine import formats
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+
+
+class TestFormats(unittest.TestCase):
+    """Unittests for testing the JSON and pickle formats."""
+
+    def setUp(self):
+        self.user = User(id="1", email="betty@mail.com",
+                         created_at="2023-07-16T14:42:34.418590",
+                         updated_at="2023-07-16T14:42:35.000001")
+        self.place = Place(id="2", name="Café", amenity_ids=["a"],
+                           latitude=37.77, max_guest=4)
+
+    def items(self, fmt):
+        return [("User.1", fmt.encode(self.user)),
+                ("Place.2", fmt.encode(self.place))]
+
+    def round_trip(self, fmt, items):
+        file = io.BytesIO()
+        fmt.dump(iter(items), file)
+        file.seek(0)
+        return list(fmt.load(file))
+
+    def test_json_is_readable_by_json_load(self):
+        fmt = formats.formats["json"]
+        file = io.BytesIO()
+        fmt.dump(iter(self.items(fmt)), file)
+        self.assertEqual(dict(self.items(fmt)),
+                         json.loads(file.getvalue().decode('utf-8')))
+
+    def test_json_round_trip(self):
+        fmt = formats.formats["json"]
+        items = self.round_trip(fmt, self.items(fmt))
+        self.assertEqual(self.items(fmt), items)
+
+    def test_json_writes_datetimes_as_strings(self):
+        fmt = formats.formats["json"]
+        items = self.round_trip(fmt, self.items(formats.formats["pickle"]))
+        self.assertEqual(self.items(fmt), items)
+
+    def test_pickle_round_trip(self):
+        fmt = formats.formats["pickle"]
+        items = self.round_trip(fmt, self.items(fmt))
+        self.assertEqual(self.items(fmt), items)
+        self.assertIsInstance(items[0][1]["created_at"], datetime)
+
+    def test_pickle_batches(self):
+        fmt = formats.PickleFormat()
+        fmt.batch_size = 2
+        items = [("User.{}".format(i), {"id": str(i)}) for i in range(5)]
+        self.assertEqual(items, self.round_trip(fmt, items))
+
+    def test_pickle_parses_string_dates(self):
+        fmt = formats.formats["pickle"]
+        items = self.round_trip(fmt, self.items(formats.formats["json"]))
+        self.assertEqual(self.items(fmt), items)
+
+    def test_pickle_empty(self):
+        self.assertEqual([], self.round_trip(formats.formats["pickle"], []))
+
+    def test_pickle_bad_header(self):
+        fmt = formats.formats["pickle"]
+        with self.assertRaises(ValueError):
+            list(fmt.load(io.BytesIO(b'{"User.1": {}}')))
+
+    def test_pickle_refuses_globals(self):
+        fmt = formats.formats["pickle"]
+        file = io.BytesIO(fmt.header + pickle.dumps([("x", os.getcwd)]))
+        with self.assertRaises(pickle.UnpicklingError):
+            list(fmt.load(file))
+
+    def test_objects_rebuilt_from_pickle(self):
+        fmt = formats.formats["pickle"]
+        key, value = self.round_trip(fmt, self.items(fmt))[0]
+        user = User(**value)
+        self.assertEqual(self.user.to_dict(), user.to_dict())
+
+    def test_for_path(self):
+        self.assertIs(formats.formats["json"], formats.for_path("file.json"))
+        self.assertIs(formats.formats["pickle"],
+                      formats.for_path("file.pickle"))
+        self.assertIs(formats.formats["pickle"], formats.for_path("a.pkl"))
+        self.assertIs(formats.formats["json"], formats.for_path("file"))
+        self.assertIs(formats.formats["pickle"],
+                      formats.for_path("file.json", "pickle"))
+        with self.assertRaises(ValueError):
+            formats.for_path("file.json", "xml")
+
+
+class TestConvert(unittest.TestCase):
+    """Unittests for testing the convert function."""
+
+    paths = ("convert.json", "convert.pickle", "convert2.json")
+
+    def tearDown(self):
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+
+    def test_convert_both_ways(self):
+        document = {
+            "User.1": {"id": "1", "__class__": "User",
+                       "created_at": "2023-07-16T14:42:34.418590",
+                       "updated_at": "2023-07-16T14:42:34.418590"},
+        }
+        with open("convert.json", "w") as f:
+            json.dump(document, f)
+        formats.convert("convert.json", "convert.pickle")
+        with open("convert.pickle", "rb") as f:
+            self.assertTrue(f.read().startswith(
+                formats.PickleFormat.header))
+        formats.convert("convert.pickle", "convert2.json")
+        with open("convert2.json", "r") as f:
+            self.assertEqual(document, json.load(f))
+
+
+class TestFileStorageFormat(unittest.TestCase):
+    """Unittests for saving and reloading FileStorage in each format."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.format = FileStorage._FileStorage__format
+
+    def tearDown(self):
+        FileStorage._FileStorage__format = self.format
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_default_format_is_json(self):
+        self.assertIs(formats.formats["json"], FileStorage().format)
+
+    def test_save_reload_pickle(self):
+        FileStorage._FileStorage__format = formats.formats["pickle"]
+        storage = FileStorage()
+        place = Place()
+        place.name = "Home"
+        storage.save()
+        with open("file.json", "rb") as f:
+            self.assertTrue(f.read().startswith(
+                formats.PickleFormat.header))
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        loaded = storage.get(Place, place.id)
+        self.assertEqual(place.to_dict(), loaded.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
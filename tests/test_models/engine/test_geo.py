@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/geo.py"""
+
+import unittest
+from models.engine.geo import GeoIndex, distance
+from models.place import Place
+
+
+class TestDistance(unittest.TestCase):
+    """Unittests for testing the distance function."""
+
+    def test_same_point(self):
+        self.assertEqual(0, distance(37.77, -122.42, 37.77, -122.42))
+
+    def test_known_distance(self):
+        km = distance(37.7749, -122.4194, 34.0522, -118.2437)
+        self.assertAlmostEqual(559, km, delta=2)
+
+    def test_across_antimeridian(self):
+        self.assertAlmostEqual(22.2, distance(0, 179.9, 0, -179.9),
+                               delta=0.1)
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Unittests for testing the GeoIndex class."""
+
+    def setUp(self):
+        self.index = GeoIndex("latitude", "longitude")
+        self.keys = {}
+        for name, lat, lon in (("sf", 37.7749, -122.4194),
+                               ("oakland", 37.8044, -122.2712),
+                               ("la", 34.0522, -118.2437),
+                               ("fiji", -17.7, 179.95),
+                               ("samoa", -17.7, -179.95)):
+            place = Place()
+            place.latitude = lat
+            place.longitude = lon
+            self.keys[name] = "Place." + place.id
+            self.index.add(self.keys[name], place)
+
+    def names(self, matches):
+        return [name for key in matches
+                for name, known in self.keys.items() if key == known]
+
+    def test_near(self):
+        self.assertEqual(["sf", "oakland"],
+                         self.names(self.index.near(37.7749, -122.4194, 20)))
+
+    def test_near_closest_first(self):
+        self.assertEqual(["oakland", "sf"],
+                         self.names(self.index.near(37.81, -122.27, 20)))
+
+    def test_near_large_radius(self):
+        self.assertEqual(3, len(self.index.near(37.7749, -122.4194, 600)))
+
+    def test_near_whole_earth(self):
+        self.assertEqual(5, len(self.index.near(0, 0, 30000)))
+
+    def test_near_across_antimeridian(self):
+        self.assertEqual(["fiji", "samoa"],
+                         self.names(self.index.near(-17.7, 179.95, 20)))
+
+    def test_within(self):
+        self.assertEqual(["sf", "oakland"],
+                         self.names(self.index.within(37, -123, 38, -122)))
+
+    def test_within_empty(self):
+        self.assertEqual({}, self.index.within(0, 0, 1, 1))
+
+    def test_non_finite_queries(self):
+        nan, inf = float("nan"), float("inf")
+        self.assertEqual({}, self.index.near(nan, -122.4194, 20))
+        self.assertEqual({}, self.index.near(37.7749, inf, 20))
+        self.assertEqual({}, self.index.near(37.7749, -122.4194, nan))
+        self.assertEqual({}, self.index.near(37.7749, -122.4194, -inf))
+        self.assertEqual(5, len(self.index.near(0, 0, inf)))
+        self.assertEqual({}, self.index.within(nan, -123, 38, -122))
+        self.assertEqual(5, len(self.index.within(-inf, -inf, inf, inf)))
+        self.assertEqual(["sf", "oakland"],
+                         self.names(self.index.within(37, -123, 38, inf)))
+
+    def test_move_and_remove(self):
+        place = Place()
+        place.latitude = 34.05
+        place.longitude = -118.25
+        self.index.add(self.keys["sf"], place)
+        self.assertEqual({}, self.index.within(37.7, -122.5, 37.78, -122.4))
+        self.index.remove(self.keys["la"])
+        self.assertEqual(["sf"],
+                         self.names(self.index.near(34.0522, -118.2437, 5)))
+
+    def test_invalid_coordinates_not_indexed(self):
+        place = Place()
+        place.latitude = "north"
+        self.index.add("Place." + place.id, place)
+        place.latitude = 95.0
+        self.index.add("Place." + place.id, place)
+        self.assertEqual(5, len(self.index.near(0, 0, 30000)))
+
+    def test_string_coordinates(self):
+        place = Place()
+        place.latitude = "48.8566"
+        place.longitude = "2.3522"
+        self.index.add("Place." + place.id, place)
+        self.assertIn("Place." + place.id, self.index.near(48.85, 2.35, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/index.py"""
+
+import unittest
+from models.engine.index import AttributeIndex
+from models.city import City
+
+
+class TestAttributeIndex(unittest.TestCase):
+    """Unittests for testing the AttributeIndex class."""
+
+    def setUp(self):
+        self.index = AttributeIndex("state_id")
+        self.city = City()
+        self.city.state_id = "s1"
+        self.key = "City." + self.city.id
+
+    def test_add_and_find(self):
+        self.index.add(self.key, self.city)
+        self.assertEqual({self.key: self.city}, self.index.find("s1"))
+
+    def test_find_missing_value(self):
+        self.index.add(self.key, self.city)
+        self.assertEqual({}, self.index.find("s2"))
+
+    def test_add_moves_changed_value(self):
+        self.index.add(self.key, self.city)
+        self.city.state_id = "s2"
+        self.index.add(self.key, self.city)
+        self.assertEqual({}, self.index.find("s1"))
+        self.assertEqual({self.key: self.city}, self.index.find("s2"))
+
+    def test_remove(self):
+        self.index.add(self.key, self.city)
+        self.index.remove(self.key)
+        self.assertEqual({}, self.index.find("s1"))
+
+    def test_remove_missing_key(self):
+        self.index.remove(self.key)
+        self.assertEqual({}, self.index.find("s1"))
+
+    def test_unhashable_value_not_indexed(self):
+        self.city.state_id = ["s1"]
+        self.index.add(self.key, self.city)
+        self.assertEqual({}, self.index.find(["s1"]))
+
+    def test_find_returns_copy(self):
+        self.index.add(self.key, self.city)
+        self.index.find("s1").clear()
+        self.assertEqual({self.key: self.city}, self.index.find("s1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
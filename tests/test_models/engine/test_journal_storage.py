@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+"""Defines unittests for journal_storage"""
+
+import os
+import json
+import unittest
+from unittest import mock
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from models.engine.journal_storage import JournalStorage
+from models.user import User
+
+
+class TestJournalStorage(unittest.TestCase):
+    """Unittests for testing the JournalStorage class."""
+
+    def setUp(self):
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.rename(name, name + ".tmp")
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = JournalStorage()
+        self.storage.reload()
+        self.storage.changes()
+
+    def tearDown(self):
+        for name in ("file.json", "file.json.log"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+            try:
+                os.rename(name + ".tmp", name)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+
+    def read_log(self):
+        with open("file.json.log", "r") as f:
+            return [json.loads(line) for line in f]
+
+    def test_is_file_storage(self):
+        self.assertIsInstance(self.storage, FileStorage)
+
+    def test_save_appends_only_changes(self):
+        user = User()
+        self.storage.new(user)
+        self.storage.save()
+        base_model = BaseModel()
+        self.storage.new(base_model)
+        self.storage.save()
+        records = self.read_log()
+        self.assertEqual(2, len(records))
+        self.assertEqual("put", records[1]["op"])
+        self.assertEqual("BaseModel." + base_model.id, records[1]["key"])
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_save_error_keeps_changes(self):
+        user = User()
+        with mock.patch.object(User, "to_dict", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.storage.save()
+        self.assertEqual(["User." + user.id],
+                         [record["key"] for record in self.read_log()])
+
+    def test_batch_appends_once(self):
+        with self.storage.batch():
+            for i in range(3):
+                user = User()
+                self.storage.new(user)
+                user.save()
+            self.assertFalse(os.path.exists("file.json.log"))
+        self.assertEqual(3, len(self.read_log()))
+
+    def test_save_appends_attribute_update(self):
+        user = User()
+        self.storage.new(user)
+        self.storage.save()
+        user.first_name = "Betty"
+        self.storage.save()
+        records = self.read_log()
+        self.assertEqual(2, len(records))
+        self.assertEqual("Betty", records[1]["value"]["first_name"])
+
+    def test_save_without_changes(self):
+        self.storage.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+
+    def test_reload_replays_log(self):
+        user = User()
+        user.first_name = "Betty"
+        self.storage.new(user)
+        base_model = BaseModel()
+        self.storage.new(base_model)
+        self.storage.save()
+        self.storage.delete(base_model)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertIn("User." + user.id, objs)
+        self.assertEqual("Betty", objs["User." + user.id].first_name)
+        self.assertNotIn("BaseModel." + base_model.id, objs)
+
+    def test_reload_ignores_truncated_record(self):
+        user = User()
+        self.storage.new(user)
+        self.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('{"op": "put", "key": "User.')
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn("User." + user.id, self.storage.all())
+        self.assertEqual(["User." + user.id],
+                         [record["key"] for record in self.read_log()])
+
+    def test_reload_skips_incomplete_records(self):
+        user = User()
+        self.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('{"key": "User.x", "value": {}}\n')
+            f.write('{"op": "put", "key": "User.y"}\n')
+            f.write('{"op": "put", "key": "User.z", "value": [1]}\n')
+        base_model = BaseModel()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual({"User." + user.id, "BaseModel." + base_model.id},
+                         set(self.storage.all()))
+
+    def test_save_after_truncated_record(self):
+        user = User()
+        self.storage.save()
+        with open("file.json.log", "a") as f:
+            f.write('{"op": "put", "key": "User.')
+        base_model = BaseModel()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn("User." + user.id, self.storage.all())
+        self.assertIn("BaseModel." + base_model.id, self.storage.all())
+
+    def test_failed_append_leaves_no_partial_record(self):
+        user = User()
+        self.storage.save()
+        with open("file.json.log", "r") as f:
+            saved = f.read()
+        base_model = BaseModel()
+        with mock.patch("models.engine.journal_storage.os.fsync",
+                        side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        with open("file.json.log", "r") as f:
+            self.assertEqual(saved, f.read())
+        self.storage.save()
+        self.assertEqual(["User." + user.id, "BaseModel." + base_model.id],
+                         [record["key"] for record in self.read_log()])
+
+    def test_compact(self):
+        user = User()
+        self.storage.new(user)
+        self.storage.save()
+        self.storage.compact()
+        self.assertEqual([], self.read_log())
+        with open("file.json", "r") as f:
+            self.assertIn("User." + user.id, f.read())
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn("User." + user.id, self.storage.all())
+
+    def test_automatic_compaction(self):
+        self.storage.compact_min_records = 2
+        base_model = BaseModel()
+        for _ in range(3):
+            self.storage.new(base_model)
+            self.storage.save()
+        self.assertEqual([], self.read_log())
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + base_model.id, json.load(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/json_stream.py"""
+
+import io
+import json
+import unittest
+from models.engine.json_stream import iter_items
+
+
+class TestIterItems(unittest.TestCase):
+    """Unittests for testing the iter_items function."""
+
+    document = {
+        "User.1": {"id": "1", "first_name": "Betty", "__class__": "User"},
+        "Place.2": {"id": "2", "latitude": 37.773972, "max_guest": 10,
+                    "amenity_ids": ["a", "b"], "description": '{"x": }'},
+        "State.3": {"id": "3", "name": "Calif\u00f3rnia"},
+    }
+
+    def load(self, text, chunk_size):
+        return list(iter_items(io.StringIO(text), chunk_size))
+
+    def test_matches_json_load(self):
+        text = json.dumps(self.document)
+        for chunk_size in (1, 2, 7, 64, 1 << 16):
+            self.assertEqual(list(self.document.items()),
+                             self.load(text, chunk_size))
+
+    def test_indented_document(self):
+        text = json.dumps(self.document, indent=4)
+        self.assertEqual(list(self.document.items()), self.load(text, 5))
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual([("a", 123456)], self.load('{"a": 123456}', 8))
+
+    def test_numbers_at_every_chunk_size(self):
+        text = '{"a": 1.5, "b": 2, "c": -3e+2, "d": 1.25E-1, "e": [0.5]}'
+        expected = list(json.loads(text).items())
+        for chunk_size in range(1, len(text) + 1):
+            self.assertEqual(expected, self.load(text, chunk_size))
+
+    def test_empty_object(self):
+        self.assertEqual([], self.load(" {} ", 1))
+
+    def test_is_lazy(self):
+        text = json.dumps(self.document)
+        items = iter_items(io.StringIO(text), 4)
+        self.assertEqual("User.1", next(items)[0])
+
+    def test_empty_file(self):
+        with self.assertRaises(ValueError):
+            self.load("", 4)
+
+    def test_not_an_object(self):
+        with self.assertRaises(ValueError):
+            self.load("[1, 2]", 4)
+
+    def test_truncated_document(self):
+        with self.assertRaises(ValueError):
+            self.load('{"a": {"id": "1"}, "b": {"id"', 4)
+
+    def test_missing_separator(self):
+        with self.assertRaises(ValueError):
+            self.load('{"a": 1 "b": 2}', 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""Defines unittests for lazy_storage"""
+
+import os
+import json
+import unittest
+from unittest import mock
+from models.engine.file_storage import FileStorage
+from models.engine.lazy_storage import LazyStorage
+from models.user import User
+from models.place import Place
+
+
+class TestLazyStorage(unittest.TestCase):
+    """Unittests for testing the LazyStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.user = User()
+        self.user.first_name = "Zoë"
+        self.place = Place()
+        self.place.city_id = "c1"
+        FileStorage().save()
+        FileStorage._FileStorage__objects = {}
+        self.storage = LazyStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        for name in ("file.json", "file.json.offsets"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def built(self):
+        return FileStorage._FileStorage__objects
+
+    def test_reload_builds_nothing(self):
+        self.assertEqual({}, self.built())
+
+    def test_get_builds_one_object(self):
+        user = self.storage.get(User, self.user.id)
+        self.assertEqual("Zoë", user.first_name)
+        self.assertEqual(["User." + self.user.id], list(self.built()))
+
+    def test_get_missing(self):
+        self.assertIsNone(self.storage.get("User", "nope"))
+
+    def test_all_with_class_builds_class(self):
+        self.assertIn("Place." + self.place.id, self.storage.all(Place))
+        self.assertEqual(["Place." + self.place.id], list(self.built()))
+
+    def test_all_builds_everything(self):
+        self.assertEqual(2, len(self.storage.all()))
+
+    def test_count_builds_nothing(self):
+        self.assertEqual(1, self.storage.count(User))
+        self.assertEqual(2, self.storage.count())
+        self.assertEqual({}, self.built())
+        self.storage.get(User, self.user.id)
+        User()
+        self.assertEqual(2, self.storage.count("User"))
+        self.assertEqual(3, self.storage.count())
+
+    def test_lookup(self):
+        self.assertIn("Place." + self.place.id,
+                      self.storage.lookup(Place, "city_id", "c1"))
+
+    def test_save_copies_unbuilt_objects(self):
+        user = self.storage.get(User, self.user.id)
+        user.last_name = "Bar"
+        self.storage.save()
+        with open("file.json", "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual("Bar", saved["User." + self.user.id]["last_name"])
+        self.assertEqual("c1", saved["Place." + self.place.id]["city_id"])
+        self.assertEqual(["User." + self.user.id], list(self.built()))
+        place = self.storage.get(Place, self.place.id)
+        self.assertEqual("c1", place.city_id)
+
+    def test_reload_reads_offset_index(self):
+        self.assertTrue(os.path.exists("file.json.offsets"))
+        FileStorage._FileStorage__objects = {}
+        with mock.patch("models.engine.lazy_storage.scan",
+                        side_effect=AssertionError):
+            self.storage.reload()
+        self.assertEqual("Zoë",
+                         self.storage.get(User, self.user.id).first_name)
+        self.assertEqual("c1",
+                         self.storage.get(Place, self.place.id).city_id)
+
+    def test_save_writes_offset_index(self):
+        user = self.storage.get(User, self.user.id)
+        user.last_name = "Bar"
+        other = User()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        with mock.patch("models.engine.lazy_storage.scan",
+                        side_effect=AssertionError):
+            self.storage.reload()
+        self.assertEqual("Bar",
+                         self.storage.get(User, self.user.id).last_name)
+        self.assertIsNotNone(self.storage.get(User, other.id))
+        self.assertEqual("c1",
+                         self.storage.get(Place, self.place.id).city_id)
+
+    def test_stale_offset_index_ignored(self):
+        self.storage.all()
+        user = User()
+        FileStorage().save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(3, self.storage.count())
+        self.assertIsNotNone(self.storage.get(User, user.id))
+        self.assertEqual("Zoë",
+                         self.storage.get(User, self.user.id).first_name)
+
+    def test_save_error_keeps_changes(self):
+        user = User()
+        with mock.patch.object(User, "to_dict", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.assertTrue(self.storage.is_dirty(user))
+        self.storage.save()
+        with open("file.json", "r") as f:
+            self.assertIn("User." + user.id, json.load(f))
+        self.assertFalse(self.storage.is_dirty(user))
+
+    def test_delete_unbuilt_object(self):
+        place = Place(**self.place.to_dict())
+        self.storage.delete(place)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIsNone(self.storage.get(Place, self.place.id))
+        self.assertIsNotNone(self.storage.get(User, self.user.id))
+
+    def test_new_replaces_unbuilt_object(self):
+        place = Place(**self.place.to_dict())
+        place.city_id = "c2"
+        self.storage.new(place)
+        self.assertIs(place, self.storage.get(Place, self.place.id))
+        self.assertEqual(2, len(self.storage.all()))
+
+
+if __name__ == "__main__":
+    unittest.main()
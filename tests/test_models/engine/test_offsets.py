@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/offsets.py"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+import zlib
+from models.engine.offsets import (dump, index_path, read_index, scan,
+                                   write_index)
+
+
+class TestOffsets(unittest.TestCase):
+    """Unittests for testing the offset index functions."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "file.json")
+        with open(self.path, "w") as f:
+            f.write('{"User.1": {"id": "1"}}')
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def test_index_path(self):
+        self.assertEqual(self.path + ".offsets", index_path(self.path))
+
+    def test_write_and_read(self):
+        offsets = {"User": {"User.1": (12, 23, 7), "User.2": (30, 41, 8)},
+                   "Place": {"Place.1": (50, 61, 9)}}
+        write_index(self.path, offsets)
+        self.assertEqual(offsets, read_index(self.path))
+        with open(self.path, "rb") as f:
+            self.assertEqual(offsets, read_index(self.path, f))
+
+    def test_dump(self):
+        file = io.BytesIO()
+        offsets = dump([("User.1", b'{"id": "1"}'),
+                        ("Place.1", b'{"id": "\\u00e9"}')], file)
+        data = file.getvalue()
+        self.assertEqual({"User.1": {"id": "1"}, "Place.1": {"id": "\u00e9"}},
+                         json.loads(data))
+        start, end, crc = offsets["User"]["User.1"]
+        self.assertEqual(b'{"id": "1"}', data[start:end])
+        self.assertEqual(zlib.crc32(b'{"id": "1"}'), crc)
+        self.assertEqual(offsets, scan(io.BytesIO(data)))
+
+    def test_scan_streams_the_store(self):
+        data = json.dumps({"User.{}".format(i): {"id": str(i)}
+                           for i in range(10000)}).encode()
+        reads = []
+
+        class File(io.BytesIO):
+            def read(self, size=-1):
+                chunk = super().read(size)
+                reads.append(len(chunk))
+                return chunk
+
+            def read1(self, size=-1):
+                chunk = super().read1(size)
+                reads.append(len(chunk))
+                return chunk
+
+        offsets = scan(File(data))
+        self.assertEqual(10000, len(offsets["User"]))
+        start, end, crc = offsets["User"]["User.999"]
+        self.assertEqual(b'{"id": "999"}', data[start:end])
+        self.assertEqual(zlib.crc32(b'{"id": "999"}'), crc)
+        self.assertLess(max(reads), len(data))
+
+    def test_missing_index(self):
+        self.assertIsNone(read_index(self.path))
+
+    def test_stale_index(self):
+        write_index(self.path, {"User": {"User.1": (12, 23, 7)}})
+        with open(self.path, "a") as f:
+            f.write(" ")
+        self.assertIsNone(read_index(self.path))
+
+    def test_truncated_index(self):
+        write_index(self.path, {"User": {"User.1": (12, 23, 7)}})
+        with open(index_path(self.path), "r+b") as f:
+            f.truncate(os.path.getsize(index_path(self.path)) - 8)
+        self.assertIsNone(read_index(self.path))
+
+    def test_invalid_index(self):
+        with open(index_path(self.path), "w") as f:
+            f.write("[1, 2")
+        self.assertIsNone(read_index(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""Defines unittests for rwlock"""
+
+import threading
+import unittest
+from models.engine.rwlock import RWLock
+
+
+class TestRWLock(unittest.TestCase):
+    """Unittests for testing the RWLock class."""
+
+    def setUp(self):
+        self.lock = RWLock()
+
+    def run_thread(self, target):
+        thread = threading.Thread(target=target)
+        thread.start()
+        return thread
+
+    def test_readers_share_the_lock(self):
+        inside = threading.Barrier(2, timeout=5)
+
+        def read():
+            with self.lock.read():
+                inside.wait()
+
+        threads = [self.run_thread(read) for i in range(2)]
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(inside.broken)
+
+    def test_writer_waits_for_readers(self):
+        events = []
+        self.lock.acquire_read()
+
+        def write():
+            with self.lock.write():
+                events.append("write")
+
+        thread = self.run_thread(write)
+        thread.join(0.05)
+        events.append("read done")
+        self.lock.release_read()
+        thread.join(5)
+        self.assertEqual(["read done", "write"], events)
+
+    def test_reader_waits_for_writer(self):
+        events = []
+        self.lock.acquire_write()
+
+        def read():
+            with self.lock.read():
+                events.append("read")
+
+        thread = self.run_thread(read)
+        thread.join(0.05)
+        events.append("write done")
+        self.lock.release_write()
+        thread.join(5)
+        self.assertEqual(["write done", "read"], events)
+
+    def test_reentrant(self):
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    pass
+        with self.lock.read():
+            with self.lock.read():
+                pass
+        with self.lock.write():
+            pass
+
+    def test_upgrade_raises(self):
+        with self.lock.read():
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+        with self.lock.write():
+            pass
+
+    def test_release_write_not_held(self):
+        with self.assertRaises(RuntimeError):
+            self.lock.release_write()
+
+
+if __name__ == "__main__":
+    unittest.main()
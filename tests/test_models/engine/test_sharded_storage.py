@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+"""Defines unittests for sharded_storage"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+import models
+from models.engine.file_storage import FileStorage
+from models.engine.sharded_storage import ShardedStorage, decode_shard
+from models.place import Place
+from models.state import State
+from models.user import User
+from tests.test_models.engine.storage_case import TempStoreMixin
+
+
+class TestShardedStorage(TempStoreMixin, unittest.TestCase):
+    """Unittests for testing the ShardedStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = ShardedStorage()
+        self.storage.reload()
+        self.storage.changes()
+
+    def files(self):
+        return sorted(os.listdir(self.directory))
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), "r") as f:
+            return json.load(f)
+
+    def mtimes(self):
+        return {name: os.stat(os.path.join(self.directory, name)).st_mtime_ns
+                for name in self.files()}
+
+    def test_count_loads_skipped_class(self):
+        User()
+        State()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload([State])
+        self.assertEqual(1, self.storage.count(User))
+        self.assertEqual(2, self.storage.count())
+
+    def test_is_file_storage(self):
+        self.assertIsInstance(self.storage, FileStorage)
+
+    def test_one_file_per_class(self):
+        user = User()
+        state = State()
+        self.storage.save()
+        self.assertEqual(["file.State.0.json", "file.User.0.json"],
+                         self.files())
+        self.assertEqual(["User." + user.id],
+                         list(self.read("file.User.0.json")))
+        self.assertEqual(["State." + state.id],
+                         list(self.read("file.State.0.json")))
+
+    def test_save_rewrites_changed_shards_only(self):
+        User()
+        state = State()
+        self.storage.save()
+        os.utime(os.path.join(self.directory, "file.User.0.json"), ns=(0, 0))
+        state.name = "California"
+        self.storage.save()
+        self.assertEqual(0, self.mtimes()["file.User.0.json"])
+        self.assertEqual("California",
+                         self.read("file.State.0.json")["State." + state.id]
+                         ["name"])
+
+    def test_save_error_keeps_dirty_shards(self):
+        state = State()
+        user = User()
+        self.storage.save()
+        state.name = "California"
+        user.email = "betty@mail.com"
+        with mock.patch.object(User, "to_dict", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.assertEqual("California",
+                         self.read("file.State.0.json")["State." + state.id]
+                         ["name"])
+        self.assertTrue(self.storage.is_dirty(user))
+        self.assertFalse(self.storage.is_dirty(state))
+        self.storage.save()
+        self.assertEqual("betty@mail.com",
+                         self.read("file.User.0.json")["User." + user.id]
+                         ["email"])
+
+    def test_hash_shards(self):
+        with mock.patch.object(ShardedStorage, "shard_count", 4):
+            users = [User() for i in range(40)]
+            self.storage.save()
+            keys = {}
+            for name in self.files():
+                for key in self.read(name):
+                    keys[key] = name
+            self.assertEqual({"User." + user.id for user in users}, set(keys))
+            self.assertGreater(len(self.files()), 1)
+            for key, name in keys.items():
+                self.assertEqual(self.storage.shard_path(
+                    self.storage.shard(key)), os.path.join(self.directory,
+                                                           name))
+
+    def test_delete_last_object_removes_shard(self):
+        state = State()
+        self.storage.save()
+        self.storage.delete(state)
+        self.storage.save()
+        self.assertEqual([], self.files())
+
+    def test_reload(self):
+        user = User()
+        user.email = "betty@mail.com"
+        State()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(2, len(self.storage.all()))
+        self.assertEqual("betty@mail.com",
+                         self.storage.get(User, user.id).email)
+
+    def test_reload_some_classes(self):
+        user = User()
+        state = State()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload([User])
+        self.assertEqual(["User." + user.id],
+                         list(FileStorage._FileStorage__objects))
+        self.storage.load("State")
+        self.assertIsNotNone(self.storage.get(State, state.id))
+
+    def test_queries_load_skipped_classes(self):
+        place = Place()
+        place.city_id = "c1"
+        place.latitude, place.longitude = 10.0, 20.0
+        state = State()
+        self.storage.save()
+        queries = [
+            lambda: self.storage.get("Place", place.id),
+            lambda: self.storage.all(Place).get("Place." + place.id),
+            lambda: self.storage.lookup(Place, "city_id", "c1").get(
+                "Place." + place.id),
+            lambda: self.storage.near(10.0, 20.0, 1).get(
+                "Place." + place.id),
+            lambda: self.storage.within(9, 19, 11, 21, Place).get(
+                "Place." + place.id),
+            lambda: self.storage.all().get("State." + state.id),
+        ]
+        for query in queries:
+            FileStorage._FileStorage__objects = {}
+            self.storage.reload([User])
+            self.assertIsNotNone(query())
+
+    def test_save_loads_skipped_classes(self):
+        state = State()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload(["User"])
+        other = State()
+        self.storage.save()
+        self.assertEqual({"State." + state.id, "State." + other.id},
+                         set(self.read("file.State.0.json")))
+
+    def test_shard_count_change(self):
+        for i in range(10):
+            User()
+        self.storage.save()
+        with mock.patch.object(ShardedStorage, "shard_count", 3):
+            FileStorage._FileStorage__objects = {}
+            self.storage.reload()
+            self.storage.save()
+            keys = {}
+            for name in self.files():
+                for key in self.read(name):
+                    keys[key] = name
+            self.assertEqual(10, len(keys))
+            for key, name in keys.items():
+                self.assertEqual(self.storage.shard_path(
+                    self.storage.shard(key)), os.path.join(self.directory,
+                                                           name))
+
+    def parallel_reload(self):
+        users = {}
+        for i in range(20):
+            user = User()
+            user.email = "{}@mail.com".format(i)
+            users["User." + user.id] = user.to_dict()
+        State()
+        self.patch(ShardedStorage, "shard_count", 4)
+        self.patch(ShardedStorage, "reload_workers", 2)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        loaded = self.storage.all(User)
+        self.assertEqual(users, {key: user.to_dict()
+                                 for key, user in loaded.items()})
+        self.assertEqual(1, len(self.storage.all(State)))
+        self.assertEqual({}, self.storage.changes())
+        self.assertNotIn("HBNB_RELOAD_WORKER", os.environ)
+
+    def test_parallel_reload(self):
+        self.parallel_reload()
+
+    def test_parallel_reload_spawn(self):
+        with mock.patch("multiprocessing.get_all_start_methods",
+                        return_value=["spawn"]):
+            self.parallel_reload()
+
+    def test_decode_shard(self):
+        user = User()
+        self.storage.save()
+        items = decode_shard("json", os.path.join(self.directory,
+                                                  "file.User.0.json"))
+        self.assertEqual([("User." + user.id, user.created_at)],
+                         [(key, value["created_at"]) for key, value in items])
+        self.assertNotIn("__class__", items[0][1])
+
+    def test_worker_skips_reload(self):
+        with open(self.path, "w") as f:
+            json.dump({"User.1": {"__class__": "User", "id": "1"}}, f)
+        code = "import models; print(len(models.storage.all()))"
+        env = dict(os.environ, HBNB_FILE_PATH=self.path,
+                   HBNB_RELOAD_WORKER="1")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        root = os.path.dirname(os.path.dirname(models.__file__))
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=root, env=env, text=True)
+        self.assertEqual("0", output.strip())
+        del env["HBNB_RELOAD_WORKER"]
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=root, env=env, text=True)
+        self.assertEqual("1", output.strip())
+
+    def test_other_files_ignored(self):
+        with open(self.path, "w") as f:
+            f.write("{}")
+        with open(self.path + ".log", "w") as f:
+            f.write("")
+        self.assertEqual({}, self.storage.shards())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""Defines unittests for shared_storage"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+from models.engine import formats
+from models.engine.file_storage import FileStorage
+from models.engine.shared_storage import SharedStorage
+from models.user import User
+from tests.test_models.engine.storage_case import TempStoreMixin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestSharedStorage(TempStoreMixin, unittest.TestCase):
+    """Unittests for testing the SharedStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.use_storage(SharedStorage())
+        self.storage.reload()
+
+    def read(self):
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def write(self, content):
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(content, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def other_process(self, code, **env):
+        """Runs code in a process sharing the store."""
+        env = dict(os.environ, HBNB_TYPE_STORAGE="shared",
+                   HBNB_FILE_PATH=self.path, **env)
+        env.pop("HBNB_THREAD_SAFE", None)
+        return subprocess.run(
+            [sys.executable, "-c", "import models\n" + code], cwd=ROOT,
+            env=env, check=True, capture_output=True, text=True).stdout
+
+    def test_is_file_storage(self):
+        self.assertIsInstance(self.storage, FileStorage)
+        self.assertEqual(self.path + ".lock", self.storage.lock_path)
+
+    def test_save_keeps_objects_saved_by_others(self):
+        user = User()
+        user.save()
+        other = self.other_process(
+            "from models.user import User\n"
+            "user = User()\n"
+            "user.save()\n"
+            "print(user.id)\n").strip()
+        mine = User()
+        mine.save()
+        self.assertEqual({"User." + user.id, "User." + other,
+                          "User." + mine.id}, set(self.read()))
+
+    def test_queries_see_changes(self):
+        user = User()
+        user.save()
+        self.assertIsNone(self.storage.get(User, "other"))
+        content = self.read()
+        content["User.other"] = dict(content["User." + user.id],
+                                     id="other")
+        self.write(content)
+        self.assertIsNotNone(self.storage.get(User, "other"))
+        self.assertIn("User.other", self.storage.all(User))
+
+    def test_only_changed_objects_rebuilt(self):
+        kept, changed = User(), User()
+        self.storage.save()
+        content = self.read()
+        content["User." + changed.id]["first_name"] = "Betty"
+        content["User." + changed.id]["updated_at"] = \
+            "2030-01-01T00:00:00.000000"
+        self.write(content)
+        objects = self.storage.all()
+        self.assertIs(kept, objects["User." + kept.id])
+        self.assertIsNot(changed, objects["User." + changed.id])
+        self.assertEqual("Betty", objects["User." + changed.id].first_name)
+
+    def test_change_without_new_updated_at(self):
+        user = User()
+        user.save()
+        self.other_process(
+            "from models.user import User\n"
+            "user = models.storage.get(User, '{}')\n"
+            "user.first_name = 'Betty'\n"
+            "models.storage.save()\n".format(user.id))
+        User().save()
+        self.assertEqual("Betty",
+                         self.read()["User." + user.id]["first_name"])
+        self.assertEqual("Betty", self.storage.get(User, user.id).first_name)
+
+    def test_change_without_new_updated_at_other_format(self):
+        with mock.patch.object(FileStorage, "_FileStorage__format",
+                               formats.formats["pickle"]):
+            user = User()
+            user.save()
+            self.other_process(
+                "from models.user import User\n"
+                "user = models.storage.get(User, '{}')\n"
+                "user.first_name = 'Betty'\n"
+                "models.storage.save()\n".format(user.id),
+                HBNB_STORAGE_FORMAT="pickle")
+            User().save()
+            self.assertEqual("Betty",
+                             self.storage.get(User, user.id).first_name)
+            self.assertEqual(2, self.storage.count(User))
+
+    def test_refresh_decodes_changed_values_only(self):
+        users = [User() for i in range(10)]
+        self.storage.save()
+        self.assertTrue(os.path.exists(self.path + ".offsets"))
+        self.other_process(
+            "from models.user import User\n"
+            "user = models.storage.get(User, '{}')\n"
+            "user.first_name = 'Betty'\n"
+            "user.save()\n".format(users[3].id))
+        with mock.patch("models.engine.shared_storage.scan",
+                        side_effect=AssertionError), \
+                mock.patch.object(self.storage, "attach",
+                                  wraps=self.storage.attach) as attach:
+            self.assertTrue(self.storage.refresh())
+        self.assertEqual(1, attach.call_count)
+        self.assertEqual("Betty",
+                         self.storage.get(User, users[3].id).first_name)
+        self.assertIs(users[4], self.storage.get(User, users[4].id))
+
+    def test_deleted_by_others(self):
+        user, other = User(), User()
+        self.storage.save()
+        content = self.read()
+        del content["User." + other.id]
+        self.write(content)
+        self.assertEqual(["User." + user.id], list(self.storage.all()))
+
+    def test_unsaved_changes_win(self):
+        user, deleted = User(), User()
+        self.storage.save()
+        user.first_name = "Mine"
+        self.storage.delete(deleted)
+        content = self.read()
+        content["User." + user.id]["first_name"] = "Theirs"
+        content["User." + user.id]["updated_at"] = \
+            "2030-01-01T00:00:00.000000"
+        content["User.new"] = dict(content["User." + user.id], id="new")
+        self.write(content)
+        self.storage.save()
+        content = self.read()
+        self.assertEqual("Mine", content["User." + user.id]["first_name"])
+        self.assertNotIn("User." + deleted.id, content)
+        self.assertIn("User.new", content)
+
+    def test_poll_interval(self):
+        user = User()
+        user.save()
+        content = self.read()
+        content["User.other"] = dict(content["User." + user.id],
+                                     id="other")
+        with mock.patch.object(SharedStorage, "poll_interval", 60):
+            self.storage.all()
+            self.write(content)
+            self.assertNotIn("User.other", self.storage.all())
+            self.storage.refresh()
+            self.assertIn("User.other", self.storage.all())
+
+    def test_locked_reentrant(self):
+        with self.storage.locked():
+            with self.storage.locked():
+                User().save()
+        self.assertEqual(1, len(self.read()))
+
+    def test_concurrent_processes(self):
+        code = ("from models.user import User\n"
+                "for i in range(20):\n"
+                "    User().save()\n")
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-c", "import models\n" + code], cwd=ROOT,
+                env=dict(os.environ, HBNB_TYPE_STORAGE="shared",
+                         HBNB_FILE_PATH=self.path))
+            for i in range(4)
+        ]
+        for process in processes:
+            self.assertEqual(0, process.wait())
+        self.assertEqual(80, len(self.read()))
+        self.storage.refresh()
+        self.assertEqual(80, len(self.storage.all(User)))
+
+
+if __name__ == "__main__":
+    unittest.main()
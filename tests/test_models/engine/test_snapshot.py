@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/snapshot.py"""
+
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from models.engine import formats, snapshot
+from models.engine.snapshot import Snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    """Unittests for testing the snapshot writer and reader."""
+
+    items = [
+        ("User.2", {"id": "2", "email": "b@mail.com"}),
+        ("Place.10", {"id": "10", "name": "Café", "amenity_ids": []}),
+        ("User.1", {"id": "1", "email": "a@mail.com"}),
+        ("User.10", {"id": "10", "email": "c@mail.com"}),
+        ("State.1", {"id": "1"}),
+    ]
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".snapshot")
+        with os.fdopen(fd, "wb") as f:
+            snapshot.write(iter(self.items), f)
+        self.file = open(self.path, "rb")
+        self.snapshot = Snapshot(self.file)
+
+    def tearDown(self):
+        self.snapshot.close()
+        self.file.close()
+        os.remove(self.path)
+
+    def test_len(self):
+        self.assertEqual(5, len(self.snapshot))
+
+    def test_get(self):
+        for key, value in self.items:
+            self.assertEqual(value, self.snapshot.get(key))
+        self.assertIsNone(self.snapshot.get("User.3"))
+        self.assertIsNone(self.snapshot.get("User."))
+        self.assertIsNone(self.snapshot.get("Zebra.1"))
+        self.assertIsNone(self.snapshot.get("A"))
+
+    def test_items_sorted(self):
+        self.assertEqual(sorted(self.items), list(self.snapshot.items()))
+
+    def test_keys_with_prefix(self):
+        self.assertEqual(["User.1", "User.10", "User.2"],
+                         list(self.snapshot.keys("User.")))
+        self.assertEqual([], list(self.snapshot.keys("Review.")))
+
+    def test_count(self):
+        self.assertEqual(5, self.snapshot.count())
+        self.assertEqual(3, self.snapshot.count("User."))
+        self.assertEqual(1, self.snapshot.count("Place."))
+        self.assertEqual(2, self.snapshot.count("User.1"))
+        self.assertEqual(0, self.snapshot.count("Review."))
+        self.assertEqual(0, self.snapshot.count("Zebra."))
+
+    def test_items_skip(self):
+        self.assertEqual([("User.1", None), ("User.10", self.items[3][1]),
+                          ("User.2", self.items[0][1])],
+                         list(self.snapshot.items("User.",
+                                                  skip={"User.1"})))
+
+    def test_mapping_outlives_file(self):
+        self.file.close()
+        self.assertEqual(self.items[0][1], self.snapshot.get("User.2"))
+
+    def test_empty(self):
+        file = io.BytesIO()
+        snapshot.write(iter([]), file)
+        with open(self.path, "wb") as f:
+            f.write(file.getvalue())
+        with open(self.path, "rb") as f:
+            empty = Snapshot(f)
+        self.assertEqual(0, len(empty))
+        self.assertIsNone(empty.get("User.1"))
+        self.assertEqual([], list(empty.items()))
+        empty.close()
+
+    def test_not_a_snapshot(self):
+        with open(self.path, "wb") as f:
+            f.write(b'{"User.1": {"id": "1"}, "User.2": {"id": "2"}}')
+        with open(self.path, "rb") as f:
+            with self.assertRaises(ValueError):
+                Snapshot(f)
+
+    def test_format(self):
+        fmt = formats.for_path("file.snapshot")
+        self.assertIsInstance(fmt, formats.SnapshotFormat)
+        value = {"id": "1", "created_at": datetime(2023, 7, 16, 14, 42, 34)}
+        with open(self.path, "wb") as f:
+            fmt.dump(iter([("User.1", value)]), f)
+        with open(self.path, "rb") as f:
+            self.assertEqual([("User.1", {"id": "1", "created_at":
+                                          "2023-07-16T14:42:34"})],
+                             list(fmt.load(f)))
+
+
+if __name__ == "__main__":
+    unittest.main()
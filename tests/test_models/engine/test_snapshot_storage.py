@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""Defines unittests for snapshot_storage"""
+
+import gc
+import os
+import unittest
+from models.engine import formats
+from models.engine.file_storage import FileStorage
+from models.engine.snapshot_storage import SnapshotStorage
+from models.city import City
+from models.place import Place
+from models.user import User
+from tests.test_models.engine.storage_case import TempStoreMixin
+
+
+class TestSnapshotStorage(TempStoreMixin, unittest.TestCase):
+    """Unittests for testing the SnapshotStorage class."""
+
+    store_name = "file.snapshot"
+
+    def setUp(self):
+        super().setUp()
+        self.user = User(id="1", email="betty@mail.com")
+        self.city = City(id="2", state_id="CA", name="SF")
+        self.place = Place(id="3", latitude=37.77, longitude=-122.42,
+                           price_by_night=80)
+        fmt = formats.formats["snapshot"]
+        with open(self.path, "wb") as f:
+            fmt.dump(((type(obj).__name__ + "." + obj.id, fmt.encode(obj))
+                      for obj in (self.user, self.city, self.place)), f)
+        self.patch(SnapshotStorage, "_SnapshotStorage__snapshot_path",
+                   self.path)
+        self.storage = SnapshotStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        SnapshotStorage._SnapshotStorage__snapshot.close()
+        SnapshotStorage._SnapshotStorage__snapshot = None
+
+    def test_is_file_storage(self):
+        self.assertIsInstance(self.storage, FileStorage)
+        self.assertEqual(self.path, self.storage.file_path)
+
+    def test_reload_decodes_nothing(self):
+        self.assertEqual(0, len(SnapshotStorage._SnapshotStorage__identity))
+
+    def test_count_decodes_nothing(self):
+        self.assertEqual(3, self.storage.count())
+        self.assertEqual(1, self.storage.count(User))
+        self.assertEqual(0, self.storage.count("Review"))
+        self.assertEqual(0, len(SnapshotStorage._SnapshotStorage__identity))
+
+    def test_get(self):
+        user = self.storage.get(User, "1")
+        self.assertEqual(self.user.to_dict(), user.to_dict())
+        self.assertIs(user, self.storage.get("User", "1"))
+        self.assertEqual(1, len(SnapshotStorage._SnapshotStorage__identity))
+        self.assertIsNone(self.storage.get(User, "2"))
+        self.assertIsNone(self.storage.get("Nope", "1"))
+
+    def test_all(self):
+        self.assertEqual({"City.2", "Place.3", "User.1"},
+                         set(self.storage.all()))
+        self.assertEqual(["City.2"], list(self.storage.all(City)))
+        self.assertEqual({}, self.storage.all("Review"))
+
+    def test_after(self):
+        self.assertEqual(["Place.3", "User.1"],
+                         list(self.storage.after("City.2")))
+        self.assertEqual(["Place.3"],
+                         list(self.storage.after("City.2", limit=1)))
+        self.assertEqual({}, self.storage.after("User.1"))
+        self.assertEqual({}, self.storage.after("City.2", City))
+        self.assertIsNone(self.storage.after("City.2", Place))
+        self.assertIsNone(self.storage.after("City.9"))
+
+    def test_objects_not_kept(self):
+        self.storage.all()
+        gc.collect()
+        self.assertEqual(0, len(SnapshotStorage._SnapshotStorage__identity))
+
+    def test_queries(self):
+        self.assertEqual(["City.2"],
+                         list(self.storage.lookup(City, "state_id", "CA")))
+        self.assertEqual(["Place.3"],
+                         list(self.storage.near(37.77, -122.42, 1)))
+        self.assertEqual(["Place.3"],
+                         list(self.storage.within(37, -123, 38, -122)))
+        self.assertEqual(80, self.storage.columns(Place).max(
+            "price_by_night"))
+
+    def test_read_only(self):
+        with self.assertRaises(PermissionError):
+            self.storage.new(User(id="4"))
+        with self.assertRaises(PermissionError):
+            self.storage.delete(self.storage.get(User, "1"))
+        with self.assertRaises(PermissionError):
+            self.storage.save()
+        user = self.storage.get(User, "1")
+        user.first_name = "Betty"
+        self.assertFalse(self.storage.is_dirty(user))
+        self.assertEqual({}, self.storage.changes())
+
+    def test_missing_file(self):
+        os.rename(self.path, self.path + ".tmp")
+        try:
+            self.storage.reload()
+            self.assertEqual({}, self.storage.all())
+            self.assertIsNone(self.storage.get(User, "1"))
+        finally:
+            os.rename(self.path + ".tmp", self.path)
+            self.storage.reload()
+
+
+if __name__ == "__main__":
+    unittest.main()
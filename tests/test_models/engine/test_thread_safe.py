@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""Defines unittests for thread_safe"""
+
+import json
+import threading
+import unittest
+from unittest import mock
+from models.engine.file_storage import FileStorage
+from models.engine.rwlock import RWLock
+from models.engine.sharded_storage import ShardedStorage
+from models.engine.thread_safe import ThreadSafe, thread_safe
+from models.place import Place
+from models.user import User
+from tests.test_models.engine.storage_case import TempStoreMixin
+
+
+class TestThreadSafe(TempStoreMixin, unittest.TestCase):
+    """Unittests for testing the thread-safe storage variants."""
+
+    def setUp(self):
+        super().setUp()
+        self.use_storage(thread_safe(FileStorage)())
+
+    def run_threads(self, *targets):
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=run, args=(target,))
+                   for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+
+    def test_variant(self):
+        self.assertIsInstance(self.storage, FileStorage)
+        self.assertIsInstance(self.storage, ThreadSafe)
+        self.assertEqual("FileStorage", type(self.storage).__name__)
+        self.assertIsInstance(self.storage.lock, RWLock)
+        self.assertIsNot(self.storage.lock, thread_safe(FileStorage).lock)
+
+    def test_all_is_a_copy(self):
+        user = User()
+        objects = self.storage.all()
+        User()
+        self.assertEqual(["User." + user.id], list(objects))
+        self.assertEqual(2, len(self.storage.all(User)))
+
+    def test_concurrent_new_save_and_all(self):
+        created = 50
+
+        def create():
+            for i in range(created):
+                User().save()
+
+        def read():
+            for i in range(created):
+                for obj in self.storage.all().values():
+                    str(obj)
+                self.storage.all(User)
+                self.storage.lookup(Place, "city_id", "")
+
+        self.run_threads(create, create, read, read)
+        self.assertEqual(2 * created, len(self.storage.all(User)))
+        self.assertEqual(2 * created, self.storage.count(User))
+        with open(self.path, "r") as f:
+            self.assertEqual(2 * created, len(json.load(f)))
+
+    def test_concurrent_updates_not_lost(self):
+        places = [Place() for i in range(20)]
+
+        def update(name):
+            def run():
+                for place in places:
+                    setattr(place, name, place.id)
+                    place.save()
+            return run
+
+        self.run_threads(update("name"), update("description"))
+        self.storage.reload()
+        for place in places:
+            saved = self.storage.get(Place, place.id)
+            self.assertEqual(place.id, saved.name)
+            self.assertEqual(place.id, saved.description)
+
+    def test_concurrent_delete(self):
+        users = [User() for i in range(100)]
+
+        def delete():
+            for user in users[::2]:
+                self.storage.delete(user)
+
+        def read():
+            for i in range(20):
+                for key, obj in self.storage.all().items():
+                    self.assertEqual(key, "User." + obj.id)
+
+        self.run_threads(delete, read)
+        self.assertEqual(50, len(self.storage.all()))
+
+    def test_queries_run_during_write(self):
+        user = User()
+        to_dict = User.to_dict
+        blocked = []
+
+        def encode(obj):
+            if not blocked:
+                query = threading.Thread(target=self.storage.count)
+                query.start()
+                query.join(5)
+                blocked.append(query.is_alive())
+            return to_dict(obj)
+
+        with mock.patch.object(User, "to_dict", encode):
+            user.save()
+        self.assertEqual([False], blocked)
+        self.assertFalse(self.storage.is_dirty(user))
+
+    def test_changes_wait_for_write(self):
+        user = User()
+        to_dict = User.to_dict
+        waited = []
+
+        def encode(obj):
+            if not waited:
+                change = threading.Thread(target=User)
+                change.start()
+                change.join(0.1)
+                waited.append(change.is_alive())
+                self.addCleanup(change.join)
+            return to_dict(obj)
+
+        with mock.patch.object(User, "to_dict", encode):
+            user.save()
+        self.assertEqual([True], waited)
+        with open(self.path, "r") as f:
+            self.assertEqual(["User." + user.id], list(json.load(f)))
+
+    def test_sharded_skipped_classes(self):
+        storage = self.use_storage(thread_safe(ShardedStorage)())
+        self.patch(ShardedStorage, "_ShardedStorage__loaded", None)
+        User()
+        place = Place()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload([User])
+        self.assertTrue(storage.exclusive_reads)
+        self.assertEqual(1, storage.count(Place))
+        self.assertEqual(2, len(storage.all()))
+        self.assertFalse(storage.exclusive_reads)
+        storage.reload([User])
+        self.run_threads(lambda: storage.get(Place, place.id),
+                         lambda: storage.count(), lambda: storage.all(User))
+        self.assertEqual(2, storage.count())
+
+    def test_group_commit(self):
+        with mock.patch.object(FileStorage, "group_commit_window", 0.01):
+            self.run_threads(*[User().save for i in range(8)])
+        with open(self.path, "r") as f:
+            self.assertEqual(8, len(json.load(f)))
+
+
+if __name__ == "__main__":
+    unittest.main()
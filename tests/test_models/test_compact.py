@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""Defines unittests for models/compact.py."""
+
+import os
+import unittest
+from datetime import datetime
+from models import storage
+from models.compact import compact
+from models.place import Place
+from models.user import User
+
+CompactPlace = compact(Place)
+CompactUser = compact(User)
+
+
+class TestCompact(unittest.TestCase):
+    """Unittests for testing the compact model classes."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_same_name_and_subclass(self):
+        self.assertEqual("Place", CompactPlace.__name__)
+        self.assertTrue(issubclass(CompactPlace, Place))
+
+    def test_declared_fields_in_slots(self):
+        place = CompactPlace()
+        place.city_id = "c1"
+        self.assertIn("city_id", CompactPlace.__slots__)
+        self.assertEqual({"id": place.id,
+                          "created_at": place.created_at,
+                          "updated_at": place.updated_at,
+                          "city_id": "c1"},
+                         place.attributes())
+
+    def test_defaults(self):
+        place = CompactPlace()
+        self.assertEqual("", place.name)
+        self.assertEqual(0, place.number_rooms)
+        self.assertEqual(0.0, place.latitude)
+
+    def test_list_default_not_shared(self):
+        place_1 = CompactPlace()
+        place_2 = CompactPlace()
+        place_1.amenity_ids.append("a1")
+        self.assertEqual(["a1"], place_1.amenity_ids)
+        self.assertEqual([], place_2.amenity_ids)
+        self.assertEqual([], Place.amenity_ids)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            CompactPlace().my_number
+
+    def test_undeclared_attribute(self):
+        place = CompactPlace()
+        place.my_number = 89
+        self.assertEqual(89, place.my_number)
+        self.assertEqual(89, place.to_dict()["my_number"])
+
+    def test_to_dict_matches_regular_class(self):
+        user = User()
+        user.first_name = "Betty"
+        self.assertEqual(user.to_dict(),
+                         CompactUser(**user.to_dict()).to_dict())
+
+    def test_str(self):
+        user = CompactUser(id="123456", email="a@b.c")
+        self.assertIn("[User] (123456)", str(user))
+        self.assertIn("'email': 'a@b.c'", str(user))
+
+    def test_kwargs_constructor(self):
+        dt = datetime.today()
+        place = CompactPlace(id="345", created_at=dt.isoformat(),
+                             updated_at=dt.isoformat(), city_id="c1")
+        self.assertEqual("345", place.id)
+        self.assertEqual(dt, place.created_at)
+        self.assertEqual("c1", place.city_id)
+
+    def test_new_instance_stored_and_tracked(self):
+        place = CompactPlace()
+        self.assertIs(place, storage.get("Place", place.id))
+        storage.save()
+        place.city_id = "c9"
+        self.assertTrue(place.is_dirty())
+        self.assertIn("Place." + place.id,
+                      storage.lookup(Place, "city_id", "c9"))
+
+
+if __name__ == "__main__":
+    unittest.main()
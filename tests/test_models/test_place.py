@@ -177,6 +177,10 @@ class TestPlaceInstantiation(unittest.TestCase):
         self.assertEqual(place.longitude, 0.0)
         self.assertEqual(place.amenity_ids, [])
 
+    def test_indexed_attributes(self):
+        self.assertEqual(("city_id", "user_id"), Place.indexed_attributes)
+        self.assertNotIn("indexed_attributes", Place().to_dict())
+
 
 class TestPlaceSave(unittest.TestCase):
     """Unittests for testing Place save method."""
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Defines unittests for models/timestamp.py."""
+
+import unittest
+from datetime import datetime
+from models import timestamp
+from models.base_model import BaseModel
+
+
+class TestTimestamp(unittest.TestCase):
+    """Unittests for testing the timestamp functions."""
+
+    def test_parse(self):
+        self.assertEqual(datetime(2023, 7, 16, 14, 42, 34, 418590),
+                         timestamp.parse("2023-07-16T14:42:34.418590"))
+
+    def test_parse_matches_strptime(self):
+        text = datetime.now().isoformat()
+        self.assertEqual(datetime.strptime(text, timestamp.FORMAT),
+                         timestamp.parse(text))
+
+    def test_parse_without_microseconds(self):
+        dt = datetime(2023, 7, 16, 14, 42, 34)
+        self.assertEqual(dt, timestamp.parse(dt.isoformat()))
+
+    def test_parse_none(self):
+        with self.assertRaises(TypeError):
+            timestamp.parse(None)
+
+    def test_parse_invalid(self):
+        with self.assertRaises(ValueError):
+            timestamp.parse("16/07/2023")
+
+    def test_format_round_trip(self):
+        dt = datetime.now()
+        self.assertEqual(dt, timestamp.parse(timestamp.format(dt)))
+
+    def test_base_model_round_trip_without_microseconds(self):
+        base_model = BaseModel()
+        base_model.created_at = datetime(2023, 7, 16, 14, 42, 34)
+        copy = BaseModel(**base_model.to_dict())
+        self.assertEqual(base_model.created_at, copy.created_at)
+
+    def test_kwargs_without_dates(self):
+        base_model = BaseModel(name="test")
+        self.assertEqual(str, type(base_model.id))
+        self.assertEqual(datetime, type(base_model.created_at))
+        self.assertIs(base_model.created_at, base_model.updated_at)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,6 +24,13 @@ class TestUserInstantiation(unittest.TestCase):
     def test_new_instance_stored_in_objects(self):
         self.assertIn(User(), storage.all().values())
 
+    def test_all_returns_only_users(self):
+        from models.state import State
+        user = User()
+        state = State()
+        self.assertIn(user, User.all())
+        self.assertNotIn(state, User.all())
+
     def test_id_is_public_str(self):
         self.assertEqual(str, type(User().id))
 